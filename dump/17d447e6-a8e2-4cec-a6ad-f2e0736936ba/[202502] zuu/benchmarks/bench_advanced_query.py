@@ -0,0 +1,106 @@
+"""
+AdvancedQuery matching: per item matcher scan in insertion order (previous
+implementation, an expensive matcher declared first) vs match_many() over the
+compiled, cost ordered plan
+
+    python benchmarks/bench_advanced_query.py [items]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.UTILS.advanced_query import AdvancedQuery, AQCtx  # noqa: E402
+
+PATH_SEGMENT = re.compile(r"[a-z0-9_]+")
+
+
+def make_group(query, prefix):
+    def valid_path(item):
+        # looks at every path segment, whatever the prefix
+        inner = item[item.find("(") + 1 : -1]
+        return all(PATH_SEGMENT.fullmatch(segment) for segment in inner.split("/")) and item.startswith(prefix)
+
+    def has_prefix(item):
+        return item.startswith(prefix + "(")
+
+    # the expensive check declared first
+    group = query.matcher(any=False, pure=True)(valid_path)
+    group.matcher(pure=True)(has_prefix)
+    group.handler()(lambda ctx, **kwargs: None)
+
+
+def build():
+    query = AdvancedQuery()
+    for prefix in ("dir", "file", "func"):
+        make_group(query, prefix)
+    return query
+
+
+def legacy_match(query, item, ctx):
+    functionCache = {}
+    ctx.matchmap = {}
+    for id, (flag, mlist) in query._AdvancedQuery__matchers.items():
+        allres = []
+        isany = flag is None or flag
+        for func in mlist:
+            if func in functionCache:
+                res = functionCache[func]
+            elif getattr(func, "__ctx_required__", False):
+                res = functionCache[func] = func(ctx, item)
+            else:
+                res = functionCache[func] = func(item)
+            if isany and res:
+                allres.append(res)
+                break
+            if not res:
+                allres = []
+                break
+            allres.append(res)
+        ctx.matchmap[id] = bool(allres) and (any(allres) if isany else all(allres))
+    return ctx
+
+
+def make_items(count):
+    rnd = random.Random(0)
+    kinds = ["dir", "file", "func", "other", "plain"]
+    return [f"{rnd.choice(kinds)}(home/user/src/pkg/name_{rnd.randrange(count)})" for _ in range(count)]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    items = make_items(count)
+    query = build()
+
+    def per_item():
+        return [legacy_match(query, item, AQCtx()).matchmap for item in items]
+
+    def batched():
+        return [ctx.matchmap for ctx in query.match_many(items)]
+
+    legacy, expected = best_of(per_item)
+    compiled, matched = best_of(batched)
+    assert matched == expected
+
+    print(f"{count} items")
+    print(f"    {'match':>10}: {legacy / count * 1e6:6.2f} us/item")
+    print(f"    {'match_many':>10}: {compiled / count * 1e6:6.2f} us/item")
+    for stat in query.stats():
+        print(f"    {stat['name']:>24}: {stat['calls']} calls, {stat['hits']} hits, {stat['mean'] * 1e9:.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
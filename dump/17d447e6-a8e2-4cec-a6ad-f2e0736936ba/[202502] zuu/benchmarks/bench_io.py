@@ -0,0 +1,112 @@
+"""
+zuu.io.load over many small config files: predicate list scan (previous implementation)
+vs the extension indexed registry
+
+    python benchmarks/bench_io.py [files]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.io import load  # noqa: E402
+from zuu.UTILS.read import read_first_and_last_byte  # noqa: E402
+
+
+def legacy_load_json(path, **kwargs):
+    import json
+
+    with open(path) as f:
+        return json.load(f, **kwargs)
+
+
+def legacy_load_toml(path, **kwargs):
+    import toml
+
+    return toml.load(path, **kwargs)
+
+
+def legacy_load_txt(path, **kwargs):
+    with open(path) as f:
+        return f.read()
+
+
+LEGACY_LOAD = [
+    [lambda path: path.endswith(".json"), legacy_load_json],
+    [lambda path: path.endswith(".pickle"), None],
+    [lambda path: path.endswith(".csv"), None],
+    [lambda path: path.endswith(".txt"), legacy_load_txt],
+    [lambda path: path.endswith(".toml"), legacy_load_toml],
+    [lambda path: path.endswith(".xml"), None],
+    [
+        lambda path: read_first_and_last_byte(path) in [(b"[", b"]"), (b"{", b"}")],
+        legacy_load_json,
+    ],
+]
+
+
+def legacy_load(path):
+    for validator, loader in LEGACY_LOAD:
+        if validator(path):
+            return loader(path)
+    raise ValueError(path)
+
+
+def build(root, count):
+    paths = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            path = os.path.join(root, f"c{i}.json")
+            content = json.dumps({"id": i, "name": f"item{i}", "tags": ["a", "b"]})
+        elif kind == 1:
+            path = os.path.join(root, f"c{i}.toml")
+            content = f'id = {i}\nname = "item{i}"\n'
+        elif kind == 2:
+            path = os.path.join(root, f"c{i}.txt")
+            content = f"item {i}\n"
+        else:
+            # unknown extension, sniffed as json
+            path = os.path.join(root, f"c{i}.cfg")
+            content = json.dumps({"id": i})
+        with open(path, "w") as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = 7
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = build(root, count)
+        assert [load(p) for p in paths] == [legacy_load(p) for p in paths]
+
+        groups = {"all": paths}
+        for suffix in (".json", ".toml", ".txt", ".cfg"):
+            groups[suffix] = [p for p in paths if p.endswith(suffix)]
+
+        # interleaved, so drift on a busy machine hits both sides alike
+        best = {}
+        for _ in range(repeat):
+            for name, group in groups.items():
+                for label, fn in (("legacy", legacy_load), ("registry", load)):
+                    start = time.perf_counter()
+                    for p in group:
+                        fn(p)
+                    elapsed = (time.perf_counter() - start) / len(group)
+                    best[name, label] = min(best.get((name, label), elapsed), elapsed)
+
+        print(f"{count} files, us/file, best of {repeat}")
+        for name in groups:
+            legacy, registry = best[name, "legacy"], best[name, "registry"]
+            print(f"    {name:>6}: legacy {legacy * 1e6:6.1f}  registry {registry * 1e6:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+zuu.UTILS.traverse per record cost: isinstance chain with list() copies of
+sets/tuples (previous implementation) vs get_deep/set_deep, compile_path and get_many
+
+    python benchmarks/bench_traverse.py [records]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.UTILS.traverse import compile_path, get_deep, get_many, set_deep  # noqa: E402
+
+
+def legacy_traverse(obj, keys, create_missing=False):
+    curr = obj
+    for key in keys:
+        if isinstance(curr, dict):
+            if create_missing and key not in curr:
+                curr[key] = {}
+            curr = curr.get(key)
+            if curr is None:
+                raise KeyError(f"Key {key} not found in dictionary")
+        elif isinstance(curr, list):
+            key = int(key)
+            if create_missing and key >= len(curr):
+                curr.extend([{}] * (key - len(curr) + 1))
+            try:
+                curr = curr[key]
+            except IndexError:
+                raise KeyError(f"Index {key} out of range for list")
+        elif isinstance(curr, (set, tuple)):
+            try:
+                curr = list(curr)[int(key)]
+            except IndexError:
+                raise KeyError(f"Index {key} out of range for set/tuple")
+        else:
+            try:
+                curr = getattr(curr, key)
+            except AttributeError:
+                raise KeyError(f"Attribute {key} not found")
+    return curr
+
+
+def legacy_get_deep(obj, *keys):
+    return legacy_traverse(obj, keys)
+
+
+def legacy_set_deep(obj, *keys, value):
+    *initial_keys, final_key = keys
+    curr = legacy_traverse(obj, initial_keys, create_missing=True)
+    if isinstance(curr, dict):
+        curr[final_key] = value
+    elif isinstance(curr, list):
+        final_key = int(final_key)
+        if final_key >= len(curr):
+            curr.extend([None] * (final_key - len(curr) + 1))
+        curr[final_key] = value
+    else:
+        setattr(curr, final_key, value)
+
+
+def make_records(count):
+    return [
+        {
+            "id": i,
+            "user": {"profile": {"address": {"city": f"city_{i % 50}"}}},
+            "history": tuple(range(1000)),
+            "items": [{"sku": i, "qty": 1}],
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(count, cases):
+    expected = None
+    for label, fn in cases:
+        elapsed, result = best_of(fn)
+        if expected is None:
+            expected = result
+        assert result == expected, label
+        print(f"    {label:>14}: {elapsed / count * 1e9:7.0f} ns/record")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    records = make_records(count)
+    print(f"{count} records")
+
+    for keys in [
+        ("user", "profile", "address", "city"),
+        ("items", 0, "sku"),
+        ("history", 500),
+    ]:
+        print(keys)
+        path = compile_path(*keys)
+        report(count, [
+            ("legacy", lambda: [legacy_get_deep(r, *keys) for r in records]),
+            ("get_deep", lambda: [get_deep(r, *keys) for r in records]),
+            ("compiled get", lambda: [path.get(r) for r in records]),
+            ("get_many", lambda: get_many(records, *keys)),
+        ])
+
+    keys = ("user", "profile", "seen")
+    print(keys, "set")
+    path = compile_path(*keys)
+
+    def run(setter):
+        for r in records:
+            setter(r)
+        return None
+
+    report(count, [
+        ("legacy", lambda: run(lambda r: legacy_set_deep(r, *keys, value=True))),
+        ("set_deep", lambda: run(lambda r: set_deep(r, *keys, value=True))),
+        ("compiled set", lambda: run(lambda r: path.set(r, True))),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-
-
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 
 class AdvancedQuerySet:
@@ -11,11 +11,12 @@ class AdvancedQuerySet:
             self.__queryObjHandlers[self.__index] = []
         if self.__index not in self.__queryObjMatchers:
             self.__queryObjMatchers[self.__index] = (None, [])
+        self.__query._invalidate()
 
     @property
     def __handlers(self) -> typing.List[typing.Callable]:
         return self.__query._AdvancedQuery__handlers[self.__index]
-    
+
     @property
     def __matchers(self) -> typing.Tuple[bool, typing.List[typing.Callable]]:
         return self.__query._AdvancedQuery__matchers[self.__index]
@@ -23,7 +24,7 @@ class AdvancedQuerySet:
     @property
     def __queryObjHandlers(self):
         return self.__query._AdvancedQuery__handlers
-    
+
     @property
     def __queryObjMatchers(self):
         return self.__query._AdvancedQuery__matchers
@@ -31,22 +32,27 @@ class AdvancedQuerySet:
     def remove(self):
         self.__queryObjHandlers.pop(self.__index)
         self.__queryObjMatchers.pop(self.__index)
+        self.__query._invalidate()
 
     def handler(self):
         def decorator(func : typing.Callable):
             self.__handlers.append(func)
+            self.__query._invalidate()
         return decorator
 
-    def matcher(self, any : bool | None = None):
+    def matcher(self, any : bool | None = None, pure : bool = False):
         def decorator(func : typing.Callable):
-            
+            if pure:
+                func.__pure__ = True
+
             flag, mlist = self.__queryObjMatchers[self.__index]
             if flag is not None and any is not None and any != flag:
                 raise ValueError("Cannot reset matcher flag")
             if any is not None:
                 self.__queryObjMatchers[self.__index] = (any, mlist)
             mlist.append(func)
-            
+            self.__query._invalidate()
+
         return decorator
 
 
@@ -56,11 +62,119 @@ class AQCtx:
         self.matchmap : typing.Dict[int, bool] = None
         self.cache = {}
 
+
+class AQStats:
+    """
+    calls and truthy results of one matcher. Cost and hit rate used for
+    ordering come from sampled items, where a pure matcher ran regardless of
+    the short circuit and was timed.
+    """
+
+    __slots__ = ("func", "calls", "hits", "sampled", "sampledHits", "time")
+
+    def __init__(self, func : typing.Callable):
+        self.func = func
+        self.calls = 0
+        self.hits = 0
+        self.sampled = 0
+        self.sampledHits = 0
+        self.time = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.time / self.sampled if self.sampled else 0.0
+
+    def cost(self, isany : bool) -> float:
+        """expected seconds spent per decided group, lower runs first"""
+        if not self.sampled:
+            # unmeasured matchers keep their place
+            return 0.0
+        rate = (self.sampledHits + 1) / (self.sampled + 2)
+        # all() is decided by a falsy result, any() by a truthy one
+        return self.mean / (rate if isany else 1 - rate)
+
+    def asdict(self) -> dict:
+        return {
+            "name": getattr(self.func, "__qualname__", repr(self.func)),
+            "calls": self.calls,
+            "hits": self.hits,
+            # estimated from the sampled calls
+            "time": self.mean * self.calls,
+            "mean": self.mean,
+        }
+
+
+class _Plan:
+    """
+    matchers compiled into a DAG: every distinct matcher function is one
+    node shared by all groups using it, a group is a list of node indexes
+    in declared order.
+
+    Only matchers declared pure (no side effects, safe on any item without
+    the matchers before them as guards) are sampled out of order and moved.
+    """
+
+    def __init__(self, matchers : typing.Dict[int, typing.Tuple[bool, typing.List[typing.Callable]]], stats : typing.Dict[typing.Callable, AQStats]):
+        index : typing.Dict[typing.Callable, int] = {}
+        self.funcs : typing.List[typing.Callable] = []
+        self.needsCtx : typing.List[bool] = []
+        self.pure : typing.List[bool] = []
+        self.groups : typing.List[typing.Tuple[int, bool, typing.List[int]]] = []
+
+        for id, (flag, mlist) in matchers.items():
+            nodes = []
+            for func in mlist:
+                if func not in index:
+                    index[func] = len(self.funcs)
+                    self.funcs.append(func)
+                    needsCtx = getattr(func, "__ctx_required__", None)
+                    if needsCtx is None:
+                        # added through AdvancedQuerySet.matcher
+                        needsCtx = 'ctx' in func.__code__.co_varnames
+                    self.needsCtx.append(needsCtx)
+                    self.pure.append(getattr(func, "__pure__", False))
+                    stats.setdefault(func, AQStats(func))
+                if index[func] not in nodes:
+                    nodes.append(index[func])
+            self.groups.append((id, flag is None or flag, nodes))
+
+        self.stats = [stats[func] for func in self.funcs]
+        self.ctxFree = not any(self.needsCtx)
+        self.sampled = [
+            node for node in range(len(self.funcs)) if self.pure[node] and not self.needsCtx[node]
+        ]
+
+    def reorder(self):
+        # only runs of consecutive pure matchers are sorted, any other matcher
+        # keeps its place and nothing moves across it
+        for _, isany, nodes in self.groups:
+            start = 0
+            while start < len(nodes):
+                if not self.pure[nodes[start]]:
+                    start += 1
+                    continue
+                end = start
+                while end < len(nodes) and self.pure[nodes[end]]:
+                    end += 1
+                nodes[start:end] = sorted(
+                    nodes[start:end], key=lambda node: self.stats[node].cost(isany)
+                )
+                start = end
+
+
 class AdvancedQuery:
+    # one matched item out of SAMPLE_EVERY runs and times every pure matcher
+    SAMPLE_EVERY = 16
+    # matched items between automatic reorders of the matchers
+    REORDER_EVERY = 256
+
     def __init__(self):
         self.__counter = 0
         self.__handlers : typing.Dict[int, typing.List[typing.Callable]] = {}
         self.__matchers : typing.Dict[int, typing.Tuple[bool, typing.List[typing.Callable]]] = {}
+        self.__stats : typing.Dict[typing.Callable, AQStats] = {}
+        self.__plan : _Plan = None
+        self.__matched = 0
 
 
     def __write_func_meta(self, func : typing.Callable):
@@ -69,6 +183,9 @@ class AdvancedQuery:
         else:
             func.__ctx_required__ = False
 
+    def _invalidate(self):
+        self.__plan = None
+
     def handler(self):
         def decorator(func : typing.Callable):
             obj = AdvancedQuerySet(self, self.__counter)
@@ -77,21 +194,27 @@ class AdvancedQuery:
             self.__counter += 1
             return obj
         return decorator
-    
-    def matcher(self, any : bool | None = None):
+
+    def matcher(self, any : bool | None = None, pure : bool = False):
+        """
+        pure matchers have no side effects and are safe on any item, they may be
+        sampled out of order and reordered by cost. Everything else runs in
+        declared order.
+        """
         def decorator(func : typing.Callable):
             obj = AdvancedQuerySet(self, self.__counter)
             self.__write_func_meta(func)
-            obj.matcher(any)(func)
+            obj.matcher(any, pure)(func)
             self.__counter += 1
             return obj
         return decorator
-    
+
     def appendToAllHandler(self):
         def decorator(func : typing.Callable):
             for handler in self.__handlers.values():
                 self.__write_func_meta(func)
                 handler.append(func)
+            self._invalidate()
         return decorator
 
     def appendToAllMatcher(self):
@@ -99,49 +222,114 @@ class AdvancedQuery:
             for flag, mlist in self.__matchers.values():
                 self.__write_func_meta(func)
                 mlist.append(func)
+            self._invalidate()
         return decorator
 
-    def match(self, item, ctx : AQCtx):
-        functionCache = {}
-        ctx.matchmap = {}
+    # ANCHOR compiled matching
+    def compile(self) -> _Plan:
+        if self.__plan is None:
+            self.__plan = _Plan(self.__matchers, self.__stats)
+            self.__plan.reorder()
+        return self.__plan
 
-        for id, (flag, mlist) in self.__matchers.items():
+    def optimize(self):
+        """reorder the pure matchers of every group by measured cost, cheap and decisive ones first"""
+        self.compile().reorder()
 
-            allres = []
-            isany = (flag is None or flag)
+    def stats(self) -> typing.List[dict]:
+        """per matcher timing and hit counts, most expensive first"""
+        return sorted(
+            (stat.asdict() for stat in self.__stats.values()),
+            key=lambda stat: stat["time"],
+            reverse=True,
+        )
 
-            for func in mlist:
-                # resolve function res
-                if func in functionCache:
-                    res = functionCache[func]
-                elif func.__ctx_required__:
-                    res = func(ctx, item)
-                    functionCache[func] = res
+    def __sample(self, plan : _Plan, item, values : list, done : list):
+        # run and time every pure matcher that cannot see ctx, so their hit
+        # rates are not skewed by the matchers ordered before them
+        for node in plan.sampled:
+            stat = plan.stats[node]
+            start = time.perf_counter()
+            res = plan.funcs[node](item)
+            stat.time += time.perf_counter() - start
+            stat.calls += 1
+            stat.sampled += 1
+            if res:
+                stat.hits += 1
+                stat.sampledHits += 1
+            values[node] = res
+            done[node] = True
+
+    def __evaluate(self, plan : _Plan, item, ctx : AQCtx) -> typing.Dict[int, bool]:
+        funcs, needsCtx, stats = plan.funcs, plan.needsCtx, plan.stats
+        # each matcher runs at most once per item, whichever groups share it
+        values = [None] * len(funcs)
+        done = [False] * len(funcs)
+        if plan.sampled and not self.__matched % self.SAMPLE_EVERY:
+            self.__sample(plan, item, values, done)
+        matchmap = {}
+
+        for id, isany, nodes in plan.groups:
+            result = bool(nodes) and not isany
+            for node in nodes:
+                if done[node]:
+                    res = values[node]
                 else:
-                    res = func(item)
-                    functionCache[func] = res
+                    res = funcs[node](ctx, item) if needsCtx[node] else funcs[node](item)
+                    stat = stats[node]
+                    stat.calls += 1
+                    if res:
+                        stat.hits += 1
+                    values[node] = res
+                    done[node] = True
 
                 if isany and res:
-                    # any
-                    allres.append(res)
+                    result = True
                     break
-                else:
-                    # all
-                    if not res:
-                        allres = []
-                        break
-                
-                allres.append(res)
-
-            if not allres:
-                ctx.matchmap[id] = False
-            elif isany:
-                ctx.matchmap[id] = any(allres)
-            else:
-                ctx.matchmap[id] = all(allres)
+                if not isany and not res:
+                    result = False
+                    break
+
+            matchmap[id] = result
+
+        self.__matched += 1
+        if self.__matched % self.REORDER_EVERY == 0:
+            plan.reorder()
+        return matchmap
 
+    def match(self, item, ctx : AQCtx):
+        ctx.matchmap = self.__evaluate(self.compile(), item, ctx)
         return ctx
-    
+
+    def match_many(self, items : typing.Iterable, key : typing.Callable | None = None) -> typing.List[AQCtx]:
+        """
+        match every item, returns one AQCtx per item.
+
+        With key, items with an equal key(item) share one evaluation, as long
+        as no matcher takes ctx. Only pass it when the matchers are stateless
+        and the key tells apart every item they would.
+        """
+        plan = self.compile()
+        dedupe = key is not None and plan.ctxFree
+        seen : typing.Dict[typing.Any, typing.Dict[int, bool]] = {}
+        ctxs = []
+
+        for item in items:
+            ctx = AQCtx()
+            matchmap = None
+            if dedupe:
+                itemKey = key(item)
+                matchmap = seen.get(itemKey)
+
+            if matchmap is None:
+                matchmap = self.__evaluate(plan, item, ctx)
+                if dedupe:
+                    seen[itemKey] = matchmap
+
+            ctx.matchmap = dict(matchmap)
+            ctxs.append(ctx)
+        return ctxs
+
     def handle(self,  ctx : AQCtx, item, **kwargs):
         if not ctx.matchmap:
             self.match(item, ctx)
@@ -154,3 +342,23 @@ class AdvancedQuery:
                     if res:
                         ctx.result = res
 
+    def handle_many(self, items : typing.Iterable, workers : int | None = None, **kwargs) -> typing.List[AQCtx]:
+        """
+        match all items, then run their handlers, returns one AQCtx per item.
+
+        With workers the handler chains of different items run in a thread
+        pool, the handlers of one item still run in order.
+        """
+        items = list(items)
+        ctxs = self.match_many(items)
+
+        def run(pair):
+            ctx, item = pair
+            self.handle(ctx, item, **kwargs)
+            return ctx
+
+        if workers is None:
+            return [run(pair) for pair in zip(ctxs, items)]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, zip(ctxs, items)))
@@ -1,5 +1,23 @@
+import functools as _functools
+import itertools as _itertools
 import typing as _typing
 
+_MISSING = object()
+_dict_get = dict.get
+
+
+def _nth(curr: _typing.Union[set, tuple], index: int):
+    if isinstance(curr, tuple):
+        return curr[index]
+    # sets have no index, walk them instead of copying them into a list
+    if index < 0:
+        index += len(curr)
+    if index < 0:
+        raise IndexError(index)
+    for item in _itertools.islice(curr, index, None):
+        return item
+    raise IndexError(index)
+
 
 def _traverse(obj: _typing.Union[dict, list, set, tuple], keys, create_missing=False):
     """
@@ -24,14 +42,14 @@ def _traverse(obj: _typing.Union[dict, list, set, tuple], keys, create_missing=F
         elif isinstance(curr, list):
             key = int(key)
             if create_missing and key >= len(curr):
-                curr.extend([{}] * (key - len(curr) + 1))
+                curr.extend({} for _ in range(key - len(curr) + 1))
             try:
                 curr = curr[key]
             except IndexError:
                 raise KeyError(f"Index {key} out of range for list")
         elif isinstance(curr, (set, tuple)):
             try:
-                curr = list(curr)[int(key)]
+                curr = _nth(curr, int(key))
             except IndexError:
                 raise KeyError(f"Index {key} out of range for set/tuple")
         else:
@@ -42,6 +60,218 @@ def _traverse(obj: _typing.Union[dict, list, set, tuple], keys, create_missing=F
     return curr
 
 
+def _as_index(key):
+    """int form of key, None if it has none"""
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        return None
+
+
+def _final_index(curr: list, key) -> int:
+    key = int(key)
+    if key >= len(curr):
+        curr.extend([None] * (key - len(curr) + 1))
+    return key
+
+
+class CompiledPath:
+    """
+    A sequence of keys prepared once for repeated get/set/delete on many objects.
+
+    Works like get_deep, set_deep, del_deep and set_default_deep with the same keys.
+    Plain dicts, lists and tuples are read directly with the int form of every
+    key worked out ahead of time, anything else (sets, attributes, subclasses,
+    missing keys) goes through the same traversal as get_deep.
+    Use compile_path to create one.
+    """
+
+    __slots__ = ("keys", "_steps", "_parent", "_parentSteps", "_final", "_dictOnly")
+
+    def __init__(self, *keys):
+        if not keys:
+            raise ValueError("a path needs at least one key")
+        self.keys = keys
+        self._steps = tuple((key, _as_index(key)) for key in keys)
+        *parent, self._final = keys
+        self._parent = tuple(parent)
+        self._parentSteps = self._steps[:-1]
+        # int keys are most likely list indexes, skip the dict attempt for them
+        self._dictOnly = not any(isinstance(key, int) for key in keys)
+
+    def __repr__(self):
+        return f"CompiledPath{self.keys!r}"
+
+    def _walk(self, obj):
+        curr = obj
+        for key, index in self._steps:
+            kind = type(curr)
+            if kind is dict:
+                curr = curr.get(key)
+                if curr is None:
+                    raise KeyError(f"Key {key} not found in dictionary")
+            elif index is not None and (kind is list or kind is tuple):
+                try:
+                    curr = curr[index]
+                except IndexError:
+                    raise KeyError(f"Index {index} out of range for {kind.__name__}")
+            else:
+                # reads have no side effects, start over on the general path
+                return _traverse(obj, self.keys)
+        return curr
+
+    def _walkParent(self, obj, create_missing=False):
+        """the container holding the final key, _traverse over the parent keys"""
+        curr = obj
+        for key, index in self._parentSteps:
+            kind = type(curr)
+            if kind is dict:
+                if create_missing and key not in curr:
+                    curr[key] = {}
+                curr = curr.get(key)
+                if curr is None:
+                    raise KeyError(f"Key {key} not found in dictionary")
+            elif index is not None and (kind is list or kind is tuple):
+                if create_missing and kind is list and index >= len(curr):
+                    curr.extend({} for _ in range(index - len(curr) + 1))
+                try:
+                    curr = curr[index]
+                except IndexError:
+                    raise KeyError(f"Index {index} out of range for {kind.__name__}")
+            else:
+                # whatever was created so far exists now, starting over is the same walk
+                return _traverse(obj, self._parent, create_missing)
+        return curr
+
+    def get(self, obj, default=_MISSING):
+        """
+        The value at the path, raises KeyError if it is missing unless default is given.
+        """
+        if self._dictOnly:
+            curr = obj
+            try:
+                for key in self.keys:
+                    # raises TypeError as soon as curr is no dict, None included
+                    curr = _dict_get(curr, key)
+            except TypeError:
+                curr = None
+            if curr is not None:
+                return curr
+
+        try:
+            return self._walk(obj)
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+
+    def set(self, obj, value):
+        """Set the value at the path, see set_deep."""
+        curr = self._walkParent(obj, create_missing=True)
+        if isinstance(curr, dict):
+            curr[self._final] = value
+        elif isinstance(curr, list):
+            curr[_final_index(curr, self._final)] = value
+        else:
+            setattr(curr, self._final, value)
+
+    def delete(self, obj):
+        """Delete the value at the path, see del_deep."""
+        curr = self._walkParent(obj)
+        if isinstance(curr, dict):
+            del curr[self._final]
+        elif isinstance(curr, list):
+            del curr[int(self._final)]
+        else:
+            delattr(curr, self._final)
+
+    def setdefault(self, obj, value, fillpadding=False):
+        """Set the value at the path unless it exists, see set_default_deep."""
+        curr = self._walkParent(obj, create_missing=True)
+        key = self._final
+
+        if isinstance(curr, set):
+            raise IndexError("set does not support default value")
+
+        if isinstance(curr, dict):
+            if key not in curr:
+                curr[key] = value
+        elif isinstance(curr, list):
+            key = int(key)
+            if key >= len(curr):
+                if fillpadding:
+                    curr.extend([None] * (key - len(curr) + 1))
+                else:
+                    raise IndexError(f"Index {key} out of range for list")
+            curr[key] = value
+        else:
+            if not hasattr(curr, key):
+                setattr(curr, key, value)
+
+    def get_many(self, objs: _typing.Iterable, default=_MISSING) -> list:
+        """
+        The value at the path of every object, raises KeyError on the first missing one
+        unless default is given.
+        """
+        get = self.get
+        if not self._dictOnly:
+            if default is _MISSING:
+                walk = self._walk
+                return [walk(obj) for obj in objs]
+            return [get(obj, default) for obj in objs]
+
+        keys = self.keys
+        values = []
+        append = values.append
+        for obj in objs:
+            # get() inlined, this loop is the hot path
+            curr = obj
+            try:
+                for key in keys:
+                    curr = _dict_get(curr, key)
+            except TypeError:
+                curr = None
+            append(get(obj, default) if curr is None else curr)
+        return values
+
+
+@_functools.lru_cache(maxsize=1024)
+def _compile_cached(keys):
+    return CompiledPath(*keys)
+
+
+def compile_path(*keys) -> CompiledPath:
+    """
+    Prepare a sequence of keys once for repeated get/set/delete.
+
+    Args:
+        *keys: The sequence of keys, as passed to get_deep.
+
+    Returns:
+        CompiledPath: Reusable accessor, paths with hashable keys are cached.
+    """
+    try:
+        return _compile_cached(keys)
+    except TypeError:
+        # unhashable key
+        return CompiledPath(*keys)
+
+
+def get_many(objs: _typing.Iterable, *keys, default=_MISSING) -> list:
+    """
+    Get the value at the same path from many nested objects.
+
+    Args:
+        objs: The nested objects, typically a list of records.
+        *keys: The sequence of keys to access the desired value.
+        default: Returned for objects missing the path, KeyError is raised if not given.
+
+    Returns:
+        list: One value per object.
+    """
+    return compile_path(*keys).get_many(objs, default)
+
+
 def get_deep(obj: _typing.Union[dict, list, set, tuple], *keys):
     """
     Get a value from a nested object using a sequence of keys.
@@ -68,17 +298,7 @@ def set_deep(obj: _typing.Union[dict, list, set, tuple], *keys, value):
     Returns:
         None
     """
-    *initial_keys, final_key = keys
-    curr = _traverse(obj, initial_keys, create_missing=True)
-    if isinstance(curr, dict):
-        curr[final_key] = value
-    elif isinstance(curr, list):
-        final_key = int(final_key)
-        if final_key >= len(curr):
-            curr.extend([None] * (final_key - len(curr) + 1))
-        curr[final_key] = value
-    else:
-        setattr(curr, final_key, value)
+    compile_path(*keys).set(obj, value)
 
 
 def del_deep(obj: _typing.Union[dict, list, set, tuple], *keys):
@@ -92,14 +312,7 @@ def del_deep(obj: _typing.Union[dict, list, set, tuple], *keys):
     Returns:
         None
     """
-    *initial_keys, final_key = keys
-    curr = _traverse(obj, initial_keys)
-    if isinstance(curr, dict):
-        del curr[final_key]
-    elif isinstance(curr, list):
-        del curr[int(final_key)]
-    else:
-        delattr(curr, final_key)
+    compile_path(*keys).delete(obj)
 
 
 def set_default_deep(
@@ -118,23 +331,4 @@ def set_default_deep(
     Returns:
         None
     """
-    *initial_keys, final_key = keys
-    curr = _traverse(obj, initial_keys, create_missing=True)
-
-    if isinstance(curr, set):
-        raise IndexError("set does not support default value")
-
-    if isinstance(curr, dict):
-        if final_key not in curr:
-            curr[final_key] = value
-    elif isinstance(curr, list):
-        final_key = int(final_key)
-        if final_key >= len(curr):
-            if fillpadding:
-                curr.extend([None] * (final_key - len(curr) + 1))
-            else:
-                raise IndexError(f"Index {final_key} out of range for list")
-        curr[final_key] = value
-    else:
-        if not hasattr(curr, final_key):
-            setattr(curr, final_key, value)
+    compile_path(*keys).setdefault(obj, value, fillpadding)
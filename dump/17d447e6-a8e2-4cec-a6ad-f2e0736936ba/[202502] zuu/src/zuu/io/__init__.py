@@ -1,76 +1,395 @@
-from zuu.UTILS.read import read_first_and_last_byte
+import contextlib
+import functools
+import importlib
+import itertools
+import os
+import shutil
+import uuid
+
+_NOTHING = object()
+
+# bytes read from the start of a file to sniff its format
+SNIFF_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=None)
+def _import(name: str):
+    """codec modules are looked up once, optional ones only when first used"""
+    return importlib.import_module(name)
+
+
+# ANCHOR files
+# fsync before the rename of atomic_open when not given per call
+FSYNC = False
+
+# compression picked by the last suffix, "state.json.gz" is a gzipped .json
+COMPRESSION = {
+    ".gz": "gzip",
+    ".zst": "zstandard",
+    ".lz4": "lz4.frame",
+}
+
+
+def _compression(path: str):
+    # without a dot this looks up the last character, never a suffix
+    return COMPRESSION.get(path[path.rfind(".") :])
+
+
+def _split_name(path: str) -> tuple:
+    """
+    (path without its compression suffix, last suffix of that), what the
+    format is chosen by and the registry key, in one pass over path
+    """
+    index = path.rfind(".")
+    if index == -1:
+        return path, ""
+    suffix = path[index:]
+    if suffix not in COMPRESSION:
+        return path, suffix
+    name = path[:index]
+    return name, _path_key(name)
+
+
+def _codec_open(module: str, file, mode: str, **kwargs):
+    if "b" not in mode and "t" not in mode:
+        # the codec modules default to binary
+        mode += "t"
+    if module == "zstandard":
+        kwargs.setdefault("closefd", not hasattr(file, "write"))
+    return _import(module).open(file, mode, **kwargs)
+
+
+def open_file(path: str, mode: str = "r", **kwargs):
+    """open() for reading that decompresses .gz, .zst and .lz4 files"""
+    # _compression inlined, every loader goes through here
+    module = COMPRESSION.get(path[path.rfind(".") :])
+    if module is None:
+        return open(path, mode, **kwargs)
+    return _codec_open(module, path, mode, **kwargs)
+
+
+@contextlib.contextmanager
+def atomic_open(path: str, mode: str = "w", fsync: bool = None, **kwargs):
+    """
+    open() for writing through a temporary file next to path that replaces
+    path once the block finished, a crash never leaves a truncated file.
+    .gz, .zst and .lz4 paths are compressed.
+
+    Args:
+        fsync: flush the data to disk before the rename, FSYNC if None
+    """
+    if fsync is None:
+        fsync = FSYNC
+    # a symlink stays a symlink, the file it points to is replaced
+    path = os.path.realpath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+    module = _compression(path)
+
+    try:
+        with open(tmp_path, "xb") as raw:
+            if module is None:
+                if "b" in mode:
+                    yield raw
+                else:
+                    f = _import("io").TextIOWrapper(raw, **kwargs)
+                    yield f
+                    f.flush()
+                    f.detach()
+            else:
+                # the codec stream leaves raw open, so it can still be synced
+                with _codec_open(module, raw, mode, **kwargs) as f:
+                    yield f
+
+            raw.flush()
+            if fsync:
+                os.fsync(raw.fileno())
+
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# ANCHOR registry
+def _sniff_file(path: str):
+    """
+    (head, last byte) of path in a single read, None if it cannot be read.
+    The last byte is None for a compressed file longer than its head.
+    """
+    try:
+        if _compression(path) is not None:
+            # no seeking in a compressed stream, only its head is decompressed
+            with open_file(path, "rb") as f:
+                head = f.read(SNIFF_SIZE)
+                if not f.read(1):
+                    return head, head[-1:]
+                return head, None
+
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_SIZE)
+            if len(head) < SNIFF_SIZE:
+                return head, head[-1:]
+            f.seek(-1, os.SEEK_END)
+            return head, f.read(1)
+    except OSError:
+        return None
+
+
+def _path_key(path: str) -> str:
+    # last suffix, the same part path.endswith(".json") looks at
+    index = path.rfind(".")
+    return path[index:] if index != -1 else ""
+
+
+class Ext:
+    """
+    Validator matching paths ending in suffix, and for dumpers optionally
+    only objects of the given types. Registries index it by its suffix when
+    that is a single extension (".json"), others ("rc", ".tar.gz") are tried
+    for every path.
+    """
+
+    def __init__(self, suffix: str, types: type | tuple = None):
+        self.suffix = suffix
+        self.types = types
+        if suffix.startswith(".") and suffix.count(".") == 1:
+            self.keys = (suffix,)
+        else:
+            self.keys = None
+
+    def __call__(self, path: str, obj=_NOTHING) -> bool:
+        return path.endswith(self.suffix) and (
+            self.types is None or obj is _NOTHING or isinstance(obj, self.types)
+        )
+
+    def __repr__(self):
+        return f"Ext({self.suffix!r})"
+
+
+class Sniff:
+    """
+    Validator looking at the content of a file, match(head, last) gets the
+    first SNIFF_SIZE bytes and the last byte (None when unknown, for
+    compressed files). Registries read them once per call and share them
+    between all sniffers.
+    """
+
+    keys = None
+
+    def __init__(self, match, types: type | tuple = None):
+        self.match = match
+        self.types = types
+
+    def test(self, sniffed, obj=_NOTHING) -> bool:
+        if sniffed is None:
+            return False
+        if self.types is not None and obj is not _NOTHING and not isinstance(obj, self.types):
+            return False
+        return self.match(*sniffed)
+
+    def __call__(self, path: str, obj=_NOTHING) -> bool:
+        return self.test(_sniff_file(path), obj)
+
+
+class Prefix:
+    """
+    Validator for strings, only tried for strings starting with one of
+    prefixes (str or bytes) and then checked with test(s).
+    """
+
+    def __init__(self, prefixes, test):
+        self.prefixes = tuple(prefixes)
+        self.test = test
+        self.keys = tuple(prefix[:1] for prefix in self.prefixes)
+
+    def __call__(self, s) -> bool:
+        return s[:1] in self.keys and s.startswith(self.prefixes) and self.test(s)
+
+
+class Registry(list):
+    """
+    List of [validator, handler] pairs, tried in order.
+
+    Validators with ``keys`` (Ext, Prefix) are indexed by them, so a lookup
+    only runs the validators registered for the key of its input plus the
+    ones without keys (plain functions, Sniff). Handlers may be replaced in
+    place (``registry[0][1] = func``), a new validator needs a new entry
+    (``registry[0] = [validator, func]``) so the index is rebuilt.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._index = None
+
+    def _build(self) -> dict:
+        keyed = {key for validator, _ in self for key in getattr(validator, "keys", None) or ()}
+
+        def matching(key):
+            return [
+                entry
+                for entry in self
+                if getattr(entry[0], "keys", None) is None or key in entry[0].keys
+            ]
+
+        index = {key: matching(key) for key in keyed}
+        index[_NOTHING] = matching(_NOTHING)
+        self._index = index
+        return index
+
+    def candidates(self, key) -> list:
+        index = self._index or self._build()
+        return index.get(key) or index[_NOTHING]
+
+    def register(self, validator, handler, types: type | tuple = None):
+        """
+        Add a handler, a str validator is a suffix (see Ext). Handlers are
+        tried before the Sniff fallbacks.
+        """
+        if isinstance(validator, str):
+            validator = Ext(validator, types)
+        position = next(
+            (i for i, (v, _) in enumerate(self) if isinstance(v, Sniff)), len(self)
+        )
+        self.insert(position, [validator, handler])
+        return handler
+
+    def copy(self) -> "Registry":
+        return Registry(self)
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._index = None
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+# every structural change invalidates the index
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(Registry, _name, _invalidating(_name))
+del _name
+
+
+def _candidates(seq: list, key):
+    if isinstance(seq, Registry):
+        return seq.candidates(key)
+    return seq
+
+
+def _accepts(validator, name: str, path: str, sniffed: list, obj=_NOTHING) -> bool:
+    # name is path without a compression suffix
+    if validator.__class__ is Ext:
+        # what a keyed lookup finds first
+        return validator(name, obj)
+    if isinstance(validator, Sniff):
+        # read once, shared by every sniffer of this call
+        if not sniffed:
+            sniffed.append(_sniff_file(path))
+        return validator.test(sniffed[0], obj)
+    if obj is _NOTHING:
+        return validator(name)
+    return validator(name, obj)
+
+
+def _is_json(head: bytes, last: bytes | None) -> bool:
+    if last is None:
+        return head[:1] in (b"[", b"{")
+    return (head[:1], last) in [(b"[", b"]"), (b"{", b"}")]
 
 
 #  ANCHOR load
 def load_json(path: str, **kwargs):
-    import json
+    json = _import("json")
 
     openKwargs = kwargs.pop("open", {})
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_file(path, **openKwargs) as f:
         return json.load(f, **loadKwargs, **kwargs)
 
 
 def load_pickle(path: str, **kwargs):
-    import pickle
+    pickle = _import("pickle")
 
     openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("mode", "rb")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_file(path, **openKwargs) as f:
         return pickle.load(f, **loadKwargs, **kwargs)
 
 
 def load_csv(path: str, **kwargs):
-    import csv
+    csv = _import("csv")
 
     openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("newline", "")
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
-        return csv.load(f, **loadKwargs, **kwargs)
+    with open_file(path, **openKwargs) as f:
+        return list(csv.reader(f, **loadKwargs, **kwargs))
 
 
 def load_txt(path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
-    with open(path, **openKwargs) as f:
+    with open_file(path, **openKwargs) as f:
         return f.read()
 
 
 def load_xml(path: str, **kwargs):
-    import xml.etree.ElementTree as ET
+    ET = _import("xml.etree.ElementTree")
 
     openKwargs = kwargs.pop("open", {})
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_file(path, **openKwargs) as f:
         return ET.parse(f, **loadKwargs, **kwargs)
 
 
 def load_toml(path: str, **kwargs):
-    import toml
+    toml = _import("toml")
 
-    return toml.load(path, **kwargs)
+    with open_file(path, encoding="utf-8") as f:
+        return toml.load(f, **kwargs)
 
 
 def load_yaml(path: str, **kwargs):
-    import yaml
+    yaml = _import("yaml")
 
     openKwargs = kwargs.pop("open", {})
     loadKwargs = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_file(path, **openKwargs) as f:
         return yaml.safe_load(f, **loadKwargs, **kwargs)
 
 
-DEFAULT_LOAD = [
-    [lambda path: path.endswith(".json"), load_json],
-    [lambda path: path.endswith(".pickle"), load_pickle],
-    [lambda path: path.endswith(".csv"), load_csv],
-    [lambda path: path.endswith(".txt"), load_txt],
-    [lambda path: path.endswith(".toml"), load_toml],
-    [lambda path: path.endswith(".xml"), load_xml],
+DEFAULT_LOAD = Registry(
     [
-        lambda path: read_first_and_last_byte(path) in [(b"[", b"]"), (b"{", b"}")],
-        load_json,
-    ],
-]
+        [Ext(".json"), load_json],
+        [Ext(".pickle"), load_pickle],
+        [Ext(".csv"), load_csv],
+        [Ext(".txt"), load_txt],
+        [Ext(".toml"), load_toml],
+        [Ext(".xml"), load_xml],
+        [Sniff(_is_json), load_json],
+    ]
+)
 
 
 def load(
@@ -80,8 +399,10 @@ def load(
     _try_all: bool = False,
     **kwargs,
 ):
-    for validator, loader in _seq:
-        if validator(path):
+    name, key = _split_name(path)
+    sniffed = []
+    for validator, loader in _candidates(_seq, key):
+        if _accepts(validator, name, path, sniffed):
             try:
                 return loader(path, **kwargs)
             except Exception as e:
@@ -98,12 +419,12 @@ def load(
 
 
 def load_json_w_encoding(path: str, **kwargs):
-    import json
+    json = _import("json")
 
     openKwargs: dict = kwargs.pop("open", {})
     openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
     loadKwargs: dict = kwargs.pop("load", {})
-    with open(path, **openKwargs) as f:
+    with open_file(path, **openKwargs) as f:
         return json.load(f, **loadKwargs, **kwargs)
 
 
@@ -113,85 +434,81 @@ UTF8_LOAD[0][1] = load_json_w_encoding
 
 # ANCHOR dump
 def dump_json(obj, path: str, **kwargs):
-    import json
+    json = _import("json")
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "w", **openKwargs) as f:
+    with atomic_open(path, "w", **openKwargs) as f:
         json.dump(obj, f, **dumpKwargs, **kwargs)
 
 
 def dump_pickle(obj, path: str, **kwargs):
-    import pickle
+    pickle = _import("pickle")
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "wb", **openKwargs) as f:
+    with atomic_open(path, "wb", **openKwargs) as f:
         pickle.dump(obj, f, **dumpKwargs, **kwargs)
 
 
 def dump_csv(obj, path: str, **kwargs):
-    import csv
+    csv = _import("csv")
 
     openKwargs: dict = kwargs.pop("open", {})
     writeKwargs: dict = kwargs.pop("write", {})
-    with open(path, "w", newline="", **openKwargs) as f:
+    with atomic_open(path, "w", newline="", **openKwargs) as f:
         writer = csv.writer(f, **writeKwargs)
         writer.writerows(obj)
 
 
 def dump_txt(obj, path: str, **kwargs):
     openKwargs: dict = kwargs.pop("open", {})
-    with open(path, "w", **openKwargs) as f:
+    with atomic_open(path, "w", **openKwargs) as f:
         f.write(str(obj))
 
 
 def dump_toml(obj, path: str, **kwargs):
-    import toml
+    toml = _import("toml")
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "w", **openKwargs) as f:
+    with atomic_open(path, "w", **openKwargs) as f:
         toml.dump(obj, f, **dumpKwargs, **kwargs)
 
 
 def dump_xml(obj, path: str, **kwargs):
-    import xml.etree.ElementTree as ET
+    ET = _import("xml.etree.ElementTree")
 
     openKwargs: dict = kwargs.pop("open", {})
     dumpKwargs: dict = kwargs.pop("dump", {})
-    with open(path, "w", **openKwargs) as f:
-        ET.dump(obj, f, **dumpKwargs, **kwargs)
+    tree = obj if isinstance(obj, ET.ElementTree) else ET.ElementTree(obj)
+    with atomic_open(path, "w", **openKwargs) as f:
+        tree.write(f, encoding="unicode", **dumpKwargs, **kwargs)
 
 
 # ANCHOR advanced dump
 def dump_json_w_encoding(obj, path: str, **kwargs):
-    import json
+    json = _import("json")
 
     openKwargs: dict = kwargs.pop("open", {})
     openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
     dumpKwargs: dict = kwargs.pop("dump", {})
     dumpKwargs["ensure_ascii"] = kwargs.pop("ensure_ascii", False)
-    with open(path, "w", **openKwargs) as f:
+    with atomic_open(path, "w", **openKwargs) as f:
         json.dump(obj, f, **dumpKwargs, **kwargs)
 
 
-DEFAULT_DUMP = [
-    [
-        lambda path, obj: path.endswith(".json") and isinstance(obj, (dict, list)),
-        dump_json,
-    ],
-    [lambda path, obj: path.endswith(".pickle"), dump_pickle],
-    [lambda path, obj: path.endswith(".xml"), dump_xml],
-    [lambda path, obj: path.endswith(".csv") and isinstance(obj, list), dump_csv],
-    [lambda path, obj: path.endswith(".txt") and isinstance(obj, str), dump_txt],
-    [lambda path, obj: path.endswith(".toml") and isinstance(obj, dict), dump_toml],
+DEFAULT_DUMP = Registry(
     [
-        lambda path, obj: read_first_and_last_byte(path) in [(b"[", b"]"), (b"{", b"}")]
-        and isinstance(obj, (dict, list)),
-        dump_json,
-    ],
-]
+        [Ext(".json", (dict, list)), dump_json],
+        [Ext(".pickle"), dump_pickle],
+        [Ext(".xml"), dump_xml],
+        [Ext(".csv", list), dump_csv],
+        [Ext(".txt", str), dump_txt],
+        [Ext(".toml", dict), dump_toml],
+        [Sniff(_is_json, (dict, list)), dump_json],
+    ]
+)
 
 
 def dump(
@@ -202,8 +519,10 @@ def dump(
     _try_all: bool = False,
     **kwargs,
 ):
-    for validator, dumper in _seq:
-        if validator(path, obj):
+    name, key = _split_name(path)
+    sniffed = []
+    for validator, dumper in _candidates(_seq, key):
+        if _accepts(validator, name, path, sniffed, obj):
             try:
                 return dumper(obj, path, **kwargs)
             except Exception as e:
@@ -221,54 +540,57 @@ UTF8_DUMP[0][1] = dump_json_w_encoding
 
 
 def loads_json(s: str, **kwargs):
-    import json
+    json = _import("json")
 
     return json.loads(s, **kwargs)
 
 
 def loads_pickle(s: str, **kwargs):
-    import pickle
+    pickle = _import("pickle")
 
     return pickle.loads(s, **kwargs)
 
 
 def loads_csv(s: str, **kwargs):
-    import csv
+    csv = _import("csv")
 
     return csv.loads(s, **kwargs)
 
 
 def loads_toml(s: str, **kwargs):
-    import toml
+    toml = _import("toml")
 
     return toml.loads(s, **kwargs)
 
 
 def loads_yaml(s: str, **kwargs):
-    import yaml
-    from io import StringIO
+    yaml = _import("yaml")
 
-    return yaml.load(StringIO(s), **kwargs)
+    return yaml.load(_import("io").StringIO(s), **kwargs)
 
 
 def loads_xml(s: str, **kwargs):
-    import xml.etree.ElementTree as ET
+    ET = _import("xml.etree.ElementTree")
 
     return ET.fromstring(s, **kwargs)
 
 
-DEFAULT_LOADS = [
-    [lambda s: s.startswith("{") and s.endswith("}"), loads_json],
-    [lambda s: s.startswith("[") and s.endswith("]"), loads_json],
-    [lambda s: s.startswith("<") and s.endswith(">"), loads_xml],
-    [lambda s: s.startswith(b"\x80") or s.startswith(b"\x00"), loads_pickle],
+DEFAULT_LOADS = Registry(
     [
-        lambda s: ((s.startswith("[") and "\n" in s) or "[[" in s) and "=" in s,
-        loads_toml,
-    ],
-    [lambda s: "\t" in s and ";" in s, loads_yaml],
-    [lambda s: "," in s and "\n" in s, loads_csv],
-]
+        [Prefix("{", lambda s: s.endswith("}")), loads_json],
+        [Prefix("[", lambda s: s.endswith("]")), loads_json],
+        [Prefix("<", lambda s: s.endswith(">")), loads_xml],
+        [Prefix((b"\x80", b"\x00"), lambda s: True), loads_pickle],
+        [
+            lambda s: isinstance(s, str)
+            and ((s.startswith("[") and "\n" in s) or "[[" in s)
+            and "=" in s,
+            loads_toml,
+        ],
+        [lambda s: isinstance(s, str) and "\t" in s and ";" in s, loads_yaml],
+        [lambda s: isinstance(s, str) and "," in s and "\n" in s, loads_csv],
+    ]
+)
 
 
 def loads(
@@ -278,7 +600,7 @@ def loads(
     _try_all: bool = False,
     **kwargs,
 ):
-    for validator, loader in _seq:
+    for validator, loader in _candidates(_seq, s[:1]):
         if validator(s):
             try:
                 return loader(s, **kwargs)
@@ -294,36 +616,281 @@ def loads(
 
 # ANCHOR dumps
 def dumps_json(obj, **kwargs):
-    import json
+    json = _import("json")
 
     return json.dumps(obj, **kwargs)
 
 
 def dumps_pickle(obj, **kwargs):
-    import pickle
+    pickle = _import("pickle")
 
     return pickle.dumps(obj, **kwargs)
 
 
 def dumps_csv(obj, **kwargs):
-    import csv
+    csv = _import("csv")
 
     return csv.dumps(obj, **kwargs)
 
 
 def dumps_toml(obj, **kwargs):
-    import toml
+    toml = _import("toml")
 
     return toml.dumps(obj, **kwargs)
 
 
 def dumps_yaml(obj, **kwargs):
-    import yaml
+    yaml = _import("yaml")
 
     return yaml.dump(obj, **kwargs)
 
 
 def dumps_xml(obj, **kwargs):
-    import xml.etree.ElementTree as ET
+    ET = _import("xml.etree.ElementTree")
 
     return ET.dumps(obj, **kwargs)
+
+
+# ANCHOR iter_load
+# bytes read at a time by the incremental JSON array parser
+ITER_CHUNK_SIZE = 1 << 16
+
+
+def iter_load_jsonl(path: str, **kwargs):
+    json = _import("json")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    with open_file(path, **openKwargs) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line, **kwargs)
+
+
+def iter_load_csv(path: str, **kwargs):
+    csv = _import("csv")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    openKwargs.setdefault("newline", "")
+    with open_file(path, **openKwargs) as f:
+        yield from csv.DictReader(f, **kwargs)
+
+
+def iter_load_yaml(path: str, **kwargs):
+    yaml = _import("yaml")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    with open_file(path, **openKwargs) as f:
+        yield from yaml.safe_load_all(f, **kwargs)
+
+
+def iter_load_json(path: str, **kwargs):
+    """
+    Yield the items of a top-level JSON array one at a time, only the item
+    being parsed is held in memory. Any other document is yielded whole.
+    """
+    json = _import("json")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    decoder = json.JSONDecoder(**kwargs)
+    whitespace = " \t\n\r"
+
+    with open_file(path, **openKwargs) as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill(size=ITER_CHUNK_SIZE):
+            nonlocal buffer, pos, eof
+            chunk = f.read(size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in whitespace:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                fill()
+
+        fill()
+        skip_whitespace()
+        if buffer[pos : pos + 1] != "[":
+            yield decoder.decode(buffer[pos:] + f.read())
+            return
+        pos += 1
+
+        skip_whitespace()
+        if buffer[pos : pos + 1] == "]":
+            return
+
+        size = ITER_CHUNK_SIZE
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # a number running into the end of the buffer may go on,
+                # "12." or "1e" at the end is read as 12 or 1 and stops before it
+                if (
+                    not eof
+                    and buffer[pos] in "-0123456789"
+                    and buffer[end : end + 1] in ("", ".", "e", "E")
+                ):
+                    raise ValueError("item may continue")
+            except ValueError:
+                if eof:
+                    raise
+                # items larger than the buffer read ahead in growing chunks
+                fill(size)
+                size *= 2
+                continue
+
+            size = ITER_CHUNK_SIZE
+            pos = end
+            yield item
+
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError("Unterminated JSON array")
+            if buffer[pos] == "]":
+                return
+            if buffer[pos] != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {buffer[pos]!r}")
+            pos += 1
+            skip_whitespace()
+            if pos > ITER_CHUNK_SIZE:
+                # drop what was parsed, keeps memory constant
+                buffer = buffer[pos:]
+                pos = 0
+
+
+DEFAULT_ITER_LOAD = Registry(
+    [
+        [Ext(".jsonl"), iter_load_jsonl],
+        [Ext(".ndjson"), iter_load_jsonl],
+        [Ext(".csv"), iter_load_csv],
+        [Ext(".yaml"), iter_load_yaml],
+        [Ext(".yml"), iter_load_yaml],
+        [Ext(".json"), iter_load_json],
+        [Sniff(_is_json), iter_load_json],
+    ]
+)
+
+
+def iter_load(path: str, _seq: list = DEFAULT_ITER_LOAD, **kwargs):
+    """
+    Lazily yield the records of path: lines of JSON Lines, rows of CSV as
+    dicts, documents of a YAML stream or the items of a JSON array.
+    """
+    name, key = _split_name(path)
+    sniffed = []
+    for validator, loader in _candidates(_seq, key):
+        if _accepts(validator, name, path, sniffed):
+            return loader(path, **kwargs)
+    raise ValueError(f"No suitable iter loader found for file: {path}")
+
+
+# ANCHOR iter_dump
+def iter_dump_jsonl(records, path: str, batch_size: int = 1000, **kwargs) -> int:
+    json = _import("json")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    count = 0
+    with atomic_open(path, "w", **openKwargs) as f:
+        for batch in itertools.batched(records, batch_size):
+            f.write("".join(json.dumps(record, **kwargs) + "\n" for record in batch))
+            count += len(batch)
+    return count
+
+
+def iter_dump_json(records, path: str, batch_size: int = 1000, **kwargs) -> int:
+    json = _import("json")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    count = 0
+    with atomic_open(path, "w", **openKwargs) as f:
+        f.write("[")
+        for batch in itertools.batched(records, batch_size):
+            f.write(
+                ("," if count else "")
+                + ",".join("\n" + json.dumps(record, **kwargs) for record in batch)
+            )
+            count += len(batch)
+        f.write("\n]" if count else "]")
+    return count
+
+
+def iter_dump_csv(records, path: str, batch_size: int = 1000, **kwargs) -> int:
+    """
+    dict records are written with a header, fieldnames default to the
+    keys of the first record; other records are written as plain rows,
+    after fieldnames as a header row when given
+    """
+    csv = _import("csv")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    openKwargs.setdefault("newline", "")
+    fieldnames = kwargs.pop("fieldnames", None)
+    count = 0
+    with atomic_open(path, "w", **openKwargs) as f:
+        writer = None
+        for batch in itertools.batched(records, batch_size):
+            if writer is None:
+                if isinstance(batch[0], dict):
+                    writer = csv.DictWriter(f, fieldnames or list(batch[0]), **kwargs)
+                    writer.writeheader()
+                else:
+                    writer = csv.writer(f, **kwargs)
+                    if fieldnames:
+                        writer.writerow(fieldnames)
+            writer.writerows(batch)
+            count += len(batch)
+    return count
+
+
+def iter_dump_yaml(records, path: str, batch_size: int = 1000, **kwargs) -> int:
+    yaml = _import("yaml")
+
+    openKwargs = kwargs.pop("open", {})
+    openKwargs.setdefault("encoding", "utf-8")
+    count = 0
+    with atomic_open(path, "w", **openKwargs) as f:
+        for batch in itertools.batched(records, batch_size):
+            yaml.safe_dump_all(batch, f, explicit_start=True, **kwargs)
+            count += len(batch)
+    return count
+
+
+DEFAULT_ITER_DUMP = Registry(
+    [
+        [Ext(".jsonl"), iter_dump_jsonl],
+        [Ext(".ndjson"), iter_dump_jsonl],
+        [Ext(".csv"), iter_dump_csv],
+        [Ext(".yaml"), iter_dump_yaml],
+        [Ext(".yml"), iter_dump_yaml],
+        [Ext(".json"), iter_dump_json],
+    ]
+)
+
+
+def iter_dump(
+    records, path: str, batch_size: int = 1000, _seq: list = DEFAULT_ITER_DUMP, **kwargs
+) -> int:
+    """
+    Write records from any iterable to path, batch_size records per write,
+    so the records never have to be in memory at once. Returns the number
+    of records written.
+    """
+    name, key = _split_name(path)
+    for validator, dumper in _candidates(_seq, key):
+        if validator(name):
+            return dumper(records, path, batch_size=batch_size, **kwargs)
+    raise ValueError(f"No suitable iter dumper found for {path}")
@@ -5,15 +5,15 @@ from ..io import *  # noqa
 def load_json(path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
     loadKwargs = kwargs.pop("load", {})
-    with open(path, "rb", **openKwargs) as f:
+    with open_file(path, "rb", **openKwargs) as f:
         return orjson.loads(f.read(), **loadKwargs, **kwargs)
 
 
 def dump_json(obj, path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
     dumpKwargs = kwargs.pop("dump", {})
-    with open(path, "wb", **openKwargs) as f:
-        return orjson.dumps(obj, f, **dumpKwargs, **kwargs)
+    with atomic_open(path, "wb", **openKwargs) as f:
+        f.write(orjson.dumps(obj, **dumpKwargs, **kwargs))
 
 
 def loads_json(s: str, **kwargs):
@@ -24,20 +24,21 @@ def dumps_json(obj, **kwargs):
     return orjson.dumps(obj, **kwargs)
 
 
+# orjson only reads and writes utf-8, encoding is accepted for compatibility
 def load_json_w_encoding(path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
-    openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
+    kwargs.pop("encoding", None)
     loadKwargs = kwargs.pop("load", {})
-    with open(path, "rb", **openKwargs) as f:
+    with open_file(path, "rb", **openKwargs) as f:
         return orjson.loads(f.read(), **loadKwargs, **kwargs)
 
 
 def dump_json_w_encoding(obj, path: str, **kwargs):
     openKwargs = kwargs.pop("open", {})
-    openKwargs["encoding"] = kwargs.pop("encoding", "utf-8")
+    kwargs.pop("encoding", None)
     dumpKwargs = kwargs.pop("dump", {})
-    with open(path, "wb", **openKwargs) as f:
-        return orjson.dumps(obj, **dumpKwargs, **kwargs)
+    with atomic_open(path, "wb", **openKwargs) as f:
+        f.write(orjson.dumps(obj, **dumpKwargs, **kwargs))
 
 
 # Override the default loaders/dumpers
@@ -59,6 +59,146 @@ def test_match_c(setup_query : AdvancedQuery):
     assert ctx.result == 'function_result'
 
 
+def test_any_group_checks_every_matcher():
+    query = AdvancedQuery()
+
+    @query.matcher(any=True)
+    def is_int(item):
+        return isinstance(item, int)
+
+    @is_int.matcher()
+    def is_str(item):
+        return isinstance(item, str)
+
+    ctxs = query.match_many([1, "a", 1.5])
+    assert [ctx.matchmap[0] for ctx in ctxs] == [True, True, False]
+
+def test_shared_matcher_runs_once_per_item():
+    query = AdvancedQuery()
+    calls = []
+
+    def shared(item):
+        calls.append(item)
+        return item > 0
+
+    first = query.matcher(any=False)(shared)
+    second = query.matcher(any=False)(shared)
+    second.matcher()(lambda item: item % 2 == 0)
+
+    ctx = query.match(4, AQCtx())
+    assert ctx.matchmap == {0: True, 1: True}
+    assert calls == [4]
+
+    # without a key every item is evaluated
+    ctxs = query.match_many([3, 3])
+    assert [ctx.matchmap for ctx in ctxs] == [{0: True, 1: False}, {0: True, 1: False}]
+    assert calls == [4, 3, 3]
+
+    # items with the same key share one evaluation
+    ctxs = query.match_many([3, 3, -1], key=lambda item: item)
+    assert [ctx.matchmap for ctx in ctxs] == [{0: True, 1: False}, {0: True, 1: False}, {0: False, 1: False}]
+    assert calls == [4, 3, 3, 3, -1]
+    first.remove()
+    assert query.match(2, AQCtx()).matchmap == {1: True}
+
+def test_optimize_runs_decisive_matchers_first():
+    query = AdvancedQuery()
+    order = []
+
+    @query.matcher(any=False, pure=True)
+    def rarely_false(item):
+        order.append("rarely_false")
+        return True
+
+    @rarely_false.matcher(pure=True)
+    def often_false(item):
+        order.append("often_false")
+        return item == 0
+
+    # every item is a sample, both matchers always run
+    query.SAMPLE_EVERY = 1
+    query.match_many(range(10))
+    assert order.count("often_false") == 10
+
+    query.SAMPLE_EVERY = 1000
+    query.optimize()
+    order.clear()
+    query.match(5, AQCtx())
+    assert order == ["often_false"]
+
+    stats = {stat["name"].rsplit(".", 1)[-1]: stat for stat in query.stats()}
+    assert stats["often_false"]["calls"] == 11
+    assert stats["often_false"]["hits"] == 1
+    assert stats["rarely_false"]["calls"] == 10
+    assert stats["rarely_false"]["hits"] == 10
+    assert stats["rarely_false"]["mean"] > 0
+
+def test_guarded_chain_keeps_declared_order():
+    query = AdvancedQuery()
+    query.SAMPLE_EVERY = 1
+    query.REORDER_EVERY = 1
+
+    @query.matcher(any=False)
+    def is_dict(item):
+        return isinstance(item, dict)
+
+    # only safe behind is_dict, so not pure
+    is_dict.matcher()(lambda item: item['x'] > 3)
+
+    ctxs = query.match_many([{'x': 5}] * 16 + [None])
+    assert [ctx.matchmap[0] for ctx in ctxs] == [True] * 16 + [False]
+    query.optimize()
+    assert query.match(None, AQCtx()).matchmap == {0: False}
+
+def test_pure_matchers_do_not_cross_others():
+    query = AdvancedQuery()
+    order = []
+
+    def make(name, result):
+        def func(item):
+            order.append(name)
+            return result
+        func.__qualname__ = name
+        return func
+
+    group = query.matcher(any=False, pure=True)(make("first", True))
+    group.matcher()(make("barrier", True))
+    group.matcher(pure=True)(make("a", True))
+    group.matcher(pure=True)(make("b", False))
+
+    query.SAMPLE_EVERY = 1
+    query.match_many(range(5))
+    query.SAMPLE_EVERY = 1000
+    query.optimize()
+    order.clear()
+    query.match(0, AQCtx())
+    # b moves ahead of a, nothing moves across the barrier
+    assert order == ["first", "barrier", "b"]
 
+def test_match_many_does_not_merge_equal_items():
+    query = AdvancedQuery()
+    query.matcher()(lambda item: type(item) is int)
+
+    assert [ctx.matchmap[0] for ctx in query.match_many([1, 1.0, True])] == [True, False, False]
+    merged = query.match_many([1, 1.0, True], key=lambda item: (type(item), item))
+    assert [ctx.matchmap[0] for ctx in merged] == [True, False, False]
+
+def test_handle_many(setup_query : AdvancedQuery):
+    query = setup_query
+    cache = {'a': 'dir_a', 'b': 'file_b', 'c': 'func_c'}
+    items = ['dir(a)', 'file(b)', 'func(c)', 'other'] * 5
+    expected = ['dir_a', 'file_b', 'func_c', 'other'] * 5
+
+    assert [ctx.result for ctx in query.handle_many(items, cache=cache)] == expected
+    assert [ctx.result for ctx in query.handle_many(items, workers=4, cache=cache)] == expected
+
+def test_ctx_matchers_are_not_shared_across_items():
+    query = AdvancedQuery()
+
+    @query.matcher()
+    def seen(ctx, item):
+        ctx.cache["seen"] = item
+        return True
 
-        
\ No newline at end of file
+    ctxs = query.match_many(["x", "x"])
+    assert [ctx.cache for ctx in ctxs] == [{"seen": "x"}, {"seen": "x"}]
@@ -1,5 +1,12 @@
 import pytest
-from zuu.UTILS.traverse import get_deep, set_deep, del_deep, set_default_deep
+from zuu.UTILS.traverse import (
+    compile_path,
+    del_deep,
+    get_deep,
+    get_many,
+    set_default_deep,
+    set_deep,
+)
 
 class TestDrillFunctions:
     @pytest.fixture
@@ -162,3 +169,104 @@ class TestComplexDataStructures:
             get_deep(complex_data, "settings", "theme", "animations", "duration")
             == "0.3s"
         )
+
+
+class TestCompiledPath:
+    @pytest.fixture
+    def records(self):
+        return [
+            {"id": 1, "tags": ("a", "b"), "meta": {"size": 10}},
+            {"id": 2, "tags": ("c",), "meta": {"size": 20}},
+            {"id": 3, "tags": (), "meta": {}},
+        ]
+
+    def test_get_matches_get_deep(self, records):
+        for keys in [("id",), ("tags", 0), ("tags", -1), ("meta", "size")]:
+            path = compile_path(*keys)
+            assert path.get(records[0]) == get_deep(records[0], *keys)
+
+    def test_get_default(self, records):
+        path = compile_path("meta", "size")
+        with pytest.raises(KeyError):
+            path.get(records[2])
+        assert path.get(records[2], None) is None
+
+    def test_set_delete_setdefault(self):
+        data = {"x": [{"y": 5}]}
+        compile_path("x", 0, "y").set(data, 6)
+        compile_path("x", "2", "z").set(data, 7)
+        assert data == {"x": [{"y": 6}, {}, {"z": 7}]}
+        # padding creates separate dicts
+        assert data["x"][1] is not data["x"][0]
+
+        compile_path("x", 0, "y").delete(data)
+        assert data["x"][0] == {}
+
+        compile_path("x", 2, "z").setdefault(data, 8)
+        compile_path("x", 0, "w").setdefault(data, 9)
+        assert data["x"][2]["z"] == 7
+        assert data["x"][0]["w"] == 9
+
+    def test_writes_through_other_containers(self):
+        class Obj:
+            pass
+
+        obj = Obj()
+        obj.inner = {}
+        data = {"a": {"new": 1}, "o": obj, "t": ({"k": 1},)}
+
+        # dicts, lists and tuples are walked directly, the object falls back
+        set_deep(data, "a", "b", "c", value=2)
+        compile_path("o", "inner", "x").set(data, 3)
+        compile_path("t", 0, "k").set(data, 4)
+        set_default_deep(data, "o", "inner", "x", value=5)
+        assert data["a"] == {"new": 1, "b": {"c": 2}}
+        assert obj.inner == {"x": 3}
+        assert data["t"][0] == {"k": 4}
+
+        del_deep(data, "o", "inner", "x")
+        assert obj.inner == {}
+        with pytest.raises(KeyError):
+            del_deep(data, "missing", "x")
+
+    def test_tuple_and_set_index(self):
+        data = {"t": (1, 2, 3), "s": {4}}
+        assert get_deep(data, "t", "2") == 3
+        assert compile_path("s", 0).get(data) == 4
+        with pytest.raises(KeyError):
+            compile_path("s", 1).get(data)
+        with pytest.raises(KeyError):
+            get_deep(data, "t", 5)
+
+    def test_attribute(self):
+        class Obj:
+            value = {"k": 1}
+
+        assert compile_path("value", "k").get(Obj()) == 1
+        with pytest.raises(KeyError):
+            compile_path("missing").get(Obj())
+
+    def test_dict_subclass_and_none(self):
+        from collections import defaultdict
+
+        data = {"d": defaultdict(list), "n": {"v": None}}
+        with pytest.raises(KeyError):
+            compile_path("d", "missing").get(data)
+        assert "missing" not in data["d"]
+        with pytest.raises(KeyError):
+            compile_path("n", "v").get(data)
+        assert compile_path("n", "v", 0).get(data, "x") == "x"
+
+    def test_get_many(self, records):
+        assert get_many(records, "id") == [1, 2, 3]
+        assert get_many(records, "meta", "size", default=0) == [10, 20, 0]
+        assert get_many(records, "tags", 0, default=None) == ["a", "c", None]
+        with pytest.raises(KeyError):
+            get_many(records, "meta", "size")
+
+    def test_compile_path_cache(self):
+        assert compile_path("a", 0) is compile_path("a", 0)
+        # unhashable keys still compile
+        assert compile_path(["a"]).keys == (["a"],)
+        with pytest.raises(ValueError):
+            compile_path()
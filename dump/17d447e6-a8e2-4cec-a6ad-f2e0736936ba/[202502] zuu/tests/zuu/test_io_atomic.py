@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+
+import pytest
+
+import zuu.io as zio
+from zuu.io import atomic_open, dump, iter_dump, iter_load, load
+
+DATA = {"name": "state", "values": list(range(100))}
+
+
+@pytest.mark.parametrize("name", ["state.json", "state.pickle", "state.toml", "state.csv"])
+def test_roundtrip(tmp_path, name):
+    data = [["a", "b"], ["1", "2"]] if name.endswith(".csv") else DATA
+    path = str(tmp_path / name)
+    dump(data, path)
+    assert load(path) == data
+    assert os.listdir(tmp_path) == [name]
+
+
+def test_failed_write_keeps_original(tmp_path):
+    path = str(tmp_path / "state.json")
+    dump(DATA, path)
+
+    with pytest.raises(TypeError):
+        # fails after part of the document was written
+        dump({"ok": "x" * 10000, "bad": object()}, path)
+
+    assert load(path) == DATA
+    assert os.listdir(tmp_path) == ["state.json"]
+
+
+def test_gzip(tmp_path):
+    path = str(tmp_path / "state.json.gz")
+    dump(DATA, path, open={"fsync": True})
+    with gzip.open(path, "rt") as f:
+        assert json.load(f) == DATA
+    assert load(path) == DATA
+
+    # sniffed through the compression
+    path = str(tmp_path / "state.cfg.gz")
+    with gzip.open(path, "wt") as f:
+        json.dump(DATA, f)
+    assert load(path) == DATA
+
+    path = str(tmp_path / "records.jsonl.gz")
+    assert iter_dump(({"i": i} for i in range(10)), path, batch_size=3) == 10
+    assert list(iter_load(path)) == [{"i": i} for i in range(10)]
+
+
+@pytest.mark.parametrize("suffix, module", [(".zst", "zstandard"), (".lz4", "lz4.frame")])
+def test_optional_codecs(tmp_path, suffix, module):
+    pytest.importorskip(module)
+    path = str(tmp_path / f"state.json{suffix}")
+    dump(DATA, path)
+    assert load(path) == DATA
+
+
+def test_atomic_open_keeps_mode(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("old")
+    os.chmod(path, 0o750)
+    with atomic_open(str(path)) as f:
+        f.write("new")
+    assert path.read_text() == "new"
+    assert os.stat(path).st_mode & 0o777 == 0o750
+
+
+def test_compressed_sniff_reads_head_only(tmp_path):
+    path = str(tmp_path / "big.cfg.gz")
+    data = {"values": list(range(10000))}
+    with gzip.open(path, "wt") as f:
+        json.dump(data, f)
+
+    head, last = zio._sniff_file(path)
+    assert len(head) == zio.SNIFF_SIZE and last is None
+    assert load(path) == data
+
+    path = str(tmp_path / "small.cfg.gz")
+    with gzip.open(path, "wt") as f:
+        json.dump([1, 2], f)
+    assert zio._sniff_file(path) == (b"[1, 2]", b"]")
+
+
+def test_atomic_open_keeps_symlink(tmp_path):
+    target = tmp_path / "state.json"
+    link = tmp_path / "link.json"
+    dump(DATA, str(target))
+    try:
+        os.symlink(target, link)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not permitted")
+
+    dump({"new": True}, str(link))
+    assert os.path.islink(link)
+    assert load(str(target)) == {"new": True}
+    assert sorted(os.listdir(tmp_path)) == ["link.json", "state.json"]
@@ -0,0 +1,88 @@
+import json
+import tracemalloc
+
+import pytest
+
+import zuu.io as zio
+from zuu.io import iter_dump, iter_load, load_csv, dump_csv
+
+RECORDS = [{"id": i, "name": f"item {i}", "tags": ["a", "b"] if i % 2 else []} for i in range(25)]
+
+
+@pytest.mark.parametrize("ext", [".jsonl", ".json", ".yaml"])
+def test_roundtrip(tmp_path, ext):
+    path = str(tmp_path / f"records{ext}")
+    assert iter_dump(iter(RECORDS), path, batch_size=7) == len(RECORDS)
+    assert list(iter_load(path)) == RECORDS
+
+
+def test_csv_roundtrip(tmp_path):
+    path = str(tmp_path / "records.csv")
+    rows = [{"id": str(i), "name": f"item, {i}"} for i in range(10)]
+    assert iter_dump(rows, path, batch_size=3) == 10
+    assert list(iter_load(path)) == rows
+
+    dump_csv([["a", "b"], ["1", "2"]], path)
+    assert load_csv(path) == [["a", "b"], ["1", "2"]]
+
+
+def test_csv_fieldnames_for_rows(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    assert iter_dump([[1, 2], [3, 4]], path, fieldnames=["a", "b"]) == 2
+    assert load_csv(path) == [["a", "b"], ["1", "2"], ["3", "4"]]
+
+    rows = [{"b": "1", "a": "2"}]
+    assert iter_dump(rows, path, fieldnames=["a", "b"]) == 1
+    assert load_csv(path) == [["a", "b"], ["2", "1"]]
+
+
+def test_empty(tmp_path):
+    path = str(tmp_path / "empty.json")
+    assert iter_dump([], path) == 0
+    assert json.load(open(path)) == []
+    assert list(iter_load(path)) == []
+
+
+def test_json_array_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(zio, "ITER_CHUNK_SIZE", 16)
+    records = [12345678901234567890, "x" * 100, {"nested": [1, 2, {"a": None}]}, 1.5e10, True]
+    path = tmp_path / "arr.json"
+    path.write_text("  [\n" + " ,\n ".join(json.dumps(r) for r in records) + "\n]\n")
+    assert list(iter_load(str(path))) == records
+
+    path.write_text('{"not": "an array"}')
+    assert list(iter_load(str(path))) == [{"not": "an array"}]
+
+    # unknown extension, sniffed
+    path = tmp_path / "arr.dat"
+    path.write_text("[1, 2, 3]")
+    assert list(iter_load(str(path))) == [1, 2, 3]
+
+    path.write_text("[1, 2")
+    with pytest.raises(ValueError):
+        list(iter_load(str(path)))
+
+
+def test_json_numbers_split_by_chunks(tmp_path, monkeypatch):
+    # every chunk size puts a boundary after some "." and "e" of these numbers
+    text = '[12.5, 1e5, -3.25E-2, 6e+1, 70, "x", 0.5]'
+    path = tmp_path / "numbers.json"
+    path.write_text(text)
+    for size in range(1, len(text) + 1):
+        monkeypatch.setattr(zio, "ITER_CHUNK_SIZE", size)
+        assert list(iter_load(str(path))) == json.loads(text), size
+
+
+def test_json_array_constant_memory(tmp_path):
+    path = str(tmp_path / "big.json")
+    count = iter_dump(({"id": i, "payload": "x" * 200} for i in range(50_000)), path)
+    assert count == 50_000
+
+    tracemalloc.start()
+    seen = sum(1 for _ in iter_load(path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert seen == 50_000
+    # the file is ~11 MB
+    assert peak < 2_000_000
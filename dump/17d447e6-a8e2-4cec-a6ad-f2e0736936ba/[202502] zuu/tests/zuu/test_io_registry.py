@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+import zuu.io as zio
+from zuu.io import DEFAULT_LOAD, Ext, Registry, Sniff, dump, load, loads
+
+
+@pytest.fixture
+def registry():
+    return Registry(
+        [
+            [Ext(".json"), lambda path, **kw: "json"],
+            [Ext(".txt"), lambda path, **kw: "txt"],
+            [Sniff(lambda head, last: head.startswith(b"{")), lambda path, **kw: "sniffed"],
+        ]
+    )
+
+
+def test_extension_dispatch(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text('{"a": 1}')
+    assert load(str(path)) == {"a": 1}
+
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    assert load(str(path)) == "hello"
+
+
+def test_unknown_extension_is_sniffed_once(tmp_path, monkeypatch):
+    path = tmp_path / "config.cfg"
+    path.write_text('[1, 2, 3]')
+
+    reads = []
+    sniff_file = zio._sniff_file
+    monkeypatch.setattr(zio, "_sniff_file", lambda p: reads.append(p) or sniff_file(p))
+    assert load(str(path)) == [1, 2, 3]
+    assert len(reads) == 1
+
+    with pytest.raises(ValueError):
+        load(str(tmp_path / "missing.cfg"))
+
+
+def test_dump_sniffs_existing_target(tmp_path):
+    path = tmp_path / "state.cfg"
+    path.write_text("{}")
+    dump({"a": 1}, str(path))
+    assert json.loads(path.read_text()) == {"a": 1}
+
+    with pytest.raises(ValueError):
+        dump({"a": 1}, str(tmp_path / "new.cfg"))
+
+
+def test_index_follows_changes(registry, tmp_path):
+    path = tmp_path / "a.yaml"
+    path.write_text("{}")
+    assert load(str(path), _seq=registry) == "sniffed"
+
+    registry.register(".yaml", lambda path, **kw: "yaml")
+    assert registry[2][0].suffix == ".yaml"
+    assert load(str(path), _seq=registry) == "yaml"
+
+    # handlers replaced in place are picked up
+    registry[2][1] = lambda path, **kw: "yaml2"
+    assert load(str(path), _seq=registry) == "yaml2"
+
+    # and so are replaced entries
+    registry[2] = [Ext(".yml"), registry[2][1]]
+    assert load(str(path), _seq=registry) == "sniffed"
+
+    # plain function validators still work, in order
+    registry.insert(0, [lambda p: p.endswith("a.yaml"), lambda path, **kw: "first"])
+    assert load(str(path), _seq=registry) == "first"
+
+
+@pytest.mark.parametrize("suffix, name", [("yaml", "a.yaml"), ("rc", ".bashrc"), (".min.cfg", "a.min.cfg")])
+def test_suffix_without_single_extension(registry, tmp_path, suffix, name):
+    path = tmp_path / name
+    path.write_text("x")
+    registry.register(suffix, lambda path, **kw: suffix)
+    assert load(str(path), _seq=registry) == suffix
+    assert load(str(tmp_path / "a.json"), _seq=registry) == "json"
+
+
+def test_copy_is_a_registry():
+    assert isinstance(DEFAULT_LOAD.copy(), Registry)
+
+
+def test_loads_dispatch():
+    assert loads('{"a": 1}') == {"a": 1}
+    assert loads("[1, 2]") == [1, 2]
+    assert loads(b"\x80\x04K\x01.") == 1
+    assert loads("<a>b</a>").text == "b"
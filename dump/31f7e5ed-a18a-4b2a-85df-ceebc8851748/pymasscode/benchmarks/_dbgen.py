@@ -0,0 +1,58 @@
+import json
+import random
+
+
+def generateDb(path: str, snippets: int = 20000, fragmentSize: int = 4000, seed: int = 0):
+    """
+    writes a synthetic massCode db.json, roughly snippets * fragmentSize bytes
+    """
+    rnd = random.Random(seed)
+    folders = [
+        {
+            "name": f"folder {i}",
+            "index": i,
+            "parentId": None,
+            "defaultLanguage": "python",
+            "isOpen": False,
+            "isSystem": False,
+            "createdAt": 1700000000000,
+            "updatedAt": 1700000000000,
+            "id": f"folder{i}",
+        }
+        for i in range(50)
+    ]
+    tags = [
+        {
+            "name": f"tag {i}",
+            "createdAt": 1700000000000,
+            "updatedAt": 1700000000000,
+            "id": f"tag{i}",
+        }
+        for i in range(100)
+    ]
+    line = 'print("hello world")  # some code [with] {brackets}\n'
+    items = []
+    for i in range(snippets):
+        items.append(
+            {
+                "name": f"snippet {i}",
+                "description": f"description of snippet {i}",
+                "isDeleted": rnd.random() < 0.05,
+                "isFavorites": rnd.random() < 0.1,
+                "folderId": f"folder{rnd.randrange(50)}",
+                "createdAt": 1700000000000 + i,
+                "updatedAt": 1700000000000 + i,
+                "tagsIds": [f"tag{rnd.randrange(100)}" for _ in range(rnd.randrange(4))],
+                "content": [
+                    {
+                        "label": "Fragment 1",
+                        "language": "python",
+                        "value": f"# snippet {i}\n" + line * (fragmentSize // len(line)),
+                    }
+                ],
+                "id": f"snippet{i}",
+            }
+        )
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"folders": folders, "snippets": items, "tags": tags}, f, indent=2)
@@ -0,0 +1,62 @@
+"""
+eager vs lazy db.json loading
+
+    python benchmarks/bench_load.py [snippets] [fragmentSize]
+
+every mode runs in a fresh interpreter so peak RSS is not shared. the first
+lazy run scans db.json and writes db.lazy.json, the second one starts from it
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+_CHILD = r"""
+import sys, time
+sys.path[:0] = sys.argv[3:5]
+from pymasscode.loader import Loader
+
+start = time.perf_counter()
+loader = Loader(dbPath=sys.argv[1], config={"create_bkup": False, "lazy_load": sys.argv[2] == "lazy"})
+content = loader.dbContent
+elapsed = time.perf_counter() - start
+
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss / 1024 if sys.platform != "darwin" else rss / 1024 / 1024
+except ImportError:
+    rss = float("nan")
+
+print(f"{elapsed:.3f} {rss:.1f} {len(content['snippets'])}")
+"""
+
+
+def main():
+    from _dbgen import generateDb
+
+    snippets = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    fragmentSize = int(sys.argv[2]) if len(sys.argv) > 2 else 4000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "db.json")
+        generateDb(path, snippets, fragmentSize)
+        print(f"db.json: {os.path.getsize(path) / 1024 / 1024:.1f} MB, {snippets} snippets")
+
+        here = os.path.dirname(os.path.abspath(__file__))
+        for mode, label in (("eager", "eager"), ("lazy", "lazy (cold)"), ("lazy", "lazy (warm)")):
+            out = subprocess.run(
+                [sys.executable, "-c", _CHILD, path, mode, os.path.join(here, "..", "src"), here],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            print(f"{label:>12}: load {out[0]} s, peak rss {out[1]} MB")
+
+
+if __name__ == "__main__":
+    main()
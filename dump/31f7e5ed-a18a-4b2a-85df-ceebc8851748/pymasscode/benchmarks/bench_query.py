@@ -0,0 +1,69 @@
+"""
+closure interpreter vs compiled predicate for tinydb_query conditions
+
+    python benchmarks/bench_query.py [snippets] [repeat]
+
+every condition is run over all snippets of a synthetic db.json with both
+QueryInstance.__call__ and QueryInstance.compile(), the match counts have to agree
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+
+def _conditions():
+    from pymasscode.etc.tinydb_query import SnippetQuery
+
+    q = SnippetQuery()
+    return {
+        "field ==": q.folderId == "folder3",
+        "and, selective last": (q.isDeleted == False) & (q.name.contains("9")) & (q.folderId == "folder3"),  # noqa: E712
+        "or, likely last": (q.folderId == "folder3") | (q.isDeleted == False),  # noqa: E712
+        "nested and/or/not": ~q.isFavorites.exists()
+        | ((q.createdAt > 1700000000100) & (q.tagsIds.any(["tag1", "tag2"])) & ~(q.folderId == "folder7")),
+        "content fan out": q.content.language == "python",
+        "regex": q.name.search(r"1\d$") & (q.isDeleted == False),  # noqa: E712
+    }
+
+
+def _measure(fn, snippets, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for x in snippets if fn(x))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main():
+    from _dbgen import generateDb
+
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "db.json")
+        generateDb(path, total, 64)
+        with open(path, "r", encoding="utf-8") as f:
+            snippets = json.load(f)["snippets"]
+
+    print(f"{total} snippets, best of {repeat}")
+    for label, cond in _conditions().items():
+        closure, expected = _measure(cond, snippets, repeat)
+        compiled, count = _measure(cond.compile(), snippets, repeat)
+        assert count == expected, (label, count, expected)
+        print(
+            f"{label:>20}: closures {closure * 1000:8.1f} ms, "
+            f"compiled {compiled * 1000:8.1f} ms, x{closure / compiled:.1f} ({count} hits)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,23 @@ import inspect
 import typing
 
 from .etc.clsprop import classproperty
+from .etc.lazyjson import LazyContent
 from .loader import Loader
 from .model import Content
 from .etc.tinydb_query import FolderQuery, SnippetQuery, TagQuery
 
 
 class ClsMeta:
+    def __init__(self):
+        self._clsnames = {}
+
     def __get__(self, instance, owner):
-        if not hasattr(self, "_clsname"):
-            self._clsname = owner.__name__.lower() + "s"
+        # shared by every subclass, so cache per owner
+        clsname = self._clsnames.get(owner)
+        if clsname is None:
+            clsname = self._clsnames[owner] = owner.__name__.lower() + "s"
 
-        return self._clsname
+        return clsname
 
 
 class BaseItemMeta(type):
@@ -60,11 +66,7 @@ class BaseItem(metaclass=BaseItemMeta):
             self.__get_counter()
 
     def __get_counter(self):
-        self._counter = None
-        for i, item in enumerate(Loader.currentLoader.dbContent[self.__clsmeta]):
-            if item["id"] == self._id:
-                self._counter = i
-                break
+        self._counter = Loader.currentLoader.dbPosition(self.__clsmeta, self._id)
 
     @property
     def _raw(self):
@@ -78,6 +80,9 @@ class BaseItem(metaclass=BaseItemMeta):
 
         return temp
 
+    def _setRaw(self, key: str, value):
+        Loader.currentLoader.dbSet(self.__clsmeta, self._raw, key, value)
+
     @classmethod
     def all(cls) -> typing.List[typing.Self]:
         items = []
@@ -97,8 +102,7 @@ class BaseItem(metaclass=BaseItemMeta):
 
     @createdAtRaw.setter
     def createdAtRaw(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["createdAt"] = value
+        self._setRaw("createdAt", value)
 
     @property
     def updatedAtRaw(self):
@@ -106,8 +110,7 @@ class BaseItem(metaclass=BaseItemMeta):
 
     @updatedAtRaw.setter
     def updatedAtRaw(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["updatedAt"] = value
+        self._setRaw("updatedAt", value)
 
     @property
     def createdAt(self):
@@ -131,8 +134,7 @@ class BaseItem(metaclass=BaseItemMeta):
 
     @name.setter
     def name(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["name"] = value
+        self._setRaw("name", value)
 
     @classproperty
     def properties(self):
@@ -143,8 +145,7 @@ class BaseItem(metaclass=BaseItemMeta):
         ] + ["name", "createdAt", "updatedAt", "id"]
 
     def delete(self):
-        with Loader.currentLoader.dbLock():
-            Loader.currentLoader.dbContent[self.__clsmeta].pop(self._counter)
+        Loader.currentLoader.dbRemove(self.__clsmeta, self._id)
 
         self.__class__._instances[self.__class__].pop(self._id, None)
         self.__class__._query_cache = {
@@ -158,6 +159,11 @@ class BaseItem(metaclass=BaseItemMeta):
     def query(cls, cond, limit=-1) -> typing.List[typing.Self]:
         Loader.currentLoader.dbContent
 
+        index = Loader.currentLoader.dbIndex(cls.__name__.lower() + "s")
+        candidates = index.plan(cond) if index is not None else None
+        if candidates is not None:
+            return cls.__queryCandidates(cls.__predicate(cond), candidates, limit)
+
         if Loader.currentLoader.dbMdate != cls._db_hash:
             cls._query_cache.clear()
             cls._db_hash = Loader.currentLoader.dbMdate
@@ -166,12 +172,14 @@ class BaseItem(metaclass=BaseItemMeta):
         if cached_results is not None:
             return cached_results[:]
 
+        # only compiled once the cache missed
+        predicate = cls.__predicate(cond)
         matched = []
 
         for i, item in enumerate(
             Loader.currentLoader.dbContent[cls.__name__.lower() + "s"]
         ):
-            if cond(item):
+            if predicate(item):
                 matched.append(cls(_id=item["id"], _counter=i))
 
         is_cacheable: typing.Callable[[], bool] = getattr(
@@ -186,6 +194,28 @@ class BaseItem(metaclass=BaseItemMeta):
 
         return matched[:limit]
 
+    @staticmethod
+    def __predicate(cond):
+        # compiled predicates are cached on the condition and per query hash
+        return cond.compile() if hasattr(cond, "compile") else cond
+
+    @classmethod
+    def __queryCandidates(cls, predicate, candidates, limit=-1):
+        # the index only narrows down, the condition still decides
+        matched = []
+        for _id in candidates:
+            item = cls(_id=_id)
+            if predicate(item._raw):
+                matched.append(item)
+
+        # keep the same order as a full scan would
+        matched.sort(key=lambda x: x._counter)
+
+        if limit == -1 or len(matched) <= limit:
+            return matched
+
+        return matched[:limit]
+
     @classmethod
     def queryParse(cls, querystr: str):
         cond = eval(
@@ -213,8 +243,7 @@ class Folder(BaseItem):
 
     @index.setter
     def index(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["index"] = value
+        self._setRaw("index", value)
 
     @property
     def parentId(self):
@@ -222,8 +251,7 @@ class Folder(BaseItem):
 
     @parentId.setter
     def parentId(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["parentId"] = value
+        self._setRaw("parentId", value)
 
     @property
     def isOpen(self) -> bool:
@@ -231,8 +259,7 @@ class Folder(BaseItem):
 
     @isOpen.setter
     def isOpen(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["isOpen"] = value
+        self._setRaw("isOpen", value)
 
     @property
     def isSystem(self) -> bool:
@@ -240,8 +267,7 @@ class Folder(BaseItem):
 
     @isSystem.setter
     def isSystem(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["isSystem"] = value
+        self._setRaw("isSystem", value)
 
     @property
     def defaultLanguage(self) -> str:
@@ -249,8 +275,7 @@ class Folder(BaseItem):
 
     @defaultLanguage.setter
     def defaultLanguage(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["defaultLanguage"] = value
+        self._setRaw("defaultLanguage", value)
 
     @property
     def icon(self) -> str:
@@ -258,21 +283,26 @@ class Folder(BaseItem):
 
     @icon.setter
     def icon(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["icon"] = value
+        self._setRaw("icon", value)
 
 
 class Snippet(BaseItem):
     q = SnippetQuery()
 
+    @classmethod
+    def search(cls, text: str, limit: int = -1) -> typing.List[typing.Self]:
+        """
+        ranked full text search over name, description and fragment values
+        """
+        return [cls(_id=_id) for _id, _ in Loader.currentLoader.dbSearch(text, limit)]
+
     @property
     def isDeleted(self) -> bool:
         return self._raw["isDeleted"]
 
     @isDeleted.setter
     def isDeleted(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["isDeleted"] = value
+        self._setRaw("isDeleted", value)
 
     @property
     def isFavorites(self) -> bool:
@@ -280,8 +310,7 @@ class Snippet(BaseItem):
 
     @isFavorites.setter
     def isFavorites(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["isFavorites"] = value
+        self._setRaw("isFavorites", value)
 
     @property
     def folderId(self) -> str:
@@ -289,8 +318,7 @@ class Snippet(BaseItem):
 
     @folderId.setter
     def folderId(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["folderId"] = value
+        self._setRaw("folderId", value)
 
     @property
     def tagsIds(self) -> typing.List[str]:
@@ -298,8 +326,7 @@ class Snippet(BaseItem):
 
     @tagsIds.setter
     def tagsIds(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["tagsIds"] = value
+        self._setRaw("tagsIds", value)
 
     @property
     def description(self) -> str:
@@ -307,14 +334,17 @@ class Snippet(BaseItem):
 
     @description.setter
     def description(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["description"] = value
+        self._setRaw("description", value)
 
     @property
     def content(self) -> typing.List[Content]:
-        return self._raw["content"]
+        raw = self._raw
+        content = raw["content"]
+        if isinstance(content, LazyContent):
+            # handed out for mutation, so it has to live in the dict from now on
+            content = raw["content"] = content.load()
+        return content
 
     @content.setter
     def content(self, value):
-        with Loader.currentLoader.dbLock():
-            self._raw["content"] = value
+        self._setRaw("content", value)
@@ -1,6 +1,11 @@
 
+from collections import OrderedDict
 import io
 import os
+import struct
+import sys
+import threading
+import time
 import typing
 import hashlib
 
@@ -12,8 +17,152 @@ class FileCtx(typing.TypedDict):
 
     content : typing.Any
 
+    # monotonic time of the last stat, inotify generation at load time
+    checked : float
+    generation : int
+
+class _InotifyWatcher:
+    """
+    watches the parent directories of FileProperty paths with inotify (linux only)
+
+    a daemon thread blocks on the inotify fd and bumps a per path generation
+    counter, readers only compare counters and never touch the filesystem.
+    directories are watched (not the files) so replacing a file with
+    os.replace is seen as well
+    """
+
+    IN_MODIFY = 0x2
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    )
+
+    _EVENT = struct.Struct("iIII")
+
+    _instance : typing.Optional["_InotifyWatcher"] = None
+    _unavailable = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> typing.Optional["_InotifyWatcher"]:
+        if cls._instance is not None or cls._unavailable:
+            return cls._instance
+
+        with cls._lock:
+            if cls._instance is None and not cls._unavailable:
+                try:
+                    cls._instance = cls()
+                except (OSError, AttributeError):
+                    cls._unavailable = True
+        return cls._instance
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on linux")
+
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+
+        self._fd = self._libc.inotify_init1(self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # wd -> directory, directory -> wd
+        self._dirs : typing.Dict[int, str] = {}
+        self._wds : typing.Dict[str, int] = {}
+        self._generations : typing.Dict[str, int] = {}
+        # bumped on queue overflow, invalidates everything
+        self.epoch = 0
+
+        threading.Thread(target=self._run, name="pymasscode-inotify", daemon=True).start()
+
+    def watch(self, path : str) -> bool:
+        directory = os.path.dirname(path)
+        if directory in self._wds:
+            return True
+
+        with self._lock:
+            if directory in self._wds:
+                return True
+
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                return False
+            self._dirs[wd] = directory
+            self._wds[directory] = wd
+        return True
+
+    def generation(self, path : str) -> int:
+        return self._generations.get(path, 0) + self.epoch
+
+    def _bump(self, path : str):
+        self._generations[path] = self._generations.get(path, 0) + 1
+
+    def _run(self):
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except InterruptedError:
+                continue
+            except OSError:
+                return
+
+            pos = 0
+            while pos + self._EVENT.size <= len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, pos)
+                pos += self._EVENT.size
+                name = data[pos : pos + length].rstrip(b"\0")
+                pos += length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    self.epoch += 1
+                    continue
+
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+
+                if name:
+                    self._bump(os.path.join(directory, os.fsdecode(name)))
+
+                if mask & (self.IN_IGNORED | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                    # the directory is gone, readers fall back to stat until it is watched again
+                    with self._lock:
+                        self._dirs.pop(wd, None)
+                        self._wds.pop(directory, None)
+                    self.epoch += 1
+
 class FileProperty:
-    _properties : typing.Dict[str, FileCtx] = {}
+    """
+    descriptor that loads a file and reloads it once it changed
+
+    change detection is layered so hot reads stay cheap:
+    - watch=True (linux): an inotify watcher invalidates the entry, reads cost no syscalls
+    - recheckInterval: otherwise the file is stat'ed at most once per interval
+    - sha256 is only computed when the stat data moved, to tell real edits from touches
+
+    loaded contents live in one bounded LRU shared by all properties, keyed by
+    property and resolved path
+    """
+
+    cacheSize : int = 128
+    _properties : "OrderedDict[typing.Tuple[str, FileProperty], FileCtx]" = OrderedDict()
+    _lock = threading.RLock()
 
     @staticmethod
     def returnIOWrapper(path : str):
@@ -29,53 +178,147 @@ class FileProperty:
                 return f.read()
 
     @staticmethod
-    def __directRead(path : str):
+    def __fileDigest(path : str):
+        digest = hashlib.sha256()
         with open(path, 'rb') as f:
-            return f.read()
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __release(ctx : FileCtx):
+        content = ctx.get("content", None)
+        if isinstance(content, io.TextIOWrapper):
+            content.close()
 
     def __init__(
-        self, 
-        path : property, 
+        self,
+        path : typing.Union[str, property],
         watching : typing.List[typing.Literal["mdate", "adate", "sha256", "size"]] = ["mdate","size", ],
         callback : typing.Callable = None,
-        loadmethod : typing.Callable = None
+        loadmethod : typing.Callable = None,
+        recheckInterval : float = 0,
+        watch : bool = False,
     ):
         self.path = path
         self.watching = watching
         self.callback = callback
         self.loadmethod = loadmethod or FileProperty.__defaultLoadMethod
+        self.recheckInterval = recheckInterval
+        self.watch = watch
 
-    def __get__(self, instance, owner):
+    def resolvePath(self, instance) -> str:
+        # a property path belongs to the instance, never store the result on the descriptor
         if isinstance(self.path, property):
-            self.path = self.path.fget(instance)
-        
-        if not os.path.exists(self.path):
+            return self.path.fget(instance)
+        return self.path
+
+    def __stat(self, path : str) -> typing.Optional[dict]:
+        try:
+            stat = os.stat(path)
+        except OSError:
             return None
-        
-        recordedCtx =self._properties.get(self.path, {})
-        
-        prepNewCtx = {}
 
+        ctx = {}
         for item in self.watching:
-            if item == "sha256":
-                prepNewCtx["sha256"] = hashlib.sha256(self.__directRead(self.path)).hexdigest()
-            elif item == "size":
-                prepNewCtx["size"] = os.path.getsize(self.path)
+            if item == "size":
+                ctx["size"] = stat.st_size
             elif item == "mdate":
-                prepNewCtx["mdate"] = os.path.getmtime(self.path)
+                ctx["mdate"] = stat.st_mtime
             elif item == "adate":
-                prepNewCtx["adate"] = os.path.getatime(self.path)
+                ctx["adate"] = stat.st_atime
 
+        if "sha256" in self.watching:
+            # the cheap fields decide whether hashing is needed at all
+            ctx["_stat"] = (stat.st_size, stat.st_mtime_ns)
+        return ctx
 
-        if recordedCtx and all(prepNewCtx[x] == recordedCtx[x] for x in self.watching):
-            return recordedCtx["content"]
+    def __unchanged(self, path : str, recorded : FileCtx, new : dict) -> bool:
+        if not all(new[x] == recorded[x] for x in self.watching if x != "sha256"):
+            return False
+
+        if "sha256" not in self.watching:
+            return True
+
+        if new["_stat"] != recorded["_stat"]:
+            new["sha256"] = self.__fileDigest(path)
         else:
-            recordedContent = recordedCtx.get("content", None)
-            if isinstance(recordedContent, io.TextIOWrapper):
-                recordedContent.close()
-
-            content = self.loadmethod(self.path)
-            prepNewCtx["content"] = content
-            self._properties[self.path] = prepNewCtx
-            return content
-            
+            new["sha256"] = recorded["sha256"]
+        return new["sha256"] == recorded["sha256"]
+
+    def __touch(self, key):
+        # marks the entry as recently used
+        with self._lock:
+            if key in self._properties:
+                self._properties.move_to_end(key)
+
+    def __store(self, key, ctx : FileCtx):
+        with self._lock:
+            self._properties[key] = ctx
+            self._properties.move_to_end(key)
+            while len(self._properties) > self.cacheSize:
+                _, evicted = self._properties.popitem(last=False)
+                self.__release(evicted)
+
+    def invalidate(self, instance = None):
+        """
+        drops the cached content, for every path of this property if instance is None
+        """
+        with self._lock:
+            if instance is not None:
+                keys = [(self.resolvePath(instance), self)]
+            else:
+                keys = [x for x in self._properties if x[1] is self]
+
+            for key in keys:
+                ctx = self._properties.pop(key, None)
+                if ctx is not None:
+                    self.__release(ctx)
+
+    def __get__(self, instance, owner):
+        if instance is None and isinstance(self.path, property):
+            return self
+
+        path = self.resolvePath(instance)
+        key = (path, self)
+
+        watcher = _InotifyWatcher.get() if self.watch else None
+        if watcher is not None and not watcher.watch(path):
+            watcher = None
+
+        recordedCtx = self._properties.get(key, None)
+
+        if recordedCtx is not None:
+            if watcher is not None:
+                fresh = recordedCtx["generation"] == watcher.generation(path)
+            else:
+                fresh = time.monotonic() - recordedCtx["checked"] < self.recheckInterval
+
+            if fresh:
+                self.__touch(key)
+                return recordedCtx["content"]
+
+        generation = watcher.generation(path) if watcher is not None else 0
+
+        prepNewCtx = self.__stat(path)
+        if prepNewCtx is None:
+            return None
+
+        prepNewCtx["checked"] = time.monotonic()
+        prepNewCtx["generation"] = generation
+
+        if recordedCtx is not None and self.__unchanged(path, recordedCtx, prepNewCtx):
+            recordedCtx.update(prepNewCtx)
+            self.__touch(key)
+            return recordedCtx["content"]
+
+        if recordedCtx is not None:
+            self.__release(recordedCtx)
+
+        if "sha256" in self.watching and "sha256" not in prepNewCtx:
+            prepNewCtx["sha256"] = self.__fileDigest(path)
+
+        content = self.loadmethod(path)
+        prepNewCtx["content"] = content
+        self.__store(key, prepNewCtx)
+        return content
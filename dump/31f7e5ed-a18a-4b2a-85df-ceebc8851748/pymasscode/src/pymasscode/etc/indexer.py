@@ -0,0 +1,136 @@
+import typing
+
+from .tinydb_query import freeze
+
+
+class CollectionIndex:
+    """
+    secondary indexes over one db collection (folders / tags / snippets)
+
+    every indexed field maps value -> set of item ids, list fields (tagsIds)
+    map each element instead. the index is only a candidate filter, callers still
+    evaluate the full condition against the candidates
+    """
+
+    def __init__(self, fields: typing.Iterable[str]):
+        self.fields = tuple(fields)
+        self._maps: typing.Dict[str, typing.Dict[typing.Any, typing.Set[str]]] = {
+            field: {} for field in self.fields
+        }
+        # fields that ever held a non list value, any() is only exact for list fields
+        self._scalarFields: typing.Set[str] = set()
+
+    @staticmethod
+    def _keys(value):
+        if isinstance(value, list):
+            return [freeze(x) for x in value]
+        return [freeze(value)]
+
+    def _add(self, field: str, _id: str, value):
+        if not isinstance(value, list):
+            self._scalarFields.add(field)
+        fieldmap = self._maps[field]
+        for key in self._keys(value):
+            fieldmap.setdefault(key, set()).add(_id)
+
+    def _discard(self, field: str, _id: str, value):
+        fieldmap = self._maps[field]
+        for key in self._keys(value):
+            ids = fieldmap.get(key)
+            if ids is None:
+                continue
+            ids.discard(_id)
+            if not ids:
+                del fieldmap[key]
+
+    def build(self, items: typing.Iterable[dict]):
+        for fieldmap in self._maps.values():
+            fieldmap.clear()
+        self._scalarFields.clear()
+
+        for item in items:
+            self.add(item)
+
+    def add(self, item: dict):
+        for field in self.fields:
+            if field in item:
+                self._add(field, item["id"], item[field])
+
+    def remove(self, item: dict):
+        for field in self.fields:
+            if field in item:
+                self._discard(field, item["id"], item[field])
+
+    def update(self, item: dict, field: str, value):
+        """
+        to be called before item[field] is overwritten with value
+        """
+        if field not in self._maps:
+            return
+
+        if field in item:
+            self._discard(field, item["id"], item[field])
+        self._add(field, item["id"], value)
+
+    def lookup(self, field: str, value) -> typing.Set[str]:
+        return self._maps[field].get(freeze(value), set())
+
+    def lookupAny(self, field: str, values: typing.Iterable) -> typing.Set[str]:
+        fieldmap = self._maps[field]
+        result = set()
+        for value in values:
+            result |= fieldmap.get(value, set())
+        return result
+
+    def plan(self, cond) -> typing.Optional[typing.Set[str]]:
+        """
+        resolve a query condition to a superset of matching ids
+
+        returns None if the condition cannot be answered by the index
+        """
+        hashval = getattr(cond, "_hash", None)
+        if not isinstance(hashval, tuple):
+            return None
+        return self._plan(hashval)
+
+    def _plan(self, hashval) -> typing.Optional[typing.Set[str]]:
+        if not isinstance(hashval, tuple) or not hashval:
+            return None
+
+        op = hashval[0]
+
+        if op == "and":
+            result = None
+            for child in hashval[1]:
+                ids = self._plan(child)
+                if ids is None:
+                    continue
+                result = ids if result is None else result & ids
+            return result
+
+        if op == "or":
+            result = set()
+            for child in hashval[1]:
+                ids = self._plan(child)
+                if ids is None:
+                    return None
+                result = result | ids
+            return result
+
+        if op not in ("==", "any") or len(hashval) != 3:
+            return None
+
+        path, value = hashval[1], hashval[2]
+        if len(path) != 1 or path[0] not in self._maps:
+            return None
+
+        if op == "==":
+            # list equality can not be answered by per-element keys
+            if isinstance(value, tuple):
+                return None
+            return set(self.lookup(path[0], value))
+
+        # any() against a list of values, any() with a sub query is not indexable
+        if not isinstance(value, tuple) or path[0] in self._scalarFields:
+            return None
+        return self.lookupAny(path[0], value)
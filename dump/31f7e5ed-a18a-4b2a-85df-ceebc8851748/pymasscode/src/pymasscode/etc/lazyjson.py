@@ -0,0 +1,424 @@
+from contextlib import contextmanager
+import gc
+import json
+import mmap
+import os
+import re
+import sys
+import typing
+
+# a "content" key, the quote is checked separately for being escaped
+_CONTENT_KEY = re.compile(r'"content"\s*:\s*')
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# bumped whenever the skeleton layout changes, older sidecars are rebuilt
+_SIDECAR_FORMAT = 2
+
+# json.dumps output of the {_LAZY_KEY: n} slots written by dump()
+_LAZY_KEY = "\u0000pymasscode.lazy"
+_LAZY_SLOT = re.compile(r'\{"\\u0000pymasscode\.lazy":(\d+)\}')
+# skeleton placeholder for a content span, a plain string so json.loads needs no hook
+_LAZY_PREFIX = "\u0000pymasscode.lazy:"
+_LAZY_SPAN = '"\\u0000pymasscode.lazy:%d:%d"'
+
+
+class LazyContent:
+    """
+    placeholder for snippets[*].content
+
+    holds the byte span of the array in the mapped db.json and decodes it on
+    access, nothing is cached here. Snippet.content swaps in the decoded list
+    """
+
+    __slots__ = ("_buffer", "_start", "_end")
+
+    def __init__(self, buffer, start: int, end: int):
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+
+    @property
+    def raw(self) -> bytes:
+        return self._buffer[self._start : self._end]
+
+    def load(self) -> list:
+        return json.loads(self.raw)
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __eq__(self, other):
+        if isinstance(other, LazyContent):
+            other = other.load()
+        return self.load() == other
+
+    def __repr__(self):
+        return f"LazyContent({self._end - self._start} bytes)"
+
+
+class _Slot:
+    __slots__ = ("n",)
+
+    def __init__(self, n: int):
+        self.n = n
+
+
+def _slotDefault(obj):
+    if isinstance(obj, _Slot):
+        return {_LAZY_KEY: obj.n}
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+@contextmanager
+def _gcPaused():
+    # parsing only allocates, letting the cyclic gc walk it again and again is wasted
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _isEscaped(text: str, pos: int) -> bool:
+    count = 0
+    while pos > 0 and text[pos - 1] == "\\":
+        count += 1
+        pos -= 1
+    return count % 2 == 1
+
+
+def _skip(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _walkObject(text: str, pos: int, visit) -> int:
+    """
+    walks the object starting at pos, visit(key, valueStart) returns the end
+    of the value. returns the end of the object
+    """
+    pos = _skip(text, pos + 1)
+    if text[pos] == "}":
+        return pos + 1
+
+    while True:
+        if text[pos] != '"':
+            raise ValueError(f"expected a key at {pos}")
+        key, pos = json.decoder.scanstring(text, pos + 1)
+        pos = _skip(text, pos)
+        if text[pos] != ":":
+            raise ValueError(f"expected ':' at {pos}")
+        pos = _skip(text, visit(key, _skip(text, pos + 1)))
+
+        if text[pos] == "}":
+            return pos + 1
+        if text[pos] != ",":
+            raise ValueError(f"expected ',' at {pos}")
+        pos = _skip(text, pos + 1)
+
+
+def _walkArray(text: str, pos: int, visit) -> int:
+    """
+    walks the array starting at pos, visit(valueStart) returns the end of the
+    value. returns the end of the array
+    """
+    pos = _skip(text, pos + 1)
+    if text[pos] == "]":
+        return pos + 1
+
+    while True:
+        pos = _skip(text, visit(pos))
+
+        if text[pos] == "]":
+            return pos + 1
+        if text[pos] != ",":
+            raise ValueError(f"expected ',' at {pos}")
+        pos = _skip(text, pos + 1)
+
+
+class LazyStore:
+    """
+    reads and writes db.json without decoding snippet contents
+
+    only the metadata (the "skeleton") is parsed into python objects, every
+    snippets[*].content becomes a LazyContent span over a read-only mmap of
+    db.json. the skeleton is cached in db.lazy.json next to it, keyed on the
+    size and mtime of db.json, so an unchanged library starts without touching
+    the content bytes at all. dump() copies untouched content spans over as
+    raw bytes and refreshes the cache for the file it wrote
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sidecarPath = os.path.splitext(path)[0] + ".lazy.json"
+
+    @staticmethod
+    def _stamp(stat: os.stat_result) -> dict:
+        return {
+            "format": _SIDECAR_FORMAT,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    @staticmethod
+    def _openBuffer(f):
+        # windows can not replace a file that is still mapped
+        if os.name == "nt":
+            return f.read()
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _resolve(content: dict, buffer):
+        # one pass instead of an object_hook, which would cost a call per dict
+        intern = sys.intern
+        for key, items in content.items():
+            if not isinstance(items, list):
+                continue
+
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+
+                # only snippets[*].content is ever cut out by _scan
+                if key == "snippets":
+                    value = item.get("content")
+                    if isinstance(value, str) and value.startswith(_LAZY_PREFIX):
+                        _, start, end = value.rsplit(":", 2)
+                        item["content"] = LazyContent(buffer, int(start), int(end))
+
+                # repeated ids share one string
+                folderId = item.get("folderId")
+                if isinstance(folderId, str):
+                    item["folderId"] = intern(folderId)
+
+                tagsIds = item.get("tagsIds")
+                if isinstance(tagsIds, list):
+                    item["tagsIds"] = [
+                        intern(x) if isinstance(x, str) else x for x in tagsIds
+                    ]
+
+        return content
+
+    def _readSidecar(self, stamp: dict) -> typing.Optional[str]:
+        try:
+            with open(self.sidecarPath, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header != stamp:
+                    return None
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _writeSidecar(self, stamp: dict, skeleton: str):
+        tmpPath = self.sidecarPath + ".tmp"
+        try:
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                f.write(json.dumps(stamp))
+                f.write("\n")
+                f.write(skeleton)
+            os.replace(tmpPath, self.sidecarPath)
+        except OSError:
+            # only a cache, the next load scans again
+            pass
+
+    @staticmethod
+    def _contentSpans(text: str) -> typing.List[typing.Tuple[int, int]]:
+        """
+        char spans of every snippets[*].content array, content keys anywhere
+        else (folders, nested metadata) are left alone
+        """
+        decoder = json.JSONDecoder()
+        spans = []
+
+        def skipValue(pos: int) -> int:
+            return decoder.raw_decode(text, pos)[1]
+
+        def visitField(key: str, pos: int) -> int:
+            end = skipValue(pos)
+            if key == "content" and text[pos] == "[":
+                spans.append((pos, end))
+            return end
+
+        def visitSnippet(pos: int) -> int:
+            if text[pos] != "{":
+                return skipValue(pos)
+            return _walkObject(text, pos, visitField)
+
+        def visitTop(key: str, pos: int) -> int:
+            if key == "snippets" and text[pos] == "[":
+                return _walkArray(text, pos, visitSnippet)
+            return skipValue(pos)
+
+        pos = _skip(text, 0)
+        if text[pos : pos + 1] != "{":
+            return []
+        _walkObject(text, pos, visitTop)
+        return spans
+
+    @staticmethod
+    def _candidateSpans(text: str) -> typing.List[typing.Tuple[int, int]]:
+        """
+        char spans of every "content" array found by a regex pass, fast but
+        blind to the depth the key sits at, see _scan
+        """
+        decoder = json.JSONDecoder()
+        spans = []
+        last = 0
+        for match in _CONTENT_KEY.finditer(text):
+            if match.start() < last or _isEscaped(text, match.start()):
+                continue
+
+            start = match.end()
+            try:
+                value, end = decoder.raw_decode(text, start)
+            except ValueError:
+                continue
+            # anything unusual is left in place and parsed eagerly
+            if not isinstance(value, list):
+                continue
+
+            spans.append((start, end))
+            last = end
+        return spans
+
+    @staticmethod
+    def _cut(text: str, spans: typing.List[typing.Tuple[int, int]]) -> str:
+        isAscii = text.isascii()
+
+        # char offset -> byte offset, walked forward once for non ascii files
+        lastChar = 0
+        lastByte = 0
+
+        def toByte(pos: int) -> int:
+            nonlocal lastChar, lastByte
+            if isAscii:
+                return pos
+            lastByte += len(text[lastChar:pos].encode("utf-8"))
+            lastChar = pos
+            return lastByte
+
+        pieces = []
+        last = 0
+        for start, end in spans:
+            pieces.append(text[last:start])
+            pieces.append(_LAZY_SPAN % (toByte(start), toByte(end)))
+            last = end
+        pieces.append(text[last:])
+
+        return "".join(pieces)
+
+    def _scan(self, buffer) -> str:
+        """
+        builds the skeleton by cutting every snippet content array out of the text
+        """
+        text = str(buffer, "utf-8")
+        spans = self._candidateSpans(text)
+        skeleton = self._cut(text, spans)
+
+        # the regex pass is right as long as every placeholder it made sits at
+        # snippets[*].content, otherwise walk the structure
+        try:
+            snippets = json.loads(skeleton).get("snippets")
+        except (ValueError, AttributeError):
+            snippets = None
+        placed = 0
+        if isinstance(snippets, list):
+            for snippet in snippets:
+                value = snippet.get("content") if isinstance(snippet, dict) else None
+                if isinstance(value, str) and value.startswith(_LAZY_PREFIX):
+                    placed += 1
+        if placed == len(spans):
+            return skeleton
+
+        try:
+            spans = self._contentSpans(text)
+        except (ValueError, IndexError):
+            # not the layout we expect, everything is parsed eagerly
+            spans = []
+        return self._cut(text, spans)
+
+    def load(self) -> typing.Dict[str, typing.Any]:
+        with open(self.path, "rb") as f:
+            stamp = self._stamp(os.fstat(f.fileno()))
+            buffer = self._openBuffer(f)
+
+        with _gcPaused():
+            skeleton = self._readSidecar(stamp)
+            if skeleton is None:
+                skeleton = self._scan(buffer)
+                self._writeSidecar(stamp, skeleton)
+
+            return self._resolve(json.loads(skeleton), buffer)
+
+    def dump(self, content: dict):
+        """
+        atomically replaces db.json with content (compact json)
+        """
+        chunks: typing.List[bytes] = []
+        lazies: typing.Dict[int, LazyContent] = {}
+
+        skeleton = dict(content)
+        snippets = []
+        for snippet in content.get("snippets", []):
+            value = snippet.get("content")
+            if isinstance(value, LazyContent):
+                lazies[len(chunks)] = value
+                chunks.append(value.raw)
+            elif isinstance(value, list):
+                chunks.append(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+            else:
+                snippets.append(snippet)
+                continue
+
+            snippet = dict(snippet)
+            snippet["content"] = _Slot(len(chunks) - 1)
+            snippets.append(snippet)
+        skeleton["snippets"] = snippets
+
+        # ensure_ascii keeps the skeleton text offsets equal to byte offsets
+        text = json.dumps(skeleton, separators=(",", ":"), default=_slotDefault)
+
+        spans: typing.Dict[int, typing.Tuple[int, int]] = {}
+        sidecar = []
+        tmpPath = self.path + ".tmp"
+        with open(tmpPath, "wb") as f:
+            pos = 0
+            last = 0
+            for match in _LAZY_SLOT.finditer(text):
+                piece = text[last : match.start()].encode("ascii")
+                f.write(piece)
+                pos += len(piece)
+
+                n = int(match.group(1))
+                f.write(chunks[n])
+                spans[n] = (pos, pos + len(chunks[n]))
+                pos += len(chunks[n])
+
+                sidecar.append(text[last : match.start()])
+                sidecar.append(_LAZY_SPAN % spans[n])
+                last = match.end()
+
+            f.write(text[last:].encode("ascii"))
+            sidecar.append(text[last:])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, self.path)
+
+        with open(self.path, "rb") as f:
+            stamp = self._stamp(os.fstat(f.fileno()))
+            buffer = self._openBuffer(f)
+        self._writeSidecar(stamp, "".join(sidecar))
+
+        # point untouched contents at the new file so the old mapping can go
+        for n, lazy in lazies.items():
+            lazy._buffer = buffer
+            lazy._start, lazy._end = spans[n]
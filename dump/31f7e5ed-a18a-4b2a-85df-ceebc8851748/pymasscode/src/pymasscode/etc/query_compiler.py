@@ -0,0 +1,208 @@
+"""
+compiles QueryInstance trees into one flat generated predicate
+
+the closure interpreter in tinydb_query re-walks the path tuple, dispatches
+through several lambdas and catches KeyError/TypeError per leaf on every call.
+compileQuery() emits python source instead: one function per leaf with the
+path unrolled into subscripts and the common comparisons inlined, and a root
+expression where nested &/| are flattened and their operands ordered so the
+cheapest, most decisive checks run first
+"""
+
+import functools
+import itertools
+import typing
+
+# rough (cost, probability of being true) per leaf operation
+_ESTIMATES = {
+    "==": (1.0, 0.1),
+    "!=": (1.0, 0.9),
+    "<": (1.0, 0.5),
+    "<=": (1.0, 0.5),
+    ">": (1.0, 0.5),
+    ">=": (1.0, 0.5),
+    "exists": (1.0, 0.9),
+    "one_of": (1.5, 0.2),
+    "any": (3.0, 0.3),
+    "all": (3.0, 0.3),
+    "matches": (5.0, 0.3),
+    "search": (5.0, 0.3),
+    "startswith": (2.0, 0.2),
+    "endswith": (2.0, 0.2),
+    "contains": (3.0, 0.2),
+    "fuzz": (20.0, 0.2),
+}
+_DEFAULT_ESTIMATE = (5.0, 0.5)
+# fanning out over a list (MQuery "@") multiplies the leaf cost
+_FANOUT_COST = 5.0
+
+_COMPARISONS = ("==", "!=", "<", "<=", ">", ">=")
+
+
+class _Compiler:
+    def __init__(self):
+        self.namespace: typing.Dict[str, typing.Any] = {}
+        self.sources: typing.List[str] = []
+        self._counter = itertools.count()
+
+    def bind(self, value, prefix: str = "_c") -> str:
+        name = f"{prefix}{next(self._counter)}"
+        self.namespace[name] = value
+        return name
+
+    # ANCHOR leaves
+    def _resolve(self, parts, src: str, dst: str, indent: str) -> typing.List[str]:
+        lines = [f"{indent}{dst} = {src}"]
+        for part in parts:
+            if isinstance(part, str):
+                lines.append(f"{indent}{dst} = {dst}[{part!r}]")
+            else:
+                lines.append(f"{indent}{dst} = {self.bind(part, '_p')}({dst})")
+        return lines
+
+    def _check(self, var: str, test, inline) -> str:
+        if inline is None:
+            return f"{self.bind(test, '_t')}({var})"
+
+        op, operand = inline
+        if op == "exists":
+            return "True"
+        if op in _COMPARISONS:
+            return f"{var} {op} {self.bind(operand, '_r')}"
+        if op == "one_of":
+            return f"{var} in {self.bind(operand, '_r')}"
+        if op in ("matches", "search"):
+            method = self.bind(getattr(operand, "match" if op == "matches" else "search"), "_r")
+            return f"(isinstance({var}, str) and {method}({var}) is not None)"
+
+        return f"{self.bind(test, '_t')}({var})"
+
+    def leaf(self, node) -> str:
+        kind, path, test, inline, _ = node
+        name = f"_l{next(self._counter)}"
+        lines = [f"def {name}(doc):"]
+
+        if kind == "mpath":
+            if "@" in path:
+                split = path.index("@")
+                head = [x for x in path[:split] if not x.startswith("@")]
+                tail = [x for x in path[split + 1 :] if not x.startswith("@")]
+            else:
+                head, tail = [x for x in path if not x.startswith("@")], None
+        else:
+            head, tail = list(path), None
+
+        lines.append("    try:")
+        lines.extend(self._resolve(head, "doc", "v", "        "))
+        lines.append("    except (KeyError, TypeError):")
+        lines.append("        return False")
+
+        if tail is None:
+            lines.append(f"    return {self._check('v', test, inline)}")
+        else:
+            lines.append("    for x in v:")
+            lines.append("        try:")
+            lines.extend(self._resolve(tail, "x", "y", "            "))
+            lines.append("        except (KeyError, TypeError):")
+            lines.append("            continue")
+            lines.append(f"        if {self._check('y', test, inline)}:")
+            lines.append("            return True")
+            lines.append("    return False")
+
+        self.sources.append("\n".join(lines))
+        return name
+
+    # ANCHOR tree
+    def _flatten(self, op: str, instance) -> list:
+        node = getattr(instance, "_node", None)
+        if node is not None and node[0] == op:
+            out = []
+            for child in node[1]:
+                out.extend(self._flatten(op, child))
+            return out
+        return [instance]
+
+    def expr(self, instance) -> typing.Tuple[str, float, float]:
+        """
+        returns (source expression, estimated cost, estimated probability)
+        """
+        node = getattr(instance, "_node", None)
+
+        if node is None:
+            # opaque, e.g. noop() or a plain callable
+            return f"{self.bind(instance, '_o')}(doc)", _DEFAULT_ESTIMATE[0], _DEFAULT_ESTIMATE[1]
+
+        if node[0] in ("path", "mpath"):
+            cost, prob = _ESTIMATES.get(node[4], _DEFAULT_ESTIMATE)
+            cost += 0.5 * len(node[1])
+            if node[0] == "mpath" and "@" in node[1]:
+                cost *= _FANOUT_COST
+            return f"{self.leaf(node)}(doc)", cost, prob
+
+        if node[0] == "not":
+            src, cost, prob = self.expr(node[1][0])
+            return f"(not {src})", cost, 1.0 - prob
+
+        if node[0] in ("and", "or"):
+            parts = [self.expr(x) for x in self._flatten(node[0], instance)]
+            if node[0] == "and":
+                # cheap checks that are likely to fail go first
+                parts.sort(key=lambda x: x[1] / max(1.0 - x[2], 1e-6))
+            else:
+                # cheap checks that are likely to pass go first
+                parts.sort(key=lambda x: x[1] / max(x[2], 1e-6))
+
+            cost = 0.0
+            reach = 1.0
+            prob = 1.0 if node[0] == "and" else 0.0
+            for _, partCost, partProb in parts:
+                cost += reach * partCost
+                if node[0] == "and":
+                    reach *= partProb
+                    prob *= partProb
+                else:
+                    reach *= 1.0 - partProb
+                    prob = 1.0 - (1.0 - prob) * (1.0 - partProb)
+
+            joined = f" {node[0]} ".join(x[0] for x in parts)
+            return f"({joined})", cost, prob
+
+        return f"{self.bind(instance, '_o')}(doc)", _DEFAULT_ESTIMATE[0], _DEFAULT_ESTIMATE[1]
+
+
+def compileQuery(cond) -> typing.Callable[[typing.Mapping], bool]:
+    """
+    turns a QueryInstance into a single predicate with the same results
+
+    instances without structure (plain callables, noop()) are called as is.
+    reordering can move a test that raises (e.g. None < 1) ahead of the operand
+    that used to short-circuit it, so on any error the document is handed to
+    the closure interpreter and gets exactly the old behaviour
+    """
+    compiler = _Compiler()
+    root, _, _ = compiler.expr(cond)
+    fallback = compiler.bind(cond, "_fallback")
+    compiler.sources.append(
+        "def _compiled(doc):\n"
+        "    try:\n"
+        f"        return bool({root})\n"
+        "    except Exception:\n"
+        f"        return bool({fallback}(doc))"
+    )
+
+    source = "\n\n".join(compiler.sources)
+    code = compile(source, "<pymasscode query>", "exec")
+    exec(code, compiler.namespace)
+
+    compiled = compiler.namespace["_compiled"]
+    compiled.__source__ = source
+    return compiled
+
+
+@functools.lru_cache(maxsize=256)
+def compileQueryCached(cond) -> typing.Callable[[typing.Mapping], bool]:
+    """
+    compileQuery() memoized on the query hash, only for cacheable queries:
+    every uncacheable one hashes as None and would share one entry
+    """
+    return compileQuery(cond)
@@ -0,0 +1,180 @@
+from bisect import bisect_left
+import json
+import math
+import os
+import re
+import typing
+
+_TOKEN = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """
+    inverted token index over snippet names, descriptions and fragments
+
+    every document keeps a token -> weight map (field weighted term counts),
+    the postings token -> {id: weight} are derived from it. only the per document
+    maps are persisted, next to db.json as db.search.json, stamped with the
+    size and mtime of the db.json they describe
+    """
+
+    FIELD_WEIGHTS = (("name", 3.0), ("description", 2.0))
+    CONTENT_WEIGHT = 1.0
+    # term frequency saturation, like bm25's k1
+    SATURATION = 1.2
+
+    def __init__(self):
+        self._docs: typing.Dict[str, typing.Dict[str, float]] = {}
+        self._postings: typing.Dict[str, typing.Dict[str, float]] = {}
+        self._sortedTokens: typing.Optional[typing.List[str]] = None
+        self.dirty = False
+
+    @staticmethod
+    def tokenize(text: str) -> typing.List[str]:
+        if not isinstance(text, str):
+            return []
+        return _TOKEN.findall(text.lower())
+
+    @classmethod
+    def docTokens(cls, snippet: dict) -> typing.Dict[str, float]:
+        weights: typing.Dict[str, float] = {}
+
+        for field, weight in cls.FIELD_WEIGHTS:
+            for token in cls.tokenize(snippet.get(field)):
+                weights[token] = weights.get(token, 0) + weight
+
+        for fragment in snippet.get("content") or []:
+            if not isinstance(fragment, dict):
+                continue
+            for token in cls.tokenize(fragment.get("value")):
+                weights[token] = weights.get(token, 0) + cls.CONTENT_WEIGHT
+
+        return weights
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _link(self, _id: str, weights: typing.Dict[str, float]):
+        self._docs[_id] = weights
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                self._sortedTokens = None
+            posting[_id] = weight
+
+    def add(self, snippet: dict):
+        self.remove(snippet["id"])
+        self._link(snippet["id"], self.docTokens(snippet))
+        self.dirty = True
+
+    def remove(self, _id: str):
+        weights = self._docs.pop(_id, None)
+        if weights is None:
+            return
+
+        for token in weights:
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(_id, None)
+            if not posting:
+                del self._postings[token]
+                self._sortedTokens = None
+        self.dirty = True
+
+    @classmethod
+    def build(cls, snippets: typing.Iterable[dict]) -> "SearchIndex":
+        index = cls()
+        for snippet in snippets:
+            index._link(snippet["id"], cls.docTokens(snippet))
+        index.dirty = True
+        return index
+
+    def _expand(self, prefix: str) -> typing.List[str]:
+        if self._sortedTokens is None:
+            self._sortedTokens = sorted(self._postings)
+
+        tokens = []
+        i = bisect_left(self._sortedTokens, prefix)
+        while i < len(self._sortedTokens) and self._sortedTokens[i].startswith(prefix):
+            tokens.append(self._sortedTokens[i])
+            i += 1
+        return tokens
+
+    def search(self, text: str, limit: int = -1) -> typing.List[typing.Tuple[str, float]]:
+        """
+        returns (id, score) pairs, best first
+
+        every query token has to match, the last one also as a prefix so
+        results show up while typing
+        """
+        queryTokens = self.tokenize(text)
+        if not queryTokens:
+            return []
+
+        total = len(self._docs)
+        scores: typing.Optional[typing.Dict[str, float]] = None
+
+        for i, queryToken in enumerate(queryTokens):
+            if i == len(queryTokens) - 1:
+                tokens = self._expand(queryToken)
+            else:
+                tokens = [queryToken] if queryToken in self._postings else []
+
+            tokenScores: typing.Dict[str, float] = {}
+            for token in tokens:
+                posting = self._postings[token]
+                idf = math.log(1 + total / len(posting))
+                for _id, weight in posting.items():
+                    if scores is not None and _id not in scores:
+                        continue
+                    tokenScores[_id] = tokenScores.get(_id, 0) + idf * weight / (
+                        weight + self.SATURATION
+                    )
+
+            if scores is None:
+                scores = tokenScores
+            else:
+                scores = {_id: scores[_id] + score for _id, score in tokenScores.items()}
+
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        if limit == -1:
+            return ranked
+        return ranked[:limit]
+
+    @staticmethod
+    def stamp(dbPath: str) -> dict:
+        stat = os.stat(dbPath)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @classmethod
+    def load(cls, path: str, stamp: dict) -> typing.Optional["SearchIndex"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if json.loads(f.readline()) != stamp:
+                    return None
+                docs = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        index = cls()
+        for _id, weights in docs.items():
+            index._link(_id, weights)
+        return index
+
+    def save(self, path: str, stamp: dict):
+        tmpPath = path + ".tmp"
+        try:
+            with open(tmpPath, "w", encoding="utf-8") as f:
+                f.write(json.dumps(stamp))
+                f.write("\n")
+                f.write(json.dumps(self._docs, separators=(",", ":")))
+            os.replace(tmpPath, path)
+        except OSError:
+            # only a cache, rebuilt on the next run
+            return
+        self.dirty = False
@@ -132,9 +132,17 @@ class QueryInstance:
     instance can be used as a key in a dictionary.
     """
 
-    def __init__(self, test: Callable[[Mapping], bool], hashval: Optional[Tuple]):
+    def __init__(
+        self,
+        test: Callable[[Mapping], bool],
+        hashval: Optional[Tuple],
+        node: Optional[Tuple] = None,
+    ):
         self._test = test
         self._hash = hashval
+        # structure for the query compiler, None means opaque
+        self._node = node
+        self._compiled = None
 
     def is_cacheable(self) -> bool:
         return self._hash is not None
@@ -148,6 +156,22 @@ class QueryInstance:
         """
         return self._test(value)
 
+    def compile(self) -> Callable[[Mapping], bool]:
+        """
+        Flatten this query into a single generated predicate, see
+        :func:`~pymasscode.etc.query_compiler.compileQuery`. The result is
+        cached on the instance.
+        """
+        if self._compiled is None:
+            from .query_compiler import compileQuery, compileQueryCached
+
+            # equal hashes mean equal queries, fresh instances of one query share the code
+            if self.is_cacheable():
+                self._compiled = compileQueryCached(self)
+            else:
+                self._compiled = compileQuery(self)
+        return self._compiled
+
     def __hash__(self) -> int:
         # We calculate the query hash by using the ``hashval`` object which
         # describes this query uniquely, so we can calculate a stable hash
@@ -173,7 +197,9 @@ class QueryInstance:
             hashval = ("and", frozenset([self._hash, other._hash]))
         else:
             hashval = None
-        return QueryInstance(lambda value: self(value) and other(value), hashval)
+        return QueryInstance(
+            lambda value: self(value) and other(value), hashval, ("and", (self, other))
+        )
 
     def __or__(self, other: "QueryInstance") -> "QueryInstance":
         # We use a frozenset for the hash as the OR operation is commutative
@@ -183,11 +209,13 @@ class QueryInstance:
             hashval = ("or", frozenset([self._hash, other._hash]))
         else:
             hashval = None
-        return QueryInstance(lambda value: self(value) or other(value), hashval)
+        return QueryInstance(
+            lambda value: self(value) or other(value), hashval, ("or", (self, other))
+        )
 
     def __invert__(self) -> "QueryInstance":
         hashval = ("not", self._hash) if self.is_cacheable() else None
-        return QueryInstance(lambda value: not self(value), hashval)
+        return QueryInstance(lambda value: not self(value), hashval, ("not", (self,)))
 
 
 class Query(QueryInstance):
@@ -269,6 +297,7 @@ class Query(QueryInstance):
         test: Callable[[Any], bool],
         hashval: Tuple,
         allow_empty_path: bool = False,
+        inline: Optional[Tuple] = None,
     ) -> QueryInstance:
         """
         Generate a query based on a test function that first resolves the query
@@ -276,6 +305,8 @@ class Query(QueryInstance):
 
         :param test: The test the query executes.
         :param hashval: The hash of the query.
+        :param inline: ``(op, operand)`` the query compiler may emit instead of
+                       calling ``test``
         :return: A :class:`~tinydb.queries.QueryInstance` object
         """
         if not self._path and not allow_empty_path:
@@ -296,7 +327,9 @@ class Query(QueryInstance):
                 return test(value)
 
         return QueryInstance(
-            lambda value: runner(value), (hashval if self.is_cacheable() else None)
+            lambda value: runner(value),
+            (hashval if self.is_cacheable() else None),
+            ("path", self._path, test, inline, hashval[0]),
         )
 
     def __eq__(self, rhs: Any):
@@ -308,7 +341,9 @@ class Query(QueryInstance):
         :param rhs: The value to compare against
         """
         return self._generate_test(
-            lambda value: value == rhs, ("==", self._path, freeze(rhs))
+            lambda value: value == rhs,
+            ("==", self._path, freeze(rhs)),
+            inline=("==", rhs),
         )
 
     def __ne__(self, rhs: Any):
@@ -320,7 +355,9 @@ class Query(QueryInstance):
         :param rhs: The value to compare against
         """
         return self._generate_test(
-            lambda value: value != rhs, ("!=", self._path, freeze(rhs))
+            lambda value: value != rhs,
+            ("!=", self._path, freeze(rhs)),
+            inline=("!=", rhs),
         )
 
     def __lt__(self, rhs: Any) -> QueryInstance:
@@ -331,7 +368,9 @@ class Query(QueryInstance):
 
         :param rhs: The value to compare against
         """
-        return self._generate_test(lambda value: value < rhs, ("<", self._path, rhs))
+        return self._generate_test(
+            lambda value: value < rhs, ("<", self._path, rhs), inline=("<", rhs)
+        )
 
     def __le__(self, rhs: Any) -> QueryInstance:
         """
@@ -341,7 +380,9 @@ class Query(QueryInstance):
 
         :param rhs: The value to compare against
         """
-        return self._generate_test(lambda value: value <= rhs, ("<=", self._path, rhs))
+        return self._generate_test(
+            lambda value: value <= rhs, ("<=", self._path, rhs), inline=("<=", rhs)
+        )
 
     def __gt__(self, rhs: Any) -> QueryInstance:
         """
@@ -351,7 +392,9 @@ class Query(QueryInstance):
 
         :param rhs: The value to compare against
         """
-        return self._generate_test(lambda value: value > rhs, (">", self._path, rhs))
+        return self._generate_test(
+            lambda value: value > rhs, (">", self._path, rhs), inline=(">", rhs)
+        )
 
     def __ge__(self, rhs: Any) -> QueryInstance:
         """
@@ -361,7 +404,9 @@ class Query(QueryInstance):
 
         :param rhs: The value to compare against
         """
-        return self._generate_test(lambda value: value >= rhs, (">=", self._path, rhs))
+        return self._generate_test(
+            lambda value: value >= rhs, (">=", self._path, rhs), inline=(">=", rhs)
+        )
 
     def exists(self) -> QueryInstance:
         """
@@ -369,7 +414,9 @@ class Query(QueryInstance):
 
         >>> Query().f1.exists()
         """
-        return self._generate_test(lambda _: True, ("exists", self._path))
+        return self._generate_test(
+            lambda _: True, ("exists", self._path), inline=("exists", None)
+        )
 
     def matches(self, regex: str, flags: int = 0) -> QueryInstance:
         """
@@ -387,7 +434,11 @@ class Query(QueryInstance):
 
             return re.match(regex, value, flags) is not None
 
-        return self._generate_test(test, ("matches", self._path, regex))
+        return self._generate_test(
+            test,
+            ("matches", self._path, regex),
+            inline=("matches", re.compile(regex, flags)),
+        )
 
     def search(self, regex: str, flags: int = 0) -> QueryInstance:
         """
@@ -406,7 +457,11 @@ class Query(QueryInstance):
 
             return re.search(regex, value, flags) is not None
 
-        return self._generate_test(test, ("search", self._path, regex))
+        return self._generate_test(
+            test,
+            ("search", self._path, regex),
+            inline=("search", re.compile(regex, flags)),
+        )
 
     def test(self, func: Callable[[Mapping], bool], *args) -> QueryInstance:
         """
@@ -511,7 +566,9 @@ class Query(QueryInstance):
         :param items: The list of items to check with
         """
         return self._generate_test(
-            lambda value: value in items, ("one_of", self._path, freeze(items))
+            lambda value: value in items,
+            ("one_of", self._path, freeze(items)),
+            inline=("one_of", items),
         )
 
     def fragment(self, document: Mapping) -> QueryInstance:
@@ -614,6 +671,7 @@ class MQuery(Query):
         test: Callable[[Any], bool],
         hashval: Tuple,
         allow_empty_path: bool = False,
+        inline: Optional[Tuple] = None,
     ) -> QueryInstance:
         if not self._path and not allow_empty_path:
             raise ValueError("MQuery has no path")
@@ -621,25 +679,27 @@ class MQuery(Query):
         return QueryInstance(
             lambda x: self.__runner(self._path, test, x),
             (hashval if self.is_cacheable() else None),
+            ("mpath", self._path, test, inline, hashval[0]),
         )
 
     def startswith(self, value):
         return self._generate_test(
-            lambda x: x.startswith(value), hashval=("startswith", value)
+            lambda x: x.startswith(value), hashval=("startswith", self._path, value)
         )
 
     def endswith(self, value):
         return self._generate_test(
-            lambda x: x.endswith(value), hashval=("endswith", value)
+            lambda x: x.endswith(value), hashval=("endswith", self._path, value)
         )
 
     def contains(self, value):
-        return self._generate_test(lambda x: value in x, hashval=("contains", value))
+        return self._generate_test(lambda x: value in x, hashval=("contains", self._path, value))
 
     def fuzz(self, value, ratio=80):
         self._path = self._path + ("@fuzz",)
         return self._generate_test(
-            lambda x: fuzz.ratio(x, value) >= ratio, hashval=("fuzz", value)
+            lambda x: fuzz.ratio(x, value) >= ratio,
+            hashval=("fuzz", self._path, value, ratio),
         )
 
 
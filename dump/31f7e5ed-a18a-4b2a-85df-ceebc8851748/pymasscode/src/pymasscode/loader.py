@@ -7,6 +7,9 @@ import shutil
 from typing import TypedDict
 
 from .etc.fileProp import FileProperty
+from .etc.indexer import CollectionIndex
+from .etc.lazyjson import LazyStore
+from .etc.search import SearchIndex
 from .model import StorageData
 
 
@@ -26,10 +29,22 @@ class _Loader:
 
 class LoaderConfig(TypedDict):
     create_bkup: bool
+    # collection name -> fields to keep secondary indexes on, None disables indexing
+    indexes: dict
+    # decode snippet contents only on access, see etc/lazyjson.py
+    lazy_load: bool
 
     @staticmethod
     def defaultConfig():
-        return {"create_bkup": True}
+        return {
+            "create_bkup": True,
+            "indexes": {
+                "snippets": ["folderId", "tagsIds", "isDeleted", "isFavorites"],
+                "folders": ["parentId"],
+                "tags": ["name"],
+            },
+            "lazy_load": False,
+        }
 
 
 class Loader:
@@ -48,6 +63,11 @@ class Loader:
         self, dbPath: str = None, appdataPath: str = None, config: dict = None
     ) -> None:
         self.__dbLockGate = 0
+        self.__dbContentLastModified = None
+        self.__dbWriteCount = 0
+        self.__dbIndexes = {}
+        self.__dbPositions = {}
+        self.__dbSearch = None
 
         if config is not None:
             self.config = config
@@ -80,6 +100,8 @@ class Loader:
         if self.config["create_bkup"]:
             shutil.copy(self.__dbPath, os.path.dirname(self.__dbPath) + "/db.bkup.json")
 
+        self.__lazyStore = LazyStore(self.__dbPath) if self.config.get("lazy_load") else None
+
     @property
     def dbPath(self):
         return self.__dbPath
@@ -92,15 +114,18 @@ class Loader:
     def preferencePath(self):
         return os.path.join(self.__appdataPath, "v2", "preferences.json")
 
-    preferences: dict = FileProperty(preferencePath)
+    # watched with inotify where available, otherwise stat'ed at most once a second
+    preferences: dict = FileProperty(preferencePath, recheckInterval=1.0, watch=True)
 
     @property
     def appconfigPath(self):
         return os.path.join(self.__appdataPath, "v2", "app.json")
 
-    appconfig: dict = FileProperty(appconfigPath)
+    appconfig: dict = FileProperty(appconfigPath, recheckInterval=1.0, watch=True)
 
-    dbIo: io.TextIOWrapper = FileProperty(dbPath, loadmethod=FileProperty.returnIOWrapper)
+    dbIo: io.TextIOWrapper = FileProperty(
+        dbPath, loadmethod=FileProperty.returnIOWrapper, recheckInterval=1.0, watch=True
+    )
 
     def dbFolders(self):
         for folder in self.dbContent["folders"]:
@@ -116,36 +141,220 @@ class Loader:
 
     @cached_property
     def __dbContent(self):
-        self.dbIo.seek(0)
-        return json.load(self.dbIo)
+        if self.__lazyStore is not None:
+            return self.__lazyStore.load()
+
+        with open(self.__dbPath, "r", encoding="utf-8") as f:
+            return json.load(f)
 
     @property
     def dbContent(self) -> StorageData:
-        if not hasattr(self, "__dbContentLastModified"):
-            self.__dbContentLastModified = os.path.getmtime(self.__dbPath)
+        # pending changes of an open transaction must not be replaced by a reload
+        if self.__dbLockGate > 0 and "_Loader__dbContent" in self.__dict__:
+            return self.__dbContent
 
-        if self.__dbContentLastModified == os.path.getmtime(self.__dbPath):
+        mtime = os.path.getmtime(self.__dbPath)
+        if self.__dbContentLastModified == mtime:
             return self.__dbContent
 
-        self.__dict__.pop("__dbContent", None)
-        self.__dbContentLastModified = os.path.getmtime(self.__dbPath)
+        # changed outside of this loader, drop everything derived from the old content
+        self.__dict__.pop("_Loader__dbContent", None)
+        self.__dbIndexes.clear()
+        self.__dbPositions.clear()
+        self.__dbSearch = None
+        self.__dbContentLastModified = mtime
 
         return self.__dbContent
 
+    def dbIndex(self, collection: str):
+        """
+        returns the secondary index of a collection, built on first use
+
+        returns None if the collection is not configured for indexing
+        """
+        content = self.dbContent
+        index = self.__dbIndexes.get(collection)
+        if index is not None:
+            return index
+
+        fields = (self.config.get("indexes") or {}).get(collection)
+        if not fields:
+            return None
+
+        index = CollectionIndex(fields)
+        index.build(content[collection])
+        self.__dbIndexes[collection] = index
+        return index
+
+    def dbPositions(self, collection: str) -> dict:
+        """
+        id -> list position map of a collection, built on first use
+        """
+        content = self.dbContent
+        positions = self.__dbPositions.get(collection)
+        if positions is None:
+            positions = self.__dbPositions[collection] = {
+                item["id"]: i for i, item in enumerate(content[collection])
+            }
+        return positions
+
+    def dbPosition(self, collection: str, _id: str):
+        items = self.dbContent[collection]
+        pos = self.dbPositions(collection).get(_id)
+        if pos is not None and pos < len(items) and items[pos]["id"] == _id:
+            return pos
+
+        # the list was changed behind our back, rebuild once
+        self.__dbPositions.pop(collection, None)
+        return self.dbPositions(collection).get(_id)
+
+    @property
+    def searchIndexPath(self):
+        return os.path.splitext(self.__dbPath)[0] + ".search.json"
+
+    def dbSearchIndex(self) -> SearchIndex:
+        """
+        full text index over the snippets, loaded from db.search.json when it
+        still matches db.json, otherwise built from the content
+        """
+        content = self.dbContent
+        if self.__dbSearch is None:
+            index = None
+            # with pending writes the file on disk is not what is in memory
+            if self.__dbLockGate == 0:
+                index = SearchIndex.load(
+                    self.searchIndexPath, SearchIndex.stamp(self.__dbPath)
+                )
+            if index is None:
+                index = SearchIndex.build(content["snippets"])
+            self.__dbSearch = index
+
+        return self.__dbSearch
+
+    def dbSearch(self, text: str, limit: int = -1):
+        """
+        returns (snippet id, score) pairs, best first
+        """
+        index = self.dbSearchIndex()
+        if index.dirty and self.__dbLockGate == 0:
+            index.save(self.searchIndexPath, SearchIndex.stamp(self.__dbPath))
+        return index.search(text, limit)
+
+    def dbSet(self, collection: str, item: dict, key: str, value):
+        """
+        writes item[key] and keeps the indexes in sync
+        """
+        with self.dbLock():
+            index = self.dbIndex(collection)
+            if index is not None:
+                index.update(item, key, value)
+
+            item[key] = value
+
+            if (
+                self.__dbSearch is not None
+                and collection == "snippets"
+                and key in ("name", "description", "content")
+            ):
+                self.__dbSearch.add(item)
+
+    def dbAppend(self, collection: str, item: dict):
+        with self.dbLock():
+            items = self.dbContent[collection]
+            positions = self.dbPositions(collection)
+            if item["id"] in positions:
+                raise ValueError(f"{item['id']} already exists in {collection}")
+
+            items.append(item)
+            positions[item["id"]] = len(items) - 1
+
+            index = self.dbIndex(collection)
+            if index is not None:
+                index.add(item)
+
+            if self.__dbSearch is not None and collection == "snippets":
+                self.__dbSearch.add(item)
+
+    def dbRemove(self, collection: str, _id: str) -> dict:
+        with self.dbLock():
+            items = self.dbContent[collection]
+            pos = self.dbPosition(collection, _id)
+            if pos is None:
+                raise KeyError(f"{_id} not found in {collection}")
+
+            positions = self.dbPositions(collection)
+            item = items.pop(pos)
+            del positions[_id]
+            # shifting the tail is as costly as the list pop itself
+            for i in range(pos, len(items)):
+                positions[items[i]["id"]] = i
+
+            index = self.dbIndex(collection)
+            if index is not None:
+                index.remove(item)
+
+            if self.__dbSearch is not None and collection == "snippets":
+                self.__dbSearch.remove(_id)
+
+        return item
+
+    def __dbFlush(self):
+        if self.__lazyStore is not None:
+            self.__lazyStore.dump(self.__dbContent)
+        else:
+            self.__dbWrite()
+
+        # our own write, the in memory content and indexes are still current
+        self.__dbContentLastModified = os.path.getmtime(self.__dbPath)
+        self.__dbWriteCount += 1
+
+    def __dbWrite(self):
+        # compact one-shot dump to a sibling file, then swap it in atomically
+        tmpPath = self.__dbPath + ".tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.__dbContent, separators=(",", ":")))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, self.__dbPath)
+
+    def __dbDiscard(self):
+        self.__dict__.pop("_Loader__dbContent", None)
+        self.__dbIndexes.clear()
+        self.__dbPositions.clear()
+        self.__dbSearch = None
+        self.__dbContentLastModified = None
+        self.__dbWriteCount += 1
+
     @contextmanager
-    def dbLock(self):
+    def transaction(self):
+        """
+        groups writes into a single flush of db.json
+
+        transactions nest, only the outermost one writes. if an exception leaves
+        the outermost transaction nothing is written and the in memory content is
+        dropped, so the next access reloads what is on disk
+
+        >>> with loader.transaction():
+        ...     for snippet in Snippet.all():
+        ...         snippet.isFavorites = False
+        """
+        self.__dbLockGate += 1
         try:
-            self.__dbLockGate += 1
-            yield
-
-        finally:
+            yield self
+        except BaseException:
             self.__dbLockGate -= 1
             if self.__dbLockGate == 0:
-                self.dbIo.seek(0)
-                self.dbIo.truncate()
-                self.dbIo.write(json.dumps(self.dbContent, indent=4))
+                self.__dbDiscard()
+            raise
+        else:
+            self.__dbLockGate -= 1
+            if self.__dbLockGate == 0:
+                self.__dbFlush()
+
+    # every setter opens one of these, inside a transaction they are free
+    dbLock = transaction
 
     @property
     def dbMdate(self):
-        # mdate
-        return hash(self.__dbContentLastModified)
+        # mdate + local writes, so query caches see changes made through this loader
+        return hash((self.__dbContentLastModified, self.__dbWriteCount))
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from pymasscode.dcls import BaseItemMeta
+from pymasscode.loader import Loader, LoaderConfig
+
+
+def makeDb(snippets: int = 30) -> dict:
+    folders = [
+        {"id": f"folder{i}", "name": f"folder {i}", "parentId": None if i < 2 else "folder0"}
+        for i in range(4)
+    ]
+    tags = [{"id": f"tag{i}", "name": f"tag {i}"} for i in range(5)]
+    items = [
+        {
+            "id": f"snippet{i}",
+            "name": f"snippet {i}",
+            "description": "even" if i % 2 == 0 else "odd",
+            "folderId": f"folder{i % 4}",
+            "tagsIds": [f"tag{i % 5}", f"tag{(i + 1) % 5}"] if i % 3 else [],
+            "isDeleted": i % 7 == 0,
+            "isFavorites": i % 5 == 0,
+            "createdAt": 1700000000000 + i,
+            "updatedAt": 1700000000000 + i,
+            "content": [{"label": "Fragment 1", "language": "python", "value": f"print({i})"}],
+        }
+        for i in range(snippets)
+    ]
+    return {"folders": folders, "snippets": items, "tags": tags}
+
+
+@pytest.fixture
+def dbPath(tmp_path):
+    path = tmp_path / "db.json"
+    path.write_text(json.dumps(makeDb(), indent=2), encoding="utf-8")
+    return str(path)
+
+
+# the _Loader descriptor itself, reading Loader.currentLoader would create a default one
+_slot = Loader.__dict__["currentLoader"]
+
+
+def _switchLoader(dbPath: str, **config) -> Loader:
+    """makes a new loader over dbPath the current one, config overrides the defaults"""
+    merged = LoaderConfig.defaultConfig()
+    merged["create_bkup"] = False
+    merged.update(config)
+
+    # instances and query results are cached per class, not per loader
+    BaseItemMeta._instances.clear()
+    BaseItemMeta._query_cache.clear()
+
+    _slot.currentLoader = Loader(dbPath=dbPath, config=merged)
+    return _slot.currentLoader
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def loader(request, dbPath):
+    previous = _slot.currentLoader
+    yield _switchLoader(dbPath, lazy_load=request.param)
+    _slot.currentLoader = previous
+
+
+@pytest.fixture
+def switchLoader(loader):
+    """switchLoader(**config) replaces the current loader with a new one over the same db"""
+    return lambda **config: _switchLoader(
+        loader.dbPath, **{"lazy_load": loader.config["lazy_load"], **config}
+    )
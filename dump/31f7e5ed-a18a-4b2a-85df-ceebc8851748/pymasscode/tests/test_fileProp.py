@@ -0,0 +1,134 @@
+import os
+import time
+import types
+
+import pytest
+
+from pymasscode.etc import fileProp
+from pymasscode.etc.fileProp import FileProperty, _InotifyWatcher
+
+
+def _holder(**kwargs):
+    class Holder:
+        def __init__(self, path):
+            self._path = path
+
+        @property
+        def path(self):
+            return self._path
+
+        content = FileProperty(path, **kwargs)
+
+    return Holder
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _replace(path, text):
+    _write(path + ".tmp", text)
+    os.replace(path + ".tmp", path)
+
+
+def _eventually(read, expected, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while read() != expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return read()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fileProp, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_stat_fallback_within_and_past_interval(tmp_path, clock):
+    path = str(tmp_path / "a.txt")
+    _write(path, "one")
+    holder = _holder(recheckInterval=1.0)(path)
+    assert holder.content == "one"
+
+    _write(path, "two!")
+    clock[0] += 0.5
+    # still within the interval, the file is not looked at
+    assert holder.content == "one"
+
+    clock[0] += 0.6
+    assert holder.content == "two!"
+
+
+def test_no_interval_sees_every_write(tmp_path):
+    path = str(tmp_path / "a.json")
+    _write(path, '{"a": 1}')
+    holder = _holder()(path)
+    assert holder.content == {"a": 1}
+
+    _replace(path, '{"a": 22}')
+    assert holder.content == {"a": 22}
+
+
+def test_sha256_ignores_touch(tmp_path, clock):
+    path = str(tmp_path / "a.json")
+    _write(path, '{"a": 1}')
+    holder = _holder(watching=["sha256"])(path)
+    first = holder.content
+
+    os.utime(path, (1, 1))
+    clock[0] += 1
+    assert holder.content is first
+
+    _write(path, '{"a": 2}')
+    clock[0] += 1
+    assert holder.content == {"a": 2}
+
+
+def test_inotify_invalidates(tmp_path, monkeypatch):
+    if _InotifyWatcher.get() is None:
+        pytest.skip("inotify not available")
+
+    path = str(tmp_path / "a.txt")
+    _write(path, "one")
+    holder = _holder(watch=True, recheckInterval=3600)(path)
+    assert holder.content == "one"
+
+    # hot reads only compare generations
+    stats = []
+    realStat = os.stat
+    monkeypatch.setattr(os, "stat", lambda *a, **kw: stats.append(a) or realStat(*a, **kw))
+    for _ in range(10):
+        assert holder.content == "one"
+    assert stats == []
+    monkeypatch.undo()
+
+    # written in place and replaced, both despite the hour long recheck interval
+    _write(path, "two!")
+    assert _eventually(lambda: holder.content, "two!") == "two!"
+    _replace(path, "three")
+    assert _eventually(lambda: holder.content, "three") == "three"
+
+
+def test_lru_evicts_oldest(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileProperty, "cacheSize", 2)
+    Holder = _holder(loadmethod=FileProperty.returnIOWrapper)
+
+    holders = {}
+    for name in "abc":
+        path = str(tmp_path / f"{name}.txt")
+        _write(path, name)
+        holders[name] = Holder(path)
+
+    a = holders["a"].content
+    b = holders["b"].content
+    holders["a"].content
+    holders["c"].content
+
+    cached = [path for path, prop in FileProperty._properties if prop is Holder.content]
+    assert [os.path.basename(path) for path in cached] == ["a.txt", "c.txt"]
+    # evicted file handles are closed, the others stay usable
+    assert b.closed and not a.closed
+    assert holders["b"].content.read() == "b"
+    Holder.content.invalidate()
@@ -0,0 +1,59 @@
+import pytest
+
+from pymasscode.dcls import Folder, Snippet
+
+q = Snippet.q
+
+CONDITIONS = [
+    q.folderId == "folder1",
+    q.folderId == "missing",
+    q.tagsIds.any(["tag1", "tag3"]),
+    (q.isDeleted == False) & (q.folderId == "folder2"),  # noqa: E712
+    (q.folderId == "folder0") | (q.isFavorites == True),  # noqa: E712
+    (q.folderId == "folder1") & q.name.matches(r"snippet 1\d"),
+    # not answerable by the index, always a full scan
+    q.tagsIds == [],
+    q.name.matches(r"snippet \d$"),
+]
+
+
+def _results(conditions):
+    return [[s.id for s in Snippet.query(cond)] for cond in conditions]
+
+
+def test_index_matches_scan(loader, switchLoader):
+    index = loader.dbIndex("snippets")
+    assert index.plan(CONDITIONS[0]) is not None
+    assert index.plan(CONDITIONS[-1]) is None
+
+    indexed = _results(CONDITIONS)
+    assert indexed[0] == [f"snippet{i}" for i in range(1, 30, 4)]
+    switchLoader(indexes=None)
+    assert _results(CONDITIONS) == indexed
+
+
+def test_index_follows_writes(loader, switchLoader):
+    Snippet(_id="snippet1").folderId = "folder2"
+    Snippet(_id="snippet2").tagsIds = ["tag1"]
+    Snippet(_id="snippet3").isDeleted = False
+    Snippet(_id="snippet4").delete()
+
+    indexed = _results(CONDITIONS)
+    assert "snippet1" in indexed[3] and "snippet1" not in indexed[0]
+    switchLoader(indexes=None)
+    assert _results(CONDITIONS) == indexed
+
+
+def test_folder_index(loader):
+    cond = Folder.q.parentId == "folder0"
+    assert loader.dbIndex("folders").plan(cond) == {"folder2", "folder3"}
+    assert [f.id for f in Folder.query(cond)] == ["folder2", "folder3"]
+    assert [f.id for f in Folder.query(Folder.q.parentId == None)] == [  # noqa: E711
+        "folder0",
+        "folder1",
+    ]
+
+
+@pytest.mark.parametrize("cond", [q.tagsIds.any(q.name == "x"), q.tagsIds == ["tag1"]])
+def test_unindexable_conditions(loader, cond):
+    assert loader.dbIndex("snippets").plan(cond) is None
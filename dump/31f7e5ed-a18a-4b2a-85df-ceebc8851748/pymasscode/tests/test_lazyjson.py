@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from pymasscode.etc.lazyjson import LazyContent, LazyStore
+
+
+def _db():
+    return {
+        "folders": [
+            {"id": "f1", "name": "folder", "content": ["folder level"]},
+        ],
+        "snippets": [
+            {
+                "id": "s1",
+                "folderId": "f1",
+                "meta": {"content": ["nested"], "other": {"content": [1, 2]}},
+                "content": [{"label": "Fragment 1", "value": 'print("content": [])'}],
+            },
+            {"id": "s2", "folderId": "f1", "content": "not a list"},
+            {"id": "s3", "folderId": "f1", "content": [{"label": "é", "value": "ünïcode"}]},
+        ],
+        "tags": [],
+        "content": ["top level"],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "db.json"
+    path.write_text(json.dumps(_db(), indent=2, ensure_ascii=False), encoding="utf-8")
+    return LazyStore(str(path))
+
+
+def _plain(content):
+    return json.loads(json.dumps(content, default=lambda obj: obj.load()))
+
+
+def test_only_snippet_content_is_lazy(store):
+    content = store.load()
+    s1, s2, s3 = content["snippets"]
+
+    assert isinstance(s1["content"], LazyContent)
+    assert isinstance(s3["content"], LazyContent)
+    assert s2["content"] == "not a list"
+    assert s1["meta"] == {"content": ["nested"], "other": {"content": [1, 2]}}
+    assert content["folders"][0]["content"] == ["folder level"]
+    assert content["content"] == ["top level"]
+    assert _plain(content) == _db()
+
+
+def test_round_trip(store):
+    content = store.load()
+    content["snippets"][1]["content"] = [{"label": "new", "value": "x"}]
+    store.dump(content)
+
+    expected = _db()
+    expected["snippets"][1]["content"] = [{"label": "new", "value": "x"}]
+    with open(store.path, encoding="utf-8") as f:
+        assert json.load(f) == expected
+
+    # once from the sidecar written by dump, once from a fresh scan
+    assert _plain(store.load()) == expected
+    fresh = LazyStore(store.path)
+    fresh.sidecarPath = store.sidecarPath + ".none"
+    assert _plain(fresh.load()) == expected
+
+
+def test_stale_sidecar_format_is_rebuilt(store):
+    store.load()
+    with open(store.sidecarPath, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        skeleton = f.read()
+
+    # a sidecar without the format marker predates the current layout
+    del header["format"]
+    with open(store.sidecarPath, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n" + skeleton.replace('"top level"', '"stale"'))
+
+    assert store.load()["content"] == ["top level"]
+
+
+def test_regex_and_structural_scans_agree(tmp_path):
+    db = _db()
+    del db["content"], db["folders"][0]["content"], db["snippets"][0]["meta"]
+    text = json.dumps(db, indent=2)
+
+    assert LazyStore._candidateSpans(text) == LazyStore._contentSpans(text)
+    assert len(LazyStore._contentSpans(text)) == 2
@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from pymasscode.dcls import Snippet
+from pymasscode.etc.search import SearchIndex
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_transaction_rollback(loader):
+    before = _read(loader.dbPath)
+
+    with pytest.raises(RuntimeError):
+        with loader.transaction():
+            Snippet(_id="snippet1").name = "renamed"
+            Snippet(_id="snippet2").delete()
+            with loader.transaction():
+                Snippet(_id="snippet3").content = []
+            raise RuntimeError
+
+    assert _read(loader.dbPath) == before
+    # the in memory changes are dropped and the next access reloads db.json
+    assert Snippet(_id="snippet1").name == "snippet 1"
+    assert [s.id for s in Snippet.query(Snippet.q.id == "snippet2")] == ["snippet2"]
+    assert Snippet(_id="snippet3").content[0]["value"] == "print(3)"
+
+
+def test_transaction_writes_once(loader, switchLoader):
+    with loader.transaction():
+        Snippet(_id="snippet1").name = "renamed"
+        mtime = os.stat(loader.dbPath).st_mtime_ns
+        Snippet(_id="snippet1").content = [{"label": "new", "value": "é"}]
+        assert os.stat(loader.dbPath).st_mtime_ns == mtime
+
+    switchLoader()
+    snippet = Snippet(_id="snippet1")
+    assert snippet.name == "renamed"
+    assert snippet.content == [{"label": "new", "value": "é"}]
+    assert Snippet(_id="snippet2").content[0]["value"] == "print(2)"
+
+
+def test_search_sidecar_round_trip(loader, switchLoader, monkeypatch):
+    expected = [s.id for s in Snippet.search("print")]
+    assert len(expected) == 30
+    assert os.path.exists(loader.searchIndexPath)
+
+    # a new loader reads the index from db.search.json instead of rebuilding it
+    with monkeypatch.context() as m:
+        m.setattr(SearchIndex, "build", classmethod(lambda cls, snippets: 1 / 0))
+        switchLoader()
+        assert [s.id for s in Snippet.search("print")] == expected
+
+    # db.json changed since, the sidecar is stale and rebuilt
+    Snippet(_id="snippet1").name = "unusual"
+    switchLoader()
+    assert [s.id for s in Snippet.search("unusual")] == ["snippet1"]
+
+
+def _expectedPositions(loader, collection):
+    return {item["id"]: i for i, item in enumerate(loader.dbContent[collection])}
+
+
+def test_positions_follow_writes(loader):
+    assert loader.dbPositions("snippets") == _expectedPositions(loader, "snippets")
+
+    Snippet(_id="snippet5").name = "renamed"
+    loader.dbAppend("snippets", {"id": "snippet99", "name": "new", "content": []})
+    loader.dbRemove("snippets", "snippet3")
+    Snippet(_id="snippet10").delete()
+
+    positions = loader.dbPositions("snippets")
+    assert positions == _expectedPositions(loader, "snippets")
+    assert "snippet3" not in positions and positions["snippet99"] == 28
+    assert loader.dbPosition("snippets", "snippet29") == 27
+    assert Snippet(_id="snippet29").name == "snippet 29"
+
+    with pytest.raises(ValueError):
+        loader.dbAppend("snippets", {"id": "snippet1"})
+    with pytest.raises(KeyError):
+        loader.dbRemove("snippets", "snippet3")
+
+
+def test_positions_cleared_on_reload(loader):
+    before = loader.dbPositions("snippets")
+    assert before["snippet0"] == 0
+
+    # rewritten by someone else, in reverse order
+    with open(loader.dbPath, encoding="utf-8") as f:
+        db = json.load(f)
+    db["snippets"].reverse()
+    with open(loader.dbPath, "w", encoding="utf-8") as f:
+        json.dump(db, f)
+    stat = os.stat(loader.dbPath)
+    os.utime(loader.dbPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    positions = loader.dbPositions("snippets")
+    assert positions is not before
+    assert positions["snippet0"] == 29
+    assert positions == _expectedPositions(loader, "snippets")
@@ -0,0 +1,42 @@
+import pytest
+
+from pymasscode.dcls import Snippet
+from pymasscode.etc import query_compiler
+
+
+def test_equal_queries_share_compiled_predicate():
+    q = Snippet.q
+    first = (q.folderId == "folder1") & (q.isDeleted == False)  # noqa: E712
+    second = (q.folderId == "folder1") & (q.isDeleted == False)  # noqa: E712
+    assert first is not second
+    assert first.compile() is second.compile()
+    assert (q.folderId == "folder2").compile() is not first.compile()
+
+
+@pytest.mark.parametrize(
+    "op, value",
+    [("startswith", "ab"), ("endswith", "bc"), ("contains", "b"), ("fuzz", "abc")],
+)
+def test_same_operator_on_other_paths(op, value):
+    # queries only differing in their path must not share a compiled predicate
+    q = Snippet.q
+    doc = {"name": "abc", "description": "zzz"}
+    byName = getattr(q.name, op)(value)
+    byDescription = getattr(q.description, op)(value)
+
+    assert byName != byDescription
+    assert (byName(doc), byDescription(doc)) == (True, False)
+    assert (byName.compile()(doc), byDescription.compile()(doc)) == (True, False)
+
+
+def test_cache_hit_does_not_compile(loader, monkeypatch):
+    q = Snippet.q
+    expected = [s.id for s in Snippet.query(q.name.matches(r"snippet 1\d"))]
+    assert expected == [f"snippet{i}" for i in range(10, 20)]
+
+    def fail(cond):
+        raise AssertionError("compiled on a cache hit")
+
+    monkeypatch.setattr(query_compiler, "compileQuery", fail)
+    monkeypatch.setattr(query_compiler, "compileQueryCached", fail)
+    assert [s.id for s in Snippet.query(q.name.matches(r"snippet 1\d"))] == expected
@@ -0,0 +1,58 @@
+"""
+sha256 of a tree of files: 4 KB chunks one file at a time (previous implementation)
+vs hash_many, and hash_many again with a warm HashCache
+
+    python benchmarks/bench_stdext_hashlib.py [files] [size_kb]
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.stdext_hashlib import HashCache, hash_many  # noqa: E402
+from zuu.util_file import iter_by_chunk  # noqa: E402
+
+
+def legacy_sha256(path):
+    hash = hashlib.sha256()
+    for chunk in iter_by_chunk(path):
+        hash.update(chunk)
+    return hash.hexdigest()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:>24}: {time.perf_counter() - start:7.3f} s")
+    return result
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 2048
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = []
+        block = os.urandom(1024)
+        for i in range(files):
+            path = os.path.join(root, f"{i}.bin")
+            with open(path, "wb") as f:
+                f.write(block * size_kb)
+            os.utime(path, (1_600_000_000, 1_600_000_000))
+            paths.append(path)
+        print(f"{files} files of {size_kb} KB, {os.cpu_count()} cpus")
+
+        expected = timed("legacy 4 KB chunks", lambda: {p: legacy_sha256(p) for p in paths})
+        assert timed("hash_many", lambda: hash_many(paths)) == expected
+
+        cache = HashCache()
+        hash_many(paths, cache=cache)
+        assert timed("hash_many, cached", lambda: hash_many(paths, cache=cache)) == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+path_match: listdir + pop(0) BFS (previous implementation) vs the scandir walker
+
+    python benchmarks/bench_util_file.py [dirs] [files_per_dir]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.util_file import iter_path_match, path_match  # noqa: E402
+
+
+def legacy_scan_pathes(pathes, depth=1):
+    if depth == 0:
+        return pathes
+
+    results = []
+    queue = [(os.path.abspath(path), 0) for path in pathes]
+    while queue:
+        current_path, current_depth = queue.pop(0)
+        if depth != -1 and current_depth > depth:
+            continue
+        results.append(current_path)
+        if os.path.isdir(current_path) and (depth == -1 or current_depth < depth):
+            try:
+                for entry in os.listdir(current_path):
+                    queue.append((os.path.join(current_path, entry), current_depth + 1))
+            except PermissionError:
+                continue
+    return results
+
+
+def legacy_path_match(pathes, matches, depth=1):
+    eligible_pathes = legacy_scan_pathes(pathes, depth)
+    compiled = [re.compile(re.escape(pattern).replace(r"\*", ".*")) for pattern in matches]
+    results = []
+    common_root = os.path.commonpath(eligible_pathes) if eligible_pathes else ""
+    for path in eligible_pathes:
+        base_name = os.path.basename(path)
+        rel_path = os.path.relpath(path, common_root).replace(os.sep, "/")
+        for pattern in compiled:
+            if pattern.search(rel_path) or pattern.search(base_name):
+                results.append(path)
+                break
+    return results
+
+
+def build_tree(root, dirs, files_per_dir):
+    for i in range(dirs):
+        path = os.path.join(root, f"pkg{i % 20}", f"mod{i}")
+        os.makedirs(path, exist_ok=True)
+        for j in range(files_per_dir):
+            ext = ".py" if j % 3 else ".txt"
+            open(os.path.join(path, f"file{j}{ext}"), "w").close()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:>28}: {time.perf_counter() - start:7.3f} s, {len(result)} matches")
+    return result
+
+
+def main():
+    dirs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    files_per_dir = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, dirs, files_per_dir)
+        print(f"{dirs * files_per_dir} files in {dirs} directories")
+
+        matches = ["*.txt", "pkg1/*/file1.py"]
+        expected = timed("legacy path_match", lambda: legacy_path_match([root], matches, -1))
+        result = timed("path_match", lambda: path_match([root], matches, -1))
+        assert result == expected
+
+        result = timed("iter_path_match workers=8", lambda: list(iter_path_match([root], matches, -1, workers=8)))
+        assert sorted(result) == sorted(expected)
+
+        start = time.perf_counter()
+        first = next(iter_path_match([root], matches, -1))
+        print(f"{'first streamed match':>28}: {time.perf_counter() - start:7.3f} s ({os.path.basename(first)})")
+
+
+if __name__ == "__main__":
+    main()
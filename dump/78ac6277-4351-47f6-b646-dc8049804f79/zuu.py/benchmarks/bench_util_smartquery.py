@@ -0,0 +1,58 @@
+"""
+QueryObj per record cost: eval() per record (previous implementation) vs the compiled closure tree
+
+    python benchmarks/bench_util_smartquery.py [records]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.util_smartquery import QueryObj  # noqa: E402
+
+QUERIES = [
+    "name is John",
+    "name pattern of J*n",
+    "(name contains Jo or age is 30) and not title contains Manager",
+]
+
+
+def make_records(count):
+    rnd = random.Random(0)
+    names = ["John", "Jolyne", "Alice", "Mike", "Joan", "Bob"]
+    titles = ["Developer", "Project Manager", "Designer"]
+    return [
+        {"name": rnd.choice(names), "age": rnd.randrange(20, 60), "title": rnd.choice(titles), "id": i}
+        for i in range(count)
+    ]
+
+
+def per_record(label, count, fn):
+    start = time.perf_counter()
+    matched = fn()
+    elapsed = time.perf_counter() - start
+    print(f"    {label:>10}: {elapsed / count * 1e6:6.2f} us/record ({elapsed:.2f} s, {matched} matches)")
+    return matched
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    records = make_records(count)
+    print(f"{count} records")
+
+    for query_str in QUERIES:
+        query_obj = QueryObj.parse(query_str)
+        print(f"{query_obj.query}")
+
+        legacy = query_obj._QueryObj__eval_func_maker()
+        to_rep = query_obj._QueryObj__toDictRepresentation
+        expected = per_record("eval", count, lambda: sum(1 for r in records if legacy(to_rep(r))))
+        matched = per_record("filter_many", count, lambda: len(query_obj.filter_many(records)))
+        assert matched == expected
+
+
+if __name__ == "__main__":
+    main()
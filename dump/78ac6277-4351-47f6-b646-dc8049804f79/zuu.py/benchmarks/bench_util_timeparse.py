@@ -0,0 +1,53 @@
+"""
+time_parse per call cost for every input category: uncached (plan built on each call,
+what the previous implementation paid) vs the cached parse plan
+
+    python benchmarks/bench_util_timeparse.py [calls]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from zuu.util_timeparse import _plan, time_parse  # noqa: E402
+
+CASES = [
+    ("int timestamp", 1672531200),
+    ("str timestamp", "1672531200"),
+    ("relative seconds", "90"),
+    ("units", "1h30m"),
+    ("combined", "now + 30min"),
+    ("cron", "*/5 * * * *"),
+    ("natural", "in 10 minutes"),
+]
+
+
+def per_call(calls, fn):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    # import the optional backends before timing
+    time_parse("* * * * 1")
+    time_parse("tomorrow")
+
+    print(f"{'':>18}  {'uncached':>12}  {'cached':>12}")
+    for label, value in CASES:
+        def uncached():
+            _plan.cache_clear()
+            time_parse(value)
+
+        cold = per_call(calls, uncached)
+        warm = per_call(calls, lambda: time_parse(value))
+        print(f"{label:>18}: {cold:8.2f} us  {warm:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import cache
+import hashlib
+import json
+import threading
+import time
 import typing
 import os
-from urllib.parse import urlparse
+from urllib.parse import urlencode, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 
-from zuu.util_file import path_match
+from zuu.util_file import atomic_write, path_match
 
 
 class Github:
     HEADERS = {"Accept": "application/vnd.github.v3+json"}
 
+    _client: "GithubClient" = None
+    _client_lock = threading.Lock()
+
+    @classmethod
+    def client(cls) -> "GithubClient":
+        """the client GithubRepo and GithubGist use, created on first use"""
+        if cls._client is None:
+            with cls._client_lock:
+                if cls._client is None:
+                    cls._client = GithubClient()
+        return cls._client
+
+    @classmethod
+    def setClient(cls, client: "GithubClient") -> None:
+        cls._client = client
+
+
+class GithubClient:
+    """
+    Pooled requests session with a conditional request cache.
+
+    JSON responses are reused for ``ttl`` seconds, after that they are
+    revalidated with If-None-Match, a 304 keeps the cached body. With
+    ``cache_dir`` the cache survives restarts, otherwise it lives in memory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: typing.Optional[str] = None,
+        ttl: float = 300,
+        pool_size: int = 10,
+        apiUrl: str = "https://api.github.com",
+        chunk_size: int = 1 << 20,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self.apiUrl = apiUrl.rstrip("/")
+        self.chunk_size = chunk_size
+
+        self.session = requests.Session()
+        self.session.headers.update(Github.HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._entries: typing.Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # ANCHOR cache
+    def _cachePath(self, key: str) -> typing.Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _cached(self, key: str) -> typing.Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        path = self._cachePath(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _store(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+        path = self._cachePath(key)
+        if path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write(path, json.dumps(entry))
+
+    def clearCache(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    # ANCHOR requests
+    def getJson(self, url: str, params: typing.Optional[dict] = None):
+        """
+        GET a JSON document through the cache, raises requests.HTTPError for error statuses.
+        """
+        key = url + ("?" + urlencode(sorted(params.items())) if params else "")
+        entry = self._cached(key)
+
+        if entry is not None and time.time() - entry["fetched"] < self.ttl:
+            return entry["body"]
+
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            entry = {**entry, "fetched": time.time()}
+            self._store(key, entry)
+            return entry["body"]
+
+        response.raise_for_status()
+        body = response.json()
+        self._store(
+            key, {"etag": response.headers.get("ETag"), "fetched": time.time(), "body": body}
+        )
+        return body
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+    def download(self, url: str, path: str) -> str:
+        """
+        Stream url to path in chunks, the file only appears once it is complete.
+        """
+        tmp_path = f"{path}.part"
+        try:
+            with self.session.get(url, stream=True) as response:
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def downloadMany(
+        self, items: typing.Iterable[typing.Tuple[str, str]], workers: typing.Optional[int] = None
+    ) -> typing.List[typing.Union[str, Exception]]:
+        """
+        Download (url, path) pairs in parallel, returns the paths in order,
+        or the exception for downloads that failed.
+        """
+
+        def run(item):
+            try:
+                return self.download(*item)
+            except (requests.exceptions.RequestException, OSError) as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers or self.pool_size) as pool:
+            return list(pool.map(run, items))
+
+    def fetchMany(
+        self, urls: typing.Iterable[str], workers: typing.Optional[int] = None
+    ) -> typing.List[typing.Union[bytes, Exception]]:
+        """
+        Fetch urls into memory in parallel, returns the contents in order,
+        or the exception for fetches that failed.
+        """
+
+        def run(url):
+            try:
+                response = self.session.get(url)
+                response.raise_for_status()
+                return response.content
+            except requests.exceptions.RequestException as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers or self.pool_size) as pool:
+            return list(pool.map(run, urls))
+
 
 class GithubGist:
     @staticmethod
-    @cache
     def apiGet(gist_id: str) -> dict:
-        url = f"https://api.github.com/gists/{gist_id}"
-        response = requests.get(url, headers=Github.HEADERS)
-        return response.json()
+        client = Github.client()
+        return client.getJson(f"{client.apiUrl}/gists/{gist_id}")
 
     @staticmethod
     def file(
@@ -33,7 +213,7 @@ class GithubGist:
             download_url = file_info["raw_url"]
 
             try:
-                response = requests.get(download_url)
+                response = Github.client().get(download_url)
                 response.raise_for_status()
                 content = response.content
 
@@ -151,35 +331,32 @@ class GithubRepo:
         query: typing.Union[GithubRepoFileContext, str], path: str = None
     ) -> str:
         url = GithubRepo.rawUrl(query)
-        response = requests.get(url, headers=Github.HEADERS)
+        response = Github.client().get(url)
         if path is not None:
             with open(path, "wb") as f:
                 f.write(response.content)
         return response.content
 
     @staticmethod
-    @cache
     def lastCommit(
         query: typing.Union[GithubRepoFileContext, str],
     ) -> typing.Optional[typing.Dict]:
         if isinstance(query, str):
             query = GithubRepoFileContext.auto(query)
 
-        api_url = f"https://api.github.com/repos/{query.org}/{query.repo}/commits"
+        client = Github.client()
+        api_url = f"{client.apiUrl}/repos/{query.org}/{query.repo}/commits"
         params = {"path": query.path, "per_page": 1}
         if query.branch:
             params["sha"] = query.branch
 
         try:
-            response = requests.get(api_url, headers=Github.HEADERS, params=params)
-            response.raise_for_status()
-            commits = response.json()
+            commits = client.getJson(api_url, params=params)
             return commits[0] if commits else None
         except requests.exceptions.RequestException:
             return None
 
     @staticmethod
-    @cache
     def releases(
         query: typing.Union[GithubRepoContext, str],
         tag: str = None,
@@ -193,20 +370,19 @@ class GithubRepo:
         else:
             org, repo = query.org, query.repo
 
-        api_url = f"https://api.github.com/repos/{org}/{repo}/releases"
-        if tag:
+        client = Github.client()
+        api_url = f"{client.apiUrl}/repos/{org}/{repo}/releases"
+        params = None
+        if tag == "latest":
+            api_url += "/latest"
+        elif tag:
             api_url += f"/tags/{tag}"
         else:
-            if page_num is None:
-                page_num = 1
-            api_url += f"?page={page_num}"
+            params = {"page": page_num or 1}
 
         try:
-            response = requests.get(api_url, headers=Github.HEADERS)
-            response.raise_for_status()
-            result = [response.json()] if tag else response.json()
-
-            return result
+            result = client.getJson(api_url, params=params)
+            return [result] if tag else result
 
         except requests.exceptions.RequestException:
             return []
@@ -228,27 +404,26 @@ class GithubRepo:
                 return None
             release = releases[0]
 
-        downloaded = []
         assets = release.get("assets", [])
         filenames = [asset["name"] for asset in assets]
         matches = path_match(filenames, asset_names, depth=0)
+        urls = [
+            next(a for a in assets if a["name"] == match)["browser_download_url"]
+            for match in matches
+        ]
+        client = Github.client()
+
+        if save_path:
+            # streamed straight to disk, failed downloads are skipped
+            os.makedirs(save_path, exist_ok=True)
+            client.downloadMany(
+                (url, os.path.join(save_path, match)) for url, match in zip(urls, matches)
+            )
+            return None
 
-        for match in matches:
-            asset = next(a for a in assets if a["name"] == match)
-            try:
-                response = requests.get(
-                    asset["browser_download_url"], headers=Github.HEADERS
-                )
-                response.raise_for_status()
-                content = response.content
-
-                if save_path:
-                    os.makedirs(save_path, exist_ok=True)
-                    with open(os.path.join(save_path, asset["name"]), "wb") as f:
-                        f.write(content)
-                else:
-                    downloaded.append((asset["name"], content))
-            except requests.exceptions.RequestException:
-                continue
-
+        downloaded = [
+            (match, content)
+            for match, content in zip(matches, client.fetchMany(urls))
+            if not isinstance(content, Exception)
+        ]
         return downloaded or None
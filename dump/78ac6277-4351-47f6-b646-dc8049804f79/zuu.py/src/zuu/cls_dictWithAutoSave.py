@@ -1,23 +1,67 @@
-import os
+import atexit
 import json
+import os
+import threading
+import time
+import weakref
 from typing import Any, Dict, Optional
 
+from zuu.util_file import get_codec, save
+
+# write-behind dicts that still have to flush when the interpreter exits
+# (dicts are unhashable, so they are keyed by id)
+_pending: "weakref.WeakValueDictionary[int, DictWithAutosave]" = weakref.WeakValueDictionary()
+
+
+@atexit.register
+def _flush_pending() -> None:
+    for d in list(_pending.values()):
+        d.flush()
+
 
 class DictWithAutosave(dict):
     """
     A dictionary that automatically saves changes to a file and monitors for external modifications.
+
+    By default every change rewrites the file. With ``write_behind=True`` changes
+    only mark the dict dirty and are written in one atomic save once
+    ``flush_interval`` seconds passed without changes, after ``flush_every``
+    changes, on :meth:`flush` or when leaving a ``with`` block. ``journal=True``
+    additionally appends every change to ``<path>.journal`` so unflushed changes
+    survive a crash, they are replayed on the next load.
     """
 
-    def __init__(self, path: str, initial_data: Optional[Dict] = None):
+    def __init__(
+        self,
+        path: str,
+        initial_data: Optional[Dict] = None,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        flush_every: int = 1000,
+        journal: bool = False,
+    ):
         """
         Initialize the auto-saving dictionary.
 
         Args:
             path (str): Path to the JSON file for persistence
             initial_data (Dict, optional): Initial dictionary data
+            write_behind (bool): Batch changes instead of saving on every change
+            flush_interval (float): Seconds without changes before a write-behind flush
+            flush_every (int): Number of changes that force a write-behind flush
+            journal (bool): Append changes to ``<path>.journal`` between flushes
         """
         self._path = path
         self._last_mtime = 0
+        self._write_behind = write_behind
+        self._flush_interval = flush_interval
+        self._flush_every = flush_every
+        self._journal_path = path + ".journal" if journal else None
+        self._journal = None
+        self._dirty = 0
+        self._timer: Optional[threading.Timer] = None
+        self._last_change = 0.0
+        self._lock = threading.RLock()
 
         # Create parent directory if it doesn't exist
         os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -31,19 +75,23 @@ class DictWithAutosave(dict):
     def _load(self) -> None:
         """Load data from file if it exists and update last modified time."""
         if os.path.exists(self._path):
-            with open(self._path, "r") as f:
-                super().clear()  # Clear existing data first
-                super().update(json.load(f))
+            with open(self._path, "rb") as f:
+                data = get_codec("json").loads(f.read())
+            super().clear()  # Clear existing data first
+            super().update(data)
             self._last_mtime = os.path.getmtime(self._path)
+            if self._replay_journal():
+                self._save()
         else:
             super().clear()
+            self._replay_journal()
             self._save()
 
     def _save(self) -> None:
         """Save current dictionary state to file."""
-        with open(self._path, "w") as f:
-            json.dump(dict(self), f, indent=2)
+        save(dict(self), self._path, file_type="json", indent=2)
         self._last_mtime = os.path.getmtime(self._path)
+        self._truncate_journal()
 
     def _check_and_reload(self) -> None:
         """Check if file was modified externally and reload if necessary."""
@@ -52,40 +100,151 @@ class DictWithAutosave(dict):
             if current_mtime > self._last_mtime:
                 self._load()
 
+    # ANCHOR journal
+    def _replay_journal(self) -> bool:
+        """Apply changes left in the journal by an unflushed session."""
+        if self._journal_path is None or not os.path.exists(self._journal_path):
+            return False
+
+        replayed = False
+        with open(self._journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    op, *args = json.loads(line)
+                except ValueError:
+                    # torn last line of an interrupted append
+                    break
+
+                if op == "set":
+                    super().__setitem__(args[0], args[1])
+                elif op == "del":
+                    super().pop(args[0], None)
+                elif op == "update":
+                    super().update(args[0])
+                elif op == "clear":
+                    super().clear()
+                replayed = True
+        return replayed
+
+    def _append_journal(self, op: list) -> None:
+        if self._journal_path is None:
+            return
+        if self._journal is None:
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(op) + "\n")
+        self._journal.flush()
+
+    def _truncate_journal(self) -> None:
+        if self._journal_path is None:
+            return
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+
+    # ANCHOR write-behind
+    def _before_change(self) -> None:
+        # a write-behind batch only looks for external changes when it starts
+        if not self._dirty:
+            self._check_and_reload()
+
+    def _after_change(self, op: list) -> None:
+        if not self._write_behind:
+            self._save()
+            return
+
+        self._append_journal(op)
+        self._dirty += 1
+        _pending[id(self)] = self
+
+        if self._dirty >= self._flush_every:
+            self.flush()
+            return
+
+        # one timer per batch, it re-arms itself while changes keep coming
+        self._last_change = time.monotonic()
+        if self._timer is None:
+            self._start_timer(self._flush_interval)
+
+    def _start_timer(self, delay: float) -> None:
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            remaining = self._last_change + self._flush_interval - time.monotonic()
+            if remaining > 0 and self._dirty:
+                self._start_timer(remaining)
+                return
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending write-behind changes now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._save()
+            self._dirty = 0
+            _pending.pop(id(self), None)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def __enter__(self) -> "DictWithAutosave":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    # ANCHOR dict overrides
     def __setitem__(self, key: str, value: Any) -> None:
         """Override setitem to auto-save on changes."""
-        self._check_and_reload()
-        super().__setitem__(key, value)
-        self._save()
+        with self._lock:
+            self._before_change()
+            super().__setitem__(key, value)
+            self._after_change(["set", key, value])
 
     def __delitem__(self, key: str) -> None:
         """Override delitem to auto-save on changes."""
-        self._check_and_reload()
-        super().__delitem__(key)
-        self._save()
+        with self._lock:
+            self._before_change()
+            super().__delitem__(key)
+            self._after_change(["del", key])
 
     def update(self, *args, **kwargs) -> None:
         """Override update to auto-save on changes."""
-        self._check_and_reload()
-        super().update(*args, **kwargs)
-        self._save()
+        with self._lock:
+            self._before_change()
+            changes = dict(*args, **kwargs)
+            super().update(changes)
+            self._after_change(["update", changes])
 
     def clear(self) -> None:
         """Override clear to auto-save on changes."""
-        self._check_and_reload()
-        super().clear()
-        self._save()
+        with self._lock:
+            self._before_change()
+            super().clear()
+            self._after_change(["clear"])
 
     def pop(self, key: str, default: Any = None) -> Any:
         """Override pop to auto-save on changes."""
-        self._check_and_reload()
-        result = super().pop(key, default)
-        self._save()
-        return result
+        with self._lock:
+            self._before_change()
+            result = super().pop(key, default)
+            self._after_change(["del", key])
+            return result
 
     def popitem(self) -> tuple:
         """Override popitem to auto-save on changes."""
-        self._check_and_reload()
-        result = super().popitem()
-        self._save()
-        return result
+        with self._lock:
+            self._before_change()
+            result = super().popitem()
+            self._after_change(["del", result[0]])
+            return result
@@ -1,6 +1,78 @@
+import threading
+import time
+import weakref
 from datetime import datetime
 from .util_timeparse import time_parse
 
+_MISSING = object()
+
+
+def _expiry_func(duration):
+    """
+    Parse duration once, returns a function giving the next expiry as a time.monotonic() deadline.
+
+    Durations that are a fixed offset ("5m", "1h30m", 90) are resolved to seconds here,
+    cron expressions and dates still go through time_parse on every refresh.
+    """
+    first = datetime(2001, 1, 1)
+    second = datetime(2001, 1, 1, 0, 0, 7, 1234)
+    delta = time_parse(duration, relative=first) - first
+
+    if time_parse(duration, relative=second) - second == delta:
+        seconds = delta.total_seconds()
+        return lambda: time.monotonic() + seconds
+
+    # the expiry depends on the wall clock
+    return lambda: time.monotonic() + (time_parse(duration) - datetime.now()).total_seconds()
+
+
+class _Entry:
+    """cached value of one instance (or class), the lock makes refreshes single-flight"""
+
+    __slots__ = ("value", "expires", "lock")
+
+    def __init__(self):
+        self.value = _MISSING
+        self.expires = 0.0
+        self.lock = threading.Lock()
+
+
+def _refresh(entry, compute, expiry):
+    entry.value = compute()
+    entry.expires = expiry()
+
+
+def _background_refresh(entry, compute, expiry):
+    # entry.lock is held by the caller and released here
+    try:
+        _refresh(entry, compute, expiry)
+    except Exception:
+        # keep serving the stale value, the next access tries again
+        pass
+    finally:
+        entry.lock.release()
+
+
+def _cached_get(entry, compute, expiry, stale_while_revalidate):
+    value = entry.value
+    if value is not _MISSING and time.monotonic() < entry.expires:
+        return value
+
+    if stale_while_revalidate and value is not _MISSING:
+        # only one refresh at a time, everyone else gets the stale value
+        if entry.lock.acquire(blocking=False):
+            threading.Thread(
+                target=_background_refresh, args=(entry, compute, expiry), daemon=True
+            ).start()
+        return value
+
+    with entry.lock:
+        # another thread may have refreshed it while we waited
+        if entry.value is not _MISSING and time.monotonic() < entry.expires:
+            return entry.value
+        _refresh(entry, compute, expiry)
+        return entry.value
+
 
 class timedProperty:
     """
@@ -8,38 +80,46 @@ class timedProperty:
 
     Args:
         duration: Time duration string (e.g. "5m", "1h", "30s") parsed by time_parse
+        stale_while_revalidate: Return the expired value and refresh it in a background thread
 
-    The cached value and expiry time are stored in the descriptor rather than on the instance.
+    Every instance caches its own value. Concurrent accesses to an expired value
+    wait for a single call of the getter instead of each calling it.
+    Instances without a __dict__ (__slots__) are kept in a weak mapping on the
+    descriptor and need a __weakref__ slot.
     """
 
-    def __init__(self, duration: str):
+    def __init__(self, duration: str, stale_while_revalidate: bool = False):
         self.duration = duration
+        self.stale_while_revalidate = stale_while_revalidate
         self.name = None
-        self._cached_value = None
-        self._expiry_time = None
+        self._expiry = _expiry_func(duration)
+        self._entries = weakref.WeakKeyDictionary()
+        self._entries_lock = threading.Lock()
 
     def __call__(self, func):
         self.func = func
         self.name = func.__name__
+        self._key = f"_timedProperty_{self.name}"
         return self
 
     def __get__(self, obj, objtype=None):
         if obj is None:
             return self
 
-        # Check if cache is valid
-        now = datetime.now()
-        if (
-            self._cached_value is None
-            or self._expiry_time is None
-            or now >= self._expiry_time
-        ):
-            # Cache miss - compute new value and expiry
-            self._cached_value = self.func(obj)
-            self._expiry_time = time_parse(self.duration)
+        namespace = getattr(obj, "__dict__", None)
+        if namespace is None:
+            entry = self._entries.get(obj)
+            if entry is None:
+                with self._entries_lock:
+                    entry = self._entries.setdefault(obj, _Entry())
+        else:
+            entry = namespace.get(self._key)
+            if entry is None:
+                entry = namespace.setdefault(self._key, _Entry())
 
-        # Return cached value
-        return self._cached_value
+        return _cached_get(
+            entry, lambda: self.func(obj), self._expiry, self.stale_while_revalidate
+        )
 
 
 class timedClassProperty(object):
@@ -47,45 +127,50 @@ class timedClassProperty(object):
     A descriptor that creates a class-level property that expires after the specified duration.
 
     Similar to timed_property but works at the class level rather than instance level.
-    The cached value and expiry time are stored in the descriptor rather than on the class.
+    Every class (subclasses included) caches its own value.
     """
 
-    def __init__(self, fget, duration, fset=None):
+    def __init__(self, fget, duration, fset=None, stale_while_revalidate: bool = False):
         """
         Args:
             fget: Getter function
             duration: Time duration string (e.g. "5m", "1h", "30s") parsed by time_parse
             fset: Optional setter function
+            stale_while_revalidate: Return the expired value and refresh it in a background thread
         """
         self.fget = fget
         self.fset = fset
         self.duration = duration
-        self._cached_value = None
-        self._expiry_time = None
+        self.stale_while_revalidate = stale_while_revalidate
+        self._expiry = _expiry_func(duration)
+        self._entries = weakref.WeakKeyDictionary()
+        self._entries_lock = threading.Lock()
+
+    def _entry(self, klass):
+        entry = self._entries.get(klass)
+        if entry is None:
+            with self._entries_lock:
+                entry = self._entries.setdefault(klass, _Entry())
+        return entry
 
     def __get__(self, obj, klass=None):
         if klass is None:
             klass = type(obj)
 
-        # Check if cache is valid
-        now = datetime.now()
-        if (
-            self._cached_value is None
-            or self._expiry_time is None
-            or now >= self._expiry_time
-        ):
-            # Cache miss - compute new value and expiry
-            self._cached_value = self.fget.__get__(obj, klass)()
-            self._expiry_time = time_parse(self.duration)
-
-        return self._cached_value
+        return _cached_get(
+            self._entry(klass),
+            lambda: self.fget.__get__(obj, klass)(),
+            self._expiry,
+            self.stale_while_revalidate,
+        )
 
     def __set__(self, obj, value):
         if not self.fset:
             raise AttributeError("can't set attribute")
         type_ = type(obj)
-        self._cached_value = self.fset.__get__(obj, type_)(value)
-        self._expiry_time = time_parse(self.duration)
+        entry = self._entry(type_)
+        with entry.lock:
+            _refresh(entry, lambda: self.fset.__get__(obj, type_)(value), self._expiry)
 
     def setter(self, func):
         if not isinstance(func, (classmethod, staticmethod)):
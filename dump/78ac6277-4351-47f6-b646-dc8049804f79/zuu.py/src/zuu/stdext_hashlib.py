@@ -1,23 +1,183 @@
 import hashlib
-from zuu.util_file import iter_by_chunk
+import json
+import mmap
+import os
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from zuu.util_file import atomic_write
 
+# read size of the chunked hashers, hashlib releases the GIL for updates this large
+CHUNK_SIZE = 1 << 20
 
-def sha256_by_chunk(path: str):
-    hash = hashlib.sha256()
-    for chunk in iter_by_chunk(path):
-        hash.update(chunk)
-    return hash.hexdigest()
-
+# files at least this large are hashed through a memory map instead of reads
+MMAP_THRESHOLD = 64 << 20
 
-def md5_by_chunk(path: str):
-    hash = hashlib.md5()
-    for chunk in iter_by_chunk(path):
-        hash.update(chunk)
-    return hash.hexdigest()
+# a file modified this recently may still change within the same mtime tick,
+# its digest is not cached
+_RACY_NS = 2_000_000_000
 
 
-def hash_by_chunk(path: str, hash_type: str):
+def _hash_fd(f, hash_type: str, size: int, chunk_size: int) -> str:
     hash = hashlib.new(hash_type)
-    for chunk in iter_by_chunk(path):
-        hash.update(chunk)
+
+    if size >= MMAP_THRESHOLD:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for offset in range(0, size, chunk_size):
+                    hash.update(view[offset : offset + chunk_size])
+            finally:
+                view.release()
+        return hash.hexdigest()
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        read = f.readinto(buffer)
+        if not read:
+            break
+        hash.update(view[:read])
     return hash.hexdigest()
+
+
+class HashCache:
+    """
+    Persistent (path, size, mtime) -> digest cache.
+
+    Entries are kept in a JSON file, ``save()`` writes it atomically and
+    leaving a ``with`` block saves it. A digest is reused as long as the file
+    keeps its size and mtime.
+    """
+
+    def __init__(self, path: typing.Optional[str] = None):
+        """
+        Args:
+            path (str, optional): JSON file the cache is loaded from and saved to, in memory only if None
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: typing.Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except ValueError:
+                # a broken cache only costs rehashing
+                self._entries = {}
+
+    @staticmethod
+    def _key(path: str, hash_type: str) -> str:
+        return f"{hash_type}:{os.path.abspath(path)}"
+
+    def get(self, path: str, hash_type: str, stat: os.stat_result) -> typing.Optional[str]:
+        entry = self._entries.get(self._key(path, hash_type))
+        with self._lock:
+            if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def set(self, path: str, hash_type: str, stat: os.stat_result, digest: str) -> None:
+        if stat.st_mtime_ns > time.time_ns() - _RACY_NS:
+            return
+        with self._lock:
+            self._entries[self._key(path, hash_type)] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._dirty = True
+
+    def prune(self) -> int:
+        """Drop entries of files that no longer exist, returns how many were dropped."""
+        with self._lock:
+            missing = [key for key in self._entries if not os.path.exists(key.split(":", 1)[1])]
+            for key in missing:
+                del self._entries[key]
+            self._dirty = self._dirty or bool(missing)
+        return len(missing)
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            data = json.dumps(self._entries)
+            self._dirty = False
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        atomic_write(self.path, data)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save()
+
+
+def hash_file(
+    path: str,
+    hash_type: str = "sha256",
+    chunk_size: int = CHUNK_SIZE,
+    cache: typing.Optional[HashCache] = None,
+) -> str:
+    """
+    Hex digest of a file, read in chunk_size blocks or through a memory map for large files.
+
+    Args:
+        path (str): The file to hash
+        hash_type (str): Any name hashlib.new accepts
+        chunk_size (int): Bytes handed to the hash per update
+        cache (HashCache, optional): Reuse the digest while the file keeps its size and mtime
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        if cache is not None:
+            digest = cache.get(path, hash_type, stat)
+            if digest is not None:
+                return digest
+
+        digest = _hash_fd(f, hash_type, stat.st_size, chunk_size)
+
+    if cache is not None:
+        cache.set(path, hash_type, stat, digest)
+    return digest
+
+
+def hash_many(
+    paths: typing.Iterable[str],
+    hash_type: str = "sha256",
+    workers: typing.Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    cache: typing.Optional[HashCache] = None,
+) -> typing.Dict[str, str]:
+    """
+    Hash files on a thread pool, returns {path: digest} in the order of paths.
+
+    Args:
+        paths: Files to hash
+        hash_type (str): Any name hashlib.new accepts
+        workers (int, optional): Threads hashing at once, the ThreadPoolExecutor default if None
+        chunk_size (int): Bytes handed to the hash per update
+        cache (HashCache, optional): Only files whose size or mtime changed are read
+    """
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = pool.map(lambda path: hash_file(path, hash_type, chunk_size, cache), paths)
+        return dict(zip(paths, digests))
+
+
+def sha256_by_chunk(path: str, chunk_size: int = CHUNK_SIZE):
+    return hash_file(path, "sha256", chunk_size)
+
+
+def md5_by_chunk(path: str, chunk_size: int = CHUNK_SIZE):
+    return hash_file(path, "md5", chunk_size)
+
+
+def hash_by_chunk(path: str, hash_type: str, chunk_size: int = CHUNK_SIZE):
+    return hash_file(path, hash_type, chunk_size)
@@ -1,6 +1,11 @@
+import asyncio
+import functools
 import json
+import os
+import shutil
 import subprocess
-import platform
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 __all__ = [
     "execute",
@@ -8,6 +13,10 @@ __all__ = [
     "query_bytes",
     "query_string",
     "query_json",
+    "aquery_bytes",
+    "aquery_string",
+    "aquery_json",
+    "query_many",
 ]
 
 
@@ -49,6 +58,7 @@ def execute(path: str, *args) -> subprocess.Popen:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def check_is_installed(app_name: str) -> bool:
     """
     Check if an application is installed on the operating system.
@@ -59,58 +69,21 @@ def check_is_installed(app_name: str) -> bool:
     Returns:
         bool: True if the application is installed, False otherwise.
 
-    This function checks if an application is installed on the operating system by using the appropriate command for the operating system.
+    This function looks the application up on PATH with `shutil.which`, which
+    honours PATHEXT on Windows, so no 'where' or 'which' process is spawned.
 
-    On Windows, it uses the 'where' command to check for the app existence.
-
-    On macOS, it uses the 'type' command or 'which' command to check for the app existence.
-
-    On Linux, it uses the 'which' command to check for the app existence.
-
-    If the command succeeds, the application is considered installed and the function returns True.
-
-    If the command fails, the application is considered not installed and the function returns False.
-
-    If the operating system is not Windows, macOS, or Linux, the function returns False.
+    The answer is cached per app_name, call `check_is_installed.cache_clear()`
+    after installing or removing an application.
     """
-
-    os_type = platform.system()
-
-    try:
-        if os_type == "Windows":
-            # On Windows, use 'where' command to check for the app existence
-            subprocess.check_call(
-                ["where", app_name],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        elif os_type == "Darwin":
-            # On macOS, use 'type' command or 'which'
-            subprocess.check_call(
-                ["type", app_name],
-                shell=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        elif os_type == "Linux":
-            # On Linux, use 'which' command
-            subprocess.check_call(
-                ["which", app_name],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        else:
-            return False
-    except subprocess.CalledProcessError:
-        # The command failed, the application is not installed
-        return False
-
-    # The command succeeded, the application is installed
-    return True
+    return shutil.which(app_name) is not None
 
 
 DEFAULT_QUERY_TIMEOUT = 5
 
+# how many aquery_* processes run at once per event loop, and the default
+# number of workers of query_many
+MAX_CONCURRENT_QUERIES = os.cpu_count() or 4
+
 
 def query_bytes(
     path: str,
@@ -186,3 +159,128 @@ def query_json(
         dict: The parsed JSON data from the subprocess output.
     """
     return json.loads(query_string(path, *args, timeout=timeout))
+
+
+# ANCHOR async
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _limiter() -> asyncio.Semaphore:
+    # semaphores belong to one event loop, each loop gets its own
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+    return limiter
+
+
+async def aquery_bytes(
+    path: str,
+    *args,
+    timeout: int = None,
+    limiter: asyncio.Semaphore = None,
+):
+    """
+    Async version of `query_bytes`.
+
+    At most `MAX_CONCURRENT_QUERIES` processes started by the aquery_* functions
+    run at once in an event loop, pass a semaphore as `limiter` to use a separate limit.
+
+    Raises:
+        subprocess.TimeoutExpired: If the subprocess takes longer than the specified timeout to complete,
+            the subprocess is killed.
+
+    Returns:
+        bytes: The captured output of the subprocess.
+    """
+    timeout = timeout or DEFAULT_QUERY_TIMEOUT
+    command = [path, *(str(arg) for arg in args)]
+
+    async with limiter or _limiter():
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise subprocess.TimeoutExpired(command, timeout)
+
+    return stdout
+
+
+async def aquery_string(
+    path: str,
+    *args,
+    timeout: int = None,
+    strip: bool = False,
+    limiter: asyncio.Semaphore = None,
+):
+    """
+    Async version of `query_string`, see `aquery_bytes`.
+
+    Returns:
+        str: The captured output of the subprocess as a string.
+    """
+    raw = await aquery_bytes(path, *args, timeout=timeout, limiter=limiter)
+    return raw.decode("utf-8").strip() if strip else raw.decode("utf-8")
+
+
+async def aquery_json(
+    path: str,
+    *args,
+    timeout: int = None,
+    limiter: asyncio.Semaphore = None,
+):
+    """
+    Async version of `query_json`, see `aquery_bytes`.
+
+    Returns:
+        dict: The parsed JSON data from the subprocess output.
+    """
+    return json.loads(await aquery_string(path, *args, timeout=timeout, limiter=limiter))
+
+
+# ANCHOR batch
+def query_many(
+    commands,
+    func=query_bytes,
+    workers: int = None,
+    return_exceptions: bool = False,
+    **kwargs,
+) -> list:
+    """
+    Runs many queries on a bounded thread pool.
+
+    Args:
+        commands: Iterable of commands, each a sequence of the executable path and its arguments.
+        func: The query function every command is run with, e.g. `query_string` or `query_json`.
+        workers (int, optional): Number of queries running at once, `MAX_CONCURRENT_QUERIES` by default.
+        return_exceptions (bool): Put raised exceptions into the results instead of raising the first one.
+        **kwargs: Passed on to `func`, e.g. `timeout` or `strip`.
+
+    Returns:
+        list: The results, in the order of `commands`.
+
+    Example:
+        ```python
+        query_many([["git", "-C", repo, "rev-parse", "HEAD"] for repo in repos], query_string, strip=True)
+        ```
+    """
+
+    def run(command):
+        try:
+            return func(*command, **kwargs)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return e
+
+    with ThreadPoolExecutor(max_workers=workers or MAX_CONCURRENT_QUERIES) as pool:
+        return list(pool.map(run, commands))
@@ -1,7 +1,17 @@
+import collections as _collections
+import csv as _csv
+import functools as _functools
+import importlib as _importlib
+import io as _io
+import json as _json
+import mmap as _mmap
 import os as _os
+import pickle as _pickle
+import shutil as _shutil
 import stat as _stat
 import typing as _typing
 import re as _re
+import uuid as _uuid
 
 
 # reading
@@ -66,6 +76,8 @@ def determine_file_type(path: str):
     match path_extension:
         case ".json":
             return "json"
+        case ".jsonl" | ".ndjson":
+            return "jsonl"
         case ".yaml" | ".yml":
             return "yaml"
         case ".toml":
@@ -76,74 +88,314 @@ def determine_file_type(path: str):
             return "csv"
         case ".pickle" | ".pkl":
             return "pickle"
+        case ".msgpack" | ".mpk":
+            return "msgpack"
         case _:
             return "plain"
 
 
-deserialize_methods = {
-    "json": lambda x: __import__("json").loads(x),
-    "yaml": lambda x: __import__("yaml").safe_load(x),
-    "toml": lambda x: __import__("toml").loads(x),
-    "xml": lambda x: __import__("xml.etree.ElementTree").fromstring(x),
-    "csv": lambda x: __import__("csv").reader(x),
-    "pickle": lambda x: __import__("pickle").loads(x),
-}
+@_functools.lru_cache(maxsize=None)
+def _optional_import(name: str):
+    try:
+        return _importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _as_text(data) -> str:
+    if isinstance(data, str):
+        return data
+    return bytes(data).decode("utf-8")
+
+
+class Codec:
+    """
+    One serialization format.
+
+    Args:
+        name: File type name, as returned by determine_file_type
+        loads: Parses str (or bytes when binary) into an object
+        dumps: Serializes an object to str or bytes, takes serializer kwargs
+        binary: The format is bytes on disk, loads gets bytes and dumps returns bytes
+        buffers: loads also accepts bytes-like objects (bytes, memoryview of an mmap)
+        iterload: Yields records from an open text file (streaming readers)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loads: _typing.Callable[[_typing.Any], _typing.Any],
+        dumps: _typing.Callable[..., _typing.Union[str, bytes]],
+        binary: bool = False,
+        buffers: bool = False,
+        iterload: _typing.Optional[_typing.Callable[[_typing.IO], _typing.Iterator]] = None,
+    ):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.binary = binary
+        self.buffers = binary or buffers
+        self.iterload = iterload
+
+    def __repr__(self):
+        return f"Codec({self.name!r})"
+
+
+# json: orjson parses when installed. serializing stays with json.dumps, whose
+# output orjson does not reproduce (floats, NaN, ascii escapes), unless the
+# caller passes orjson's own option= kwarg
+def _json_loads(data):
+    orjson = _optional_import("orjson")
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN / Infinity literals, which only json.loads accepts
+            pass
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return _json.loads(data)
+
+
+def _json_dumps(data, **kwargs):
+    if "option" in kwargs:
+        return _importlib.import_module("orjson").dumps(data, **kwargs)
+    return _json.dumps(data, **kwargs)
+
+
+def _jsonl_iterload(f):
+    for line in f:
+        if line.strip():
+            yield _json_loads(line)
+
+
+def _jsonl_loads(data):
+    return list(_jsonl_iterload(_io.StringIO(_as_text(data))))
+
+
+def _jsonl_dumps(data, **kwargs):
+    lines = []
+    for item in data:
+        line = _json_dumps(item, **kwargs)
+        lines.append(line.decode("utf-8") if isinstance(line, bytes) else line)
+    return "".join(line + "\n" for line in lines)
+
+
+# yaml: libyaml bindings when pyyaml was built with them
+def _yaml_loads(data):
+    yaml = _importlib.import_module("yaml")
+    return yaml.load(data, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _yaml_dumps(data, **kwargs):
+    yaml = _importlib.import_module("yaml")
+    kwargs.setdefault("Dumper", getattr(yaml, "CDumper", yaml.Dumper))
+    return yaml.dump(data, **kwargs)
+
+
+def _toml_loads(data):
+    tomllib = _optional_import("tomllib")
+    if tomllib is not None:
+        return tomllib.loads(_as_text(data))
+    return _importlib.import_module("toml").loads(_as_text(data))
+
+
+def _toml_dumps(data, **kwargs):
+    return _importlib.import_module("toml").dumps(data, **kwargs)
+
+
+def _xml_loads(data):
+    return _importlib.import_module("xml.etree.ElementTree").fromstring(data)
+
+
+def _xml_dumps(data, **kwargs):
+    kwargs.setdefault("encoding", "unicode")
+    return _importlib.import_module("xml.etree.ElementTree").tostring(data, **kwargs)
+
+
+def _csv_iterload(f):
+    yield from _csv.reader(f)
+
+
+def _csv_loads(data):
+    return list(_csv.reader(_io.StringIO(_as_text(data))))
+
+
+def _csv_dumps(data, **kwargs):
+    buffer = _io.StringIO(newline="")
+    _csv.writer(buffer, **kwargs).writerows(data)
+    return buffer.getvalue()
+
+
+def _pickle_loads(data):
+    return _pickle.loads(data)
+
+
+def _pickle_dumps(data, **kwargs):
+    return _pickle.dumps(data, **kwargs)
+
+
+def _msgpack_loads(data):
+    return _importlib.import_module("msgpack").unpackb(data)
+
+
+def _msgpack_dumps(data, **kwargs):
+    return _importlib.import_module("msgpack").packb(data, **kwargs)
+
+
+codecs: _typing.Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec):
+    """
+    Add or replace the codec for codec.name, used by load/save/serialize/deserialize.
+    """
+    codecs[codec.name] = codec
+    deserialize_methods[codec.name] = codec.loads
+    serialize_methods[codec.name] = codec.dumps
+
+
+def get_codec(file_type: str) -> Codec:
+    if file_type not in codecs:
+        raise ValueError(f"Unsupported file type: {file_type}")
+    return codecs[file_type]
+
+
+# name -> callable views of the registry, kept for existing callers
+deserialize_methods = {}
+serialize_methods = {}
+
+for _codec in (
+    Codec("json", _json_loads, _json_dumps, buffers=True),
+    Codec("jsonl", _jsonl_loads, _jsonl_dumps, buffers=True, iterload=_jsonl_iterload),
+    # yaml only takes str, bytes or a stream, never a memoryview
+    Codec("yaml", _yaml_loads, _yaml_dumps),
+    Codec("toml", _toml_loads, _toml_dumps),
+    Codec("xml", _xml_loads, _xml_dumps, buffers=True),
+    Codec("csv", _csv_loads, _csv_dumps, iterload=_csv_iterload),
+    Codec("pickle", _pickle_loads, _pickle_dumps, binary=True),
+    Codec("msgpack", _msgpack_loads, _msgpack_dumps, binary=True),
+):
+    register_codec(_codec)
+del _codec
 
 
 def deserialize(
     data: str,
     file_type: str,
-    deserialize_methods: dict = deserialize_methods,
+    deserialize_methods: dict = None,
 ):
     if file_type == "plain":
         return data
 
-    if file_type not in deserialize_methods:
-        raise ValueError(f"Unsupported file type: {file_type}")
+    if deserialize_methods is not None:
+        if file_type not in deserialize_methods:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        return deserialize_methods[file_type](data)
 
-    return deserialize_methods[file_type](data)
-
-
-serialize_methods = {
-    "json": lambda x, **kwargs: __import__("json").dumps(x, **kwargs),
-    "yaml": lambda x, **kwargs: __import__("yaml").dump(x, **kwargs),
-    "toml": lambda x, **kwargs: __import__("toml").dumps(x, **kwargs),
-    "xml": lambda x, **kwargs: __import__("xml.etree.ElementTree").tostring(x, **kwargs),
-    "csv": lambda x, **kwargs: __import__("csv").writer(x, **kwargs),
-    "pickle": lambda x, **kwargs: __import__("pickle").dumps(x, **kwargs),
-}
+    return get_codec(file_type).loads(data)
 
 
 def serialize(
     data: any,
     file_type: str,
-    serialize_methods: dict = serialize_methods,
+    serialize_methods: dict = None,
     **kwargs
 ):
     if file_type == "plain":
         return data
 
-    if file_type not in serialize_methods:
-        raise ValueError(f"Unsupported file type: {file_type}")
+    if serialize_methods is not None:
+        if file_type not in serialize_methods:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        return serialize_methods[file_type](data, **kwargs)
 
-    return serialize_methods[file_type](data, **kwargs)
+    result = get_codec(file_type).dumps(data, **kwargs)
+    if isinstance(result, bytes) and not get_codec(file_type).binary:
+        return result.decode("utf-8")
+    return result
 
 
 def load(
     path: str,
     encoding: str = "utf-8",
     auto_deserialize: bool = True,
+    use_mmap: bool = False,
 ):
+    """
+    Read a file and deserialize it by its extension.
+
+    Binary formats (pickle, msgpack) are read as bytes. With use_mmap, codecs
+    that take buffers parse straight from a memory map of the file.
+    """
     if not _os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
 
-    file_data = open(path, "r", encoding=encoding).read()
+    file_type = determine_file_type(path) if auto_deserialize else "plain"
+    if file_type == "plain":
+        with open(path, "r", encoding=encoding) as f:
+            return f.read()
+
+    codec = get_codec(file_type)
+    raw = codec.binary or (codec.buffers and encoding.replace("-", "").lower() == "utf8")
+    if not raw:
+        with open(path, "r", encoding=encoding) as f:
+            return codec.loads(f.read())
 
-    if auto_deserialize:
-        file_type = determine_file_type(path)
-        return deserialize(file_data, file_type)
+    with open(path, "rb") as f:
+        if use_mmap and _os.fstat(f.fileno()).st_size > 0:
+            with _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return codec.loads(view)
+                finally:
+                    view.release()
+        return codec.loads(f.read())
+
+
+def iter_load(path: str, encoding: str = "utf-8") -> _typing.Iterator:
+    """
+    Stream records (csv rows, jsonl objects) without reading the whole file.
+    """
+    codec = get_codec(determine_file_type(path))
+    if codec.iterload is None:
+        raise ValueError(f"File type {codec.name} does not support streaming")
+
+    with open(path, "r", encoding=encoding, newline="") as f:
+        yield from codec.iterload(f)
+
+
+def atomic_write(path: str, data: _typing.Union[str, bytes], encoding: str = "utf-8"):
+    """
+    Write data to a temporary file next to path and rename it over path, so
+    readers never see a partially written file. A symlinked path keeps the
+    link and replaces the file it points to.
+    """
+    path = _os.path.realpath(path)
+    directory = _os.path.dirname(_os.path.abspath(path))
+    tmp_path = _os.path.join(
+        directory, f".{_os.path.basename(path)}.{_uuid.uuid4().hex[:8]}.tmp"
+    )
+
+    try:
+        if isinstance(data, str):
+            with open(tmp_path, "x", encoding=encoding, newline="") as f:
+                f.write(data)
+                f.flush()
+                _os.fsync(f.fileno())
+        else:
+            with open(tmp_path, "xb") as f:
+                f.write(data)
+                f.flush()
+                _os.fsync(f.fileno())
 
-    return file_data
+        if _os.path.exists(path):
+            _shutil.copymode(path, tmp_path)
+        _os.replace(tmp_path, path)
+    except BaseException:
+        if _os.path.exists(tmp_path):
+            _os.remove(tmp_path)
+        raise
 
 
 def save(
@@ -151,15 +403,28 @@ def save(
     path: str,
     file_type: str | None = None,
     encoding: str = "utf-8",
+    atomic: bool = True,
     **kwargs
 ):
     if file_type is None:
         file_type = determine_file_type(path)
 
-    serialized_data = serialize(data, file_type, **kwargs)
-
-    with open(path, "w", encoding=encoding) as f:
-        f.write(serialized_data)
+    if file_type == "plain":
+        serialized_data = data
+    else:
+        serialized_data = get_codec(file_type).dumps(data, **kwargs)
+        if isinstance(serialized_data, bytes) and not get_codec(file_type).binary:
+            if encoding.replace("-", "").lower() != "utf8":
+                serialized_data = serialized_data.decode("utf-8")
+
+    if atomic:
+        atomic_write(path, serialized_data, encoding)
+    elif isinstance(serialized_data, str):
+        with open(path, "w", encoding=encoding) as f:
+            f.write(serialized_data)
+    else:
+        with open(path, "wb") as f:
+            f.write(serialized_data)
 
 
 def touch(
@@ -182,6 +447,139 @@ def touch(
 
 
 #!SECTION
+def _compile_globs(patterns: _typing.Iterable[str]) -> _typing.Optional[_re.Pattern]:
+    """
+    Compile ``*`` patterns into one alternation, matching like any of them would.
+    """
+    regexes = [_re.escape(pattern).replace(r"\*", ".*") for pattern in patterns]
+    if not regexes:
+        return None
+    return _re.compile("|".join(f"(?:{regex})" for regex in regexes))
+
+
+def _scan_dir(path: str) -> list[tuple[str, bool]]:
+    try:
+        with _os.scandir(path) as it:
+            entries = []
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((entry.path, is_dir))
+            return entries
+    except PermissionError:
+        return []
+
+
+class _PathMatcher:
+    """
+    Matches paths against compiled patterns, by basename or by the path
+    relative to ``root`` in unix style.
+    """
+
+    def __init__(self, root: str, pattern: _re.Pattern):
+        self.root = root
+        self.prefix = root if root.endswith(_os.sep) else root + _os.sep
+        self.pattern = pattern
+
+    def relpath(self, path: str) -> str:
+        if path.startswith(self.prefix):
+            rel_path = path[len(self.prefix) :]
+        else:
+            rel_path = _os.path.relpath(path, self.root)
+        return rel_path.replace(_os.sep, "/")
+
+    def __call__(self, path: str) -> bool:
+        search = self.pattern.search
+        return bool(search(self.relpath(path)) or search(_os.path.basename(path)))
+
+
+def iter_scan_pathes(
+    pathes: list[str],
+    depth: int = 1,
+    workers: int = 0,
+    exclude: _typing.Optional[_typing.List[str]] = None,
+) -> _typing.Iterator[str]:
+    """
+    Walk directories with ``os.scandir`` and yield every path up to the specified depth.
+
+    Args:
+        pathes: List of root directories to scan
+        depth: Search depth:
+            - 0: Only yield the root directories themselves
+            - 1: Yield immediate children (default)
+            - 2: Yield children and grandchildren
+            - -1: Unlimited depth
+        workers: Scan directories on a thread pool of this size (for network or
+            slow disks). Paths are then yielded as they are found instead of in
+            breadth first order.
+        exclude: Patterns (*pattern syntax) of paths to skip, matching
+            directories are not descended into.
+    """
+    if depth == 0:
+        yield from pathes
+        return
+
+    roots = [_os.path.abspath(path) for path in pathes]
+
+    keep = None
+    excluded = _compile_globs(exclude or [])
+    if excluded is not None and roots:
+        matcher = _PathMatcher(_os.path.commonpath(roots), excluded)
+
+        def keep(path):
+            return not matcher(path)
+
+    if workers:
+        yield from _iter_scan_parallel(roots, depth, workers, keep)
+        return
+
+    queue = _collections.deque()
+    for root in roots:
+        yield root
+        if _os.path.isdir(root):
+            queue.append((root, 1))
+
+    while queue:
+        current_path, current_depth = queue.popleft()
+        descend = depth == -1 or current_depth < depth
+
+        for path, is_dir in _scan_dir(current_path):
+            if keep is not None and not keep(path):
+                continue
+            yield path
+            if is_dir and descend:
+                queue.append((path, current_depth + 1))
+
+
+def _iter_scan_parallel(roots: list[str], depth: int, workers: int, keep):
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    try:
+        for root in roots:
+            yield root
+            if _os.path.isdir(root):
+                pending[pool.submit(_scan_dir, root)] = 1
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                current_depth = pending.pop(future)
+                descend = depth == -1 or current_depth < depth
+
+                for path, is_dir in future.result():
+                    if keep is not None and not keep(path):
+                        continue
+                    yield path
+                    if is_dir and descend:
+                        pending[pool.submit(_scan_dir, path)] = current_depth + 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def scan_pathes(pathes: list[str], depth: int = 1) -> list[str]:
     """
     Scan directories and return a list of all paths up to the specified depth.
@@ -194,37 +592,38 @@ def scan_pathes(pathes: list[str], depth: int = 1) -> list[str]:
             - 2: Match children and grandchildren
             - -1: Unlimited depth
     """
-
     if depth == 0:
         return pathes
 
-    results = []
-    queue = []
+    return list(iter_scan_pathes(pathes, depth))
 
-    # Initialize queue with root directories and depth 0
-    for path in pathes:
-        abs_path = _os.path.abspath(path)
-        queue.append((abs_path, 0))
-
-    while queue:
-        current_path, current_depth = queue.pop(0)
 
-        # Skip if we're beyond depth limit (unless depth is -1)
-        if depth != -1 and current_depth > depth:
-            continue
+def iter_path_match(
+    pathes: list[str],
+    matches: _typing.List[str],
+    depth: int = 1,
+    workers: int = 0,
+    exclude: _typing.Optional[_typing.List[str]] = None,
+) -> _typing.Iterator[str]:
+    """
+    Streaming :func:`path_match`, yields matches while the walk is running.
 
-        results.append(current_path)
+    ``workers`` and ``exclude`` are passed to :func:`iter_scan_pathes`.
+    """
+    if not pathes:
+        return
 
-        # Process children if within depth limit and is directory
-        if _os.path.isdir(current_path) and (depth == -1 or current_depth < depth):
-            try:
-                for entry in _os.listdir(current_path):
-                    full_path = _os.path.join(current_path, entry)
-                    queue.append((full_path, current_depth + 1))
-            except PermissionError:
-                continue
+    # every scanned path lies below the roots, so their common path is the
+    # common path of the whole result
+    roots = pathes if depth == 0 else [_os.path.abspath(path) for path in pathes]
+    pattern = _compile_globs(matches)
+    if pattern is None:
+        return
 
-    return results
+    matcher = _PathMatcher(_os.path.commonpath(roots), pattern)
+    for path in iter_scan_pathes(roots, depth, workers=workers, exclude=exclude):
+        if matcher(path):
+            yield path
 
 
 def path_match(
@@ -242,30 +641,7 @@ def path_match(
             - 2: Match children and grandchildren
             - -1: Unlimited depth
     """
-    # Get all paths within depth limit first
-    eligible_pathes = scan_pathes(pathes, depth)
-
-    # Compile patterns only once
-    compiled = []
-    for pattern in matches:
-        regex = _re.escape(pattern).replace(r"\*", ".*")
-        compiled.append(_re.compile(regex))
-
-    # Match against eligible paths
-    results = []
-    common_root = _os.path.commonpath(eligible_pathes) if eligible_pathes else ""
-    for path in eligible_pathes:
-        # Normalize paths to Unix-style for pattern matching
-        base_name = _os.path.basename(path)
-        rel_path = _os.path.relpath(path, common_root).replace(_os.sep, "/")
-
-        # Check against all patterns
-        for pattern in compiled:
-            if pattern.search(rel_path) or pattern.search(base_name):
-                results.append(path)
-                break
-
-    return results
+    return list(iter_path_match(pathes, matches, depth))
 
 
 def listdir_match(path: str, matches: _typing.List[str], depth: int = 0) -> list[str]:
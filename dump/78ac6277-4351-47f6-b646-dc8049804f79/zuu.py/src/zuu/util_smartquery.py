@@ -1,6 +1,10 @@
-import json
+import ast
+import operator
 import re
+import threading
+import time
 import typing
+from collections import OrderedDict
 
 nlp_like = {
     "(\\w+) contains (\\w+)": 'CONTAINS(\\1, "\\2")',
@@ -126,9 +130,414 @@ def _collapse_spaces(query: str):
     return "".join(new_query)
 
 
+class _Unsupported(Exception):
+    pass
+
+
+# names a compiled query may call besides funcs_maps, everything else is a record field
+_safe_builtins = {
+    "len": len,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "any": any,
+    "all": all,
+    "sorted": sorted,
+    "list": list,
+    "set": set,
+    "tuple": tuple,
+    "round": round,
+}
+
+_stock_funcs = dict(funcs_maps)
+
+_compare_ops = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+_binary_ops = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_unary_ops = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _default_value(data: dict):
+    default = data.get("__default__", None)
+    if default is None:
+        if "name" in data:
+            default = data["name"]
+        elif "id" in data:
+            default = data["id"]
+        else:
+            default = next(iter(data.keys()))
+    return default
+
+
+def _compile_regex(pattern: str, ignore_case: bool):
+    # same rewriting as regex_func, done once
+    if ".*" not in pattern:
+        pattern = pattern.replace("*", ".*")
+    if ".?" not in pattern:
+        pattern = pattern.replace("?", ".?")
+    try:
+        return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error:
+        return None
+
+
+class _QueryCompiler:
+    """
+    Turns a parsed query string into a tree of closures over the record dict.
+
+    Names resolve like the globals eval() used to get: record fields (not
+    starting with "_") first, then ``x`` (the record), ``funcs_maps`` and a
+    few builtins. An unknown name raises NameError, which makes the query
+    false. Syntax outside the supported subset raises _Unsupported.
+    """
+
+    def compile(self, query: str):
+        tree = ast.parse(query, mode="eval")
+        return self.node(tree.body)
+
+    def node(self, node):
+        handler = getattr(self, f"_{type(node).__name__}", None)
+        if handler is None:
+            raise _Unsupported(type(node).__name__)
+        return handler(node)
+
+    def _Constant(self, node):
+        value = node.value
+        return lambda data: value
+
+    def _sequence(self, node, factory):
+        items = [self.node(x) for x in node.elts]
+        if all(isinstance(x, ast.Constant) for x in node.elts):
+            value = factory(x.value for x in node.elts)
+            return lambda data: value
+        return lambda data: factory(item(data) for item in items)
+
+    def _List(self, node):
+        return self._sequence(node, list)
+
+    def _Tuple(self, node):
+        return self._sequence(node, tuple)
+
+    def _Set(self, node):
+        return self._sequence(node, set)
+
+    def _Name(self, node):
+        name = node.id
+        if name == "__default__":
+            return _default_value
+
+        def fallback(data):
+            if name == "x":
+                return data
+            if name in funcs_maps:
+                return funcs_maps[name]
+            if name in _safe_builtins:
+                return _safe_builtins[name]
+            raise NameError(name)
+
+        if name.startswith("_"):
+            return fallback
+
+        def lookup(data):
+            try:
+                return data[name]
+            except KeyError:
+                return fallback(data)
+
+        return lookup
+
+    def _Attribute(self, node):
+        if node.attr.startswith("_"):
+            raise _Unsupported(node.attr)
+        value = self.node(node.value)
+        attr = node.attr
+        return lambda data: getattr(value(data), attr)
+
+    def _Subscript(self, node):
+        value = self.node(node.value)
+        index = self.node(node.slice)
+        return lambda data: value(data)[index(data)]
+
+    def _Slice(self, node):
+        parts = [self.node(x) if x is not None else None for x in (node.lower, node.upper, node.step)]
+        return lambda data: slice(*(x(data) if x is not None else None for x in parts))
+
+    def _BoolOp(self, node):
+        values = [self.node(x) for x in node.values]
+
+        if isinstance(node.op, ast.And):
+            def evaluate(data):
+                for value in values:
+                    result = value(data)
+                    if not result:
+                        return result
+                return result
+        else:
+            def evaluate(data):
+                for value in values:
+                    result = value(data)
+                    if result:
+                        return result
+                return result
+
+        return evaluate
+
+    def _UnaryOp(self, node):
+        if type(node.op) not in _unary_ops:
+            raise _Unsupported(type(node.op).__name__)
+        op = _unary_ops[type(node.op)]
+        operand = self.node(node.operand)
+        return lambda data: op(operand(data))
+
+    def _BinOp(self, node):
+        if type(node.op) not in _binary_ops:
+            raise _Unsupported(type(node.op).__name__)
+        op = _binary_ops[type(node.op)]
+        left = self.node(node.left)
+        right = self.node(node.right)
+        return lambda data: op(left(data), right(data))
+
+    def _Compare(self, node):
+        for op in node.ops:
+            if type(op) not in _compare_ops:
+                raise _Unsupported(type(op).__name__)
+
+        left = self.node(node.left)
+        if len(node.ops) == 1:
+            op = _compare_ops[type(node.ops[0])]
+            right = self.node(node.comparators[0])
+            return lambda data: op(left(data), right(data))
+
+        chain = [(_compare_ops[type(op)], self.node(x)) for op, x in zip(node.ops, node.comparators)]
+
+        def evaluate(data):
+            current = left(data)
+            for op, comparator in chain:
+                value = comparator(data)
+                if not op(current, value):
+                    return False
+                current = value
+            return True
+
+        return evaluate
+
+    def _Call(self, node):
+        specialized = self._specialized_call(node)
+        if specialized is not None:
+            return specialized
+        return self._generic_call(node)
+
+    def _generic_call(self, node):
+        func = self.node(node.func)
+        args = [self.node(x) for x in node.args]
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise _Unsupported("**kwargs")
+        kwargs = [(x.arg, self.node(x.value)) for x in node.keywords]
+
+        return lambda data: func(data)(
+            *[arg(data) for arg in args], **{key: value(data) for key, value in kwargs}
+        )
+
+    def _specialized_call(self, node):
+        """
+        CONTAINS and REGEX/REGEXI with a literal pattern skip funcs_maps, as
+        long as they are the stock implementations and no field shadows them
+        """
+        if not isinstance(node.func, ast.Name) or node.func.id not in _stock_funcs:
+            return None
+        name = node.func.id
+        if funcs_maps.get(name) is not _stock_funcs[name]:
+            return None
+
+        args = node.args
+        keywords = {x.arg: x.value for x in node.keywords}
+
+        if name == "CONTAINS":
+            if len(args) != 2 or keywords:
+                return None
+            container, substring = (self.node(x) for x in args)
+            generic = self._generic_call(node)
+
+            def contains(data):
+                if name in data:
+                    return generic(data)
+                return substring(data) in container(data)
+
+            return contains
+
+        if len(args) < 2 or not isinstance(args[1], ast.Constant) or not isinstance(args[1].value, str):
+            return None
+        if set(keywords) - {"ignore_case"}:
+            return None
+        if len(args) == 3 and not keywords:
+            flag = args[2]
+        elif len(args) == 2:
+            flag = keywords.get("ignore_case")
+        else:
+            return None
+        if flag is not None and not isinstance(flag, ast.Constant):
+            return None
+
+        ignore_case = flag.value if flag is not None else name == "REGEXI"
+        pattern = _compile_regex(args[1].value, ignore_case)
+        value = self.node(args[0])
+        generic = self._generic_call(node)
+
+        def regex(data):
+            if name in data:
+                return generic(data)
+            subject = value(data)
+            if pattern is None:
+                return False
+            return pattern.fullmatch(subject) is not None
+
+        return regex
+
+
+def compile_query(query: str) -> typing.Callable[[dict], typing.Any]:
+    """
+    Compile a parsed query into a function of the record dict, see _QueryCompiler.
+
+    Raises _Unsupported for syntax the compiler does not cover.
+    """
+    evaluate = _QueryCompiler().compile(query)
+
+    def func(data: dict):
+        try:
+            return evaluate(data)
+        except NameError:
+            return False
+
+    return func
+
+_MISSING = object()
+
+
+class QueryCache:
+    """
+    Bounded result cache for QueryObj.validate
+
+    Least recently used entries are evicted once ``maxsize`` is reached and
+    entries older than ``ttl`` seconds count as misses. ``maxsize=None`` keeps
+    every entry. Any object with ``get(key, default)`` and ``__setitem__``
+    can stand in for it, a plain dict gives the old unbounded behaviour.
+    """
+
+    def __init__(self, maxsize: typing.Optional[int] = 1024, ttl: typing.Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            entry = self.__data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self.__data[key]
+                self.misses += 1
+                return default
+
+            self.__data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self.__lock:
+            self.__data[key] = (value, expires)
+            self.__data.move_to_end(key)
+            if self.maxsize is not None and len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+
+    def __len__(self):
+        return len(self.__data)
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+
+def _freeze(value):
+    # hashable stand-in for nested values, types are kept so 1, 1.0 and True stay apart
+    if isinstance(value, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(map(_freeze, value)))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(map(_freeze, value)))
+    hash(value)
+    return (type(value), value)
+
+
+def _cache_key(rep: dict):
+    """
+    Structural key of a record representation, None if it cannot be hashed
+
+    Field order is part of the key, as it was with the json.dumps keys.
+    """
+    key = tuple(rep.items())
+    for value in rep.values():
+        if type(value) is not str:
+            break
+    else:
+        # the common case, numbers are already strings in the representation
+        return key
+
+    try:
+        return tuple((k, _freeze(v)) for k, v in key)
+    except TypeError:
+        return None
+
+
 class QueryObj:
     @classmethod
-    def parse(cls, query: str):
+    def parse(cls, query: str, **kwargs):
         stats = {"isCompound": False, "simple": False}
 
         # if theres no space in query, consider it as a regex pattern
@@ -159,19 +568,23 @@ class QueryObj:
         query = _collapse_spaces(query)
         query = query.strip()
 
-        return QueryObj(query, stats)
+        return QueryObj(query, stats, **kwargs)
 
-    def __init__(self, query: str, stats: dict, verify: bool = True):
+    def __init__(self, query: str, stats: dict, verify: bool = True, cache=None):
+        """
+        cache: where validate() keeps results, a bounded QueryCache by default,
+            any object with get(key, default) and __setitem__, or False to not cache
+        """
         self.query = query
         self.stats = stats
-        self.__objectSerializable = None
-        self.__cache = {}
+        self.__cache = QueryCache() if cache is None else cache
         self.__cachedFunc = self.__func_maker()
         self.__defaultKey = None
 
         if verify:
             try:
-                self.validate({"test": "test"})
+                # evaluated directly so the check does not end up in the cache
+                self.__cachedFunc(self.__toDictRepresentation({"test": "test"}))
             except NameError:
                 pass
             except Exception as e:
@@ -187,33 +600,34 @@ class QueryObj:
         self.__defaultKey = value
 
     def __toDictRepresentation(self, obj: typing.Any):
-        def _func(obj):
-
-            if isinstance(obj, (list, tuple, int, float, bool, str)):
-                return {"value": obj}
-
-            if isinstance(obj, dict):
-                return obj
-
-            if hasattr(obj, "__dict__"):
-                return {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
-
-        res = _func(obj)
-        if res is None:
+        if isinstance(obj, dict):
+            res = obj
+        elif isinstance(obj, (list, tuple, int, float, bool, str)):
+            res = {"value": obj}
+        elif hasattr(obj, "__dict__"):
+            res = {k: v for k, v in obj.__dict__.items() if not k.startswith("_")}
+        else:
             return None
 
         return {k: str(v) if isinstance(v, (int, float)) else v for k, v in res.items()}
 
-    def __toCacheKey(self, obj: typing.Any):
-        if isinstance(obj, (tuple, int, float, bool, str)):
-            return obj
-
+    def __func_maker(self):
         try:
-            return json.dumps(obj)
-        except:  # noqa
-            pass
+            func = compile_query(self.query)
+        except (_Unsupported, SyntaxError):
+            # outside what the compiler covers, keep the eval() behaviour
+            self.__compiled = False
+            return self.__eval_func_maker()
 
-    def __func_maker(self):
+        self.__compiled = True
+        return func
+
+    @property
+    def compiled(self) -> bool:
+        """False if the query fell back to eval()"""
+        return self.__compiled
+
+    def __eval_func_maker(self):
         def func(data: dict):
             default = data.get("__default__", None)
 
@@ -240,24 +654,36 @@ class QueryObj:
 
         return func
 
-    def validate(self, obj: typing.Any):
-        if self.__objectSerializable is None:
-            self.__objectSerializable = self.__toCacheKey(obj) is not None
-
-        if self.__objectSerializable and self.__cache is None:
-            self.__cache = {}
+    @property
+    def cache(self):
+        """the validate() result cache, False if caching is off"""
+        return self.__cache
 
+    def validate(self, obj: typing.Any):
         rep = self.__toDictRepresentation(obj)
 
-        if not self.__objectSerializable:
+        cache = self.__cache
+        if cache is False or rep is None:
             return self.__cachedFunc(rep)
 
-        cacheKey = self.__toCacheKey(rep)
-        if cacheKey in self.__cache:
-            return self.__cache[cacheKey]
+        cacheKey = _cache_key(rep)
+        if cacheKey is None:
+            return self.__cachedFunc(rep)
+
+        result = cache.get(cacheKey, _MISSING)
+        if result is _MISSING:
+            result = cache[cacheKey] = self.__cachedFunc(rep)
+        return result
+
+    def filter_many(self, records: typing.Iterable[typing.Any]) -> typing.List[typing.Any]:
+        """
+        Return the records the query matches, in order.
 
-        self.__cache[cacheKey] = self.__cachedFunc(rep)
-        return self.__cache[cacheKey]
+        Evaluates every record directly, without going through the validate() cache.
+        """
+        func = self.__cachedFunc
+        toRep = self.__toDictRepresentation
+        return [record for record in records if func(toRep(record))]
 
 
-__all__ = ["QueryObj"]
+__all__ = ["QueryObj", "QueryCache"]
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+import functools
+import threading
 import time
 import re
 
@@ -23,6 +25,9 @@ def time_parse(time_str: str | float | int, relative: datetime | None = None):
         - d, days
         - w, weeks
 
+    Strings are classified once and the resulting parse plan is cached, later
+    calls with the same string only apply it to ``relative``.
+
     Returns:
         datetime: The parsed datetime object
 
@@ -38,39 +43,54 @@ def time_parse(time_str: str | float | int, relative: datetime | None = None):
         raise ValueError(f"Invalid input type: {type(time_str)}")
 
     if isinstance(time_str, str):
-        time_str = time_str.strip()
-        if time_str == "* * * * *" or time_str == "now":
-            return relative
+        return _plan(time_str.strip())(relative)
+
+    return _parse_timestamp(time_str, relative)
+
+
+# every string is classified once, its plan is a function of the relative datetime
+@functools.lru_cache(maxsize=1024)
+def _plan(time_str: str):
+    if time_str == "* * * * *" or time_str == "now":
+        return _identity
 
     try:
-        return _parse_timestamp(time_str, relative)
+        return _timestamp_plan(time_str)
     except ValueError:
         pass
 
-    # Add type check before attempting unit parsing
     try:
-        if isinstance(time_str, str):
-            return _parse_units(time_str, relative)
+        return _units_plan(time_str)
     except ValueError:
         pass
 
     try:
-        return _parse_combined(time_str, relative)
+        return _combined_plan(time_str)
     except ValueError:
         pass
 
+    return _late_plan(time_str)
+
+
+def _identity(relative: datetime) -> datetime:
+    return relative
+
+
+def _offset_plan(delta: timedelta):
+    return lambda relative: relative + delta
+
+
+def _late_plan(time_str: str):
+    # cron expressions and natural language, what time_parse tried last
     try:
-        return _parse_cron(time_str, relative)
+        return _cron_plan(time_str)
     except ValueError:
         pass
 
-    try:
-        return _parse_natural(time_str)
-    except ValueError as e:
-        raise ValueError(f"Could not parse time string: {time_str}") from e
+    return _natural_plan(time_str)
 
 
-def _parse_combined(time_str: str, relative: datetime) -> datetime:
+def _combined_plan(time_str: str):
     if "+" not in time_str:
         raise ValueError("Not a combined format")
 
@@ -78,72 +98,98 @@ def _parse_combined(time_str: str, relative: datetime) -> datetime:
     if len(parts) < 2:
         raise ValueError("Invalid combined format")
 
-    base_time = time_parse(parts[0], relative=relative)
-    total_duration = timedelta()
+    base_plan = _plan(parts[0])
+    duration_plans = [_plan(part) for part in parts[1:]]
 
-    for duration_part in parts[1:]:
-        duration_time = time_parse(duration_part, relative=relative)
-        duration = duration_time - relative
-        total_duration += duration
+    def combined(relative: datetime) -> datetime:
+        try:
+            base_time = base_plan(relative)
+            total_duration = timedelta()
+            for duration_plan in duration_plans:
+                total_duration += duration_plan(relative) - relative
+        except ValueError:
+            # a natural language part did not parse, try the whole string
+            return _late_plan(time_str)(relative)
 
-    return base_time + total_duration
+        return base_time + total_duration
 
+    return combined
 
-def _parse_timestamp(time_str: str | float | int, relative: datetime) -> datetime:
-    # Handle absolute timestamps
-    if isinstance(time_str, (int, float)):
-        # Treat numbers >= 1e9 as UNIX timestamps (dates after 2001-09-09)
-        if time_str >= 1e9:
-            return datetime.fromtimestamp(float(time_str))
-        
-        # Treat smaller numbers as relative seconds
-        return relative + timedelta(seconds=float(time_str))
 
-    if isinstance(time_str, str) and time_str.count(".") <= 1 and time_str.replace(".", "").isdigit():
+def _parse_timestamp(time_str: float | int, relative: datetime) -> datetime:
+    # Treat numbers >= 1e9 as UNIX timestamps (dates after 2001-09-09)
+    if time_str >= 1e9:
+        return datetime.fromtimestamp(float(time_str))
+
+    # Treat smaller numbers as relative seconds
+    return relative + timedelta(seconds=float(time_str))
+
+
+def _timestamp_plan(time_str: str):
+    if time_str.count(".") <= 1 and time_str.replace(".", "").isdigit():
         numeric = float(time_str)
         if numeric >= 1e9:
-            return datetime.fromtimestamp(numeric)
-        return relative + timedelta(seconds=numeric)
+            timestamp = datetime.fromtimestamp(numeric)
+            return lambda relative: timestamp
+        return _offset_plan(timedelta(seconds=numeric))
 
     raise ValueError("Not a timestamp")
 
 
-def _parse_units(time_str: str, relative: datetime) -> datetime:
-    if not isinstance(time_str, str):
-        raise ValueError("Units parser requires string input")
-    
-    time_units = {
-        "ms": ("milliseconds", ["ms", "millisecond", "milliseconds"]),
-        "s": ("seconds", ["s", "sec", "secs", "second", "seconds"]),
-        "m": ("minutes", ["m", "min", "mins", "minute", "minutes"]),
-        "h": ("hours", ["h", "hr", "hrs", "hour", "hours"]),
-        "d": ("days", ["d", "day", "days"]),
-        "w": ("weeks", ["w", "week", "weeks"]),
-    }
+_time_units = {
+    "ms": ("milliseconds", ["ms", "millisecond", "milliseconds"]),
+    "s": ("seconds", ["s", "sec", "secs", "second", "seconds"]),
+    "m": ("minutes", ["m", "min", "mins", "minute", "minutes"]),
+    "h": ("hours", ["h", "hr", "hrs", "hour", "hours"]),
+    "d": ("days", ["d", "day", "days"]),
+    "w": ("weeks", ["w", "week", "weeks"]),
+}
+_unit_attrs = {variant: attr for attr, variants in _time_units.values() for variant in variants}
+_units_pattern = re.compile(r"(\d+\.?\d*)\s*([a-z]+)")
 
+
+def _units_plan(time_str: str):
     time_str = time_str.lower().strip()
     total_delta = timedelta()
-    matches = re.findall(r"(\d+\.?\d*)\s*([a-z]+)", time_str)
+    matches = _units_pattern.findall(time_str)
 
     if not matches or "".join(f"{v}{u}" for v, u in matches) != time_str.replace(" ", ""):
         raise ValueError("Invalid unit format")
 
     for value_str, unit in matches:
-        value = float(value_str)
-        for base_unit, (delta_attr, variants) in time_units.items():
-            if unit in variants:
-                total_delta += timedelta(**{delta_attr: value})
-                break
-        else:
+        if unit not in _unit_attrs:
             raise ValueError(f"Unknown time unit: {unit}")
+        total_delta += timedelta(**{_unit_attrs[unit]: float(value_str)})
 
-    return relative + total_delta
+    return _offset_plan(total_delta)
 
 
-def _parse_cron(time_str: str, relative: datetime) -> datetime:
+def _cron_plan(time_str: str):
     from croniter import croniter
-    cron = croniter(time_str, relative)
-    return cron.get_next(datetime, relative)
+
+    # validates the expression, raises ValueError for anything else
+    schedule = croniter(time_str, datetime.now())
+    lock = threading.Lock()
+
+    def cron(relative: datetime) -> datetime:
+        if relative.tzinfo is not None:
+            # the schedule was built for naive datetimes
+            return croniter(time_str, relative).get_next(datetime, relative)
+        with lock:
+            return schedule.get_next(datetime, relative)
+
+    return cron
+
+
+def _natural_plan(time_str: str):
+    # dateparser parses against the current time, nothing to keep but the string
+    def natural(relative: datetime) -> datetime:
+        try:
+            return _parse_natural(time_str)
+        except ValueError as e:
+            raise ValueError(f"Could not parse time string: {time_str}") from e
+
+    return natural
 
 
 def _parse_natural(time_str: str) -> datetime:
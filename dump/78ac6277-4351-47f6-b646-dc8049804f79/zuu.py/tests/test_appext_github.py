@@ -1,6 +1,9 @@
 import pytest
 import os
-from zuu.appext_github import GithubRepo, GithubGist, GithubRepoFileContext
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zuu.appext_github import Github, GithubClient, GithubRepo, GithubGist, GithubRepoFileContext
 from datetime import datetime
 import time
 
@@ -106,4 +109,88 @@ class TestGitHubIntegration:
         
         # Test invalid URL without none_on_error
         with pytest.raises(ValueError):
-            GithubRepoFileContext.auto("https://invalid.url") 
\ No newline at end of file
+            GithubRepoFileContext.auto("https://invalid.url")
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """a local stand-in for api.github.com and its asset downloads"""
+
+    hits = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits.append(self.path)
+        base = f"http://{self.headers['Host']}"
+
+        if self.path.startswith("/assets/"):
+            body = self.path.encode() * 10000
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if self.path == "/repos/org/repo/releases/tags/v1":
+            etag = '"v1"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps({
+                "tag_name": "v1",
+                "assets": [
+                    {"name": f"tool-{i}.zip", "browser_download_url": f"{base}/assets/tool-{i}.zip"}
+                    for i in range(3)
+                ] + [{"name": "missing.zip", "browser_download_url": f"{base}/nope/missing.zip"}],
+            }).encode()
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(404)
+        self.end_headers()
+
+
+class TestGithubClient:
+    @pytest.fixture(autouse=True)
+    def server(self, tmp_path):
+        _StandIn.hits = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.url = f"http://127.0.0.1:{server.server_port}"
+        self.tmp_path = tmp_path
+
+        previous = Github._client
+        Github.setClient(GithubClient(cache_dir=str(tmp_path / "cache"), apiUrl=self.url))
+        yield
+        Github.setClient(previous)
+        server.shutdown()
+        server.server_close()
+
+    def test_ttl_and_etag_cache(self):
+        assert GithubRepo.releases("org/repo", tag="v1")[0]["tag_name"] == "v1"
+        GithubRepo.releases("org/repo", tag="v1")
+        assert len(_StandIn.hits) == 1
+
+        # expired: revalidated with If-None-Match, the 304 keeps the cached body
+        client = GithubClient(cache_dir=str(self.tmp_path / "cache"), apiUrl=self.url, ttl=0)
+        Github.setClient(client)
+        assert GithubRepo.releases("org/repo", tag="v1")[0]["tag_name"] == "v1"
+        assert len(_StandIn.hits) == 2
+
+    def test_parallel_release_download(self):
+        save_path = str(self.tmp_path / "assets")
+        assert GithubRepo.downloadRelease("org/repo", ["*.zip"], save_path=save_path, tag="v1") is None
+        assert sorted(os.listdir(save_path)) == ["tool-0.zip", "tool-1.zip", "tool-2.zip"]
+        with open(os.path.join(save_path, "tool-1.zip"), "rb") as f:
+            assert f.read() == b"/assets/tool-1.zip" * 10000
+
+        downloaded = GithubRepo.downloadRelease("org/repo", ["tool-*.zip"], tag="v1")
+        assert [name for name, _ in downloaded] == ["tool-0.zip", "tool-1.zip", "tool-2.zip"]
+        assert downloaded[2][1] == b"/assets/tool-2.zip" * 10000
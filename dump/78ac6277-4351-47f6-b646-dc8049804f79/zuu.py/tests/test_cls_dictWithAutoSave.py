@@ -1,5 +1,7 @@
 import os
 import json
+import subprocess
+import sys
 import time
 import pytest
 from zuu.cls_dictWithAutoSave import DictWithAutosave
@@ -101,4 +103,55 @@ def test_invalid_json(temp_json_file):
     
     # Should raise JSONDecodeError
     with pytest.raises(json.JSONDecodeError):
-        DictWithAutosave(temp_json_file) 
\ No newline at end of file
+        DictWithAutosave(temp_json_file)
+
+def test_write_behind_batches_writes(temp_json_file):
+    """Write-behind mode saves on flush_every, flush() and context exit."""
+    with DictWithAutosave(temp_json_file, write_behind=True, flush_interval=60, flush_every=100) as d:
+        for i in range(250):
+            d[f"key{i}"] = i
+        assert d.dirty
+
+        with open(temp_json_file, 'r') as f:
+            assert len(json.load(f)) == 200
+
+    assert not d.dirty
+    with open(temp_json_file, 'r') as f:
+        assert len(json.load(f)) == 250
+
+def test_write_behind_debounce(temp_json_file):
+    """Pending changes are written once flush_interval passed without changes."""
+    d = DictWithAutosave(temp_json_file, write_behind=True, flush_interval=0.05)
+    d["key1"] = "value1"
+    d.update({"key2": "value2"})
+    time.sleep(0.3)
+    assert not d.dirty
+    with open(temp_json_file, 'r') as f:
+        assert json.load(f) == {"key1": "value1", "key2": "value2"}
+
+def test_journal_replay(temp_json_file):
+    """Unflushed changes are recovered from the journal."""
+    # crash before the write-behind flush, os._exit skips the atexit flush too
+    script = (
+        "import os, sys\n"
+        "from zuu.cls_dictWithAutoSave import DictWithAutosave\n"
+        "d = DictWithAutosave(sys.argv[1], write_behind=True, flush_interval=60, journal=True)\n"
+        "d['key1'] = 'value1'\n"
+        "d['key2'] = 'value2'\n"
+        "del d['key1']\n"
+        "os._exit(1)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, "-c", script, temp_json_file], env=env)
+
+    with open(temp_json_file, 'r') as f:
+        assert json.load(f) == {}
+    # a torn line at the end of the journal, as left by an interrupted append
+    with open(temp_json_file + ".journal", 'a') as f:
+        f.write('["set", "broken"')
+
+    recovered = DictWithAutosave(temp_json_file, journal=True)
+    assert dict(recovered) == {"key2": "value2"}
+    assert not os.path.exists(temp_json_file + ".journal")
+    with open(temp_json_file, 'r') as f:
+        assert json.load(f) == {"key2": "value2"}
@@ -0,0 +1,134 @@
+import threading
+import time
+
+from zuu import prop_timed
+from zuu.prop_timed import timedClassProperty, timedProperty
+
+
+def test_per_instance_values():
+    class Counter:
+        def __init__(self, start):
+            self.start = start
+
+        @timedProperty("1h")
+        def value(self):
+            return self.start
+
+    assert Counter(1).value == 1
+    assert Counter(2).value == 2
+
+
+def test_slots_instances():
+    calls = []
+
+    class Counter:
+        __slots__ = ("start", "__weakref__")
+
+        def __init__(self, start):
+            self.start = start
+
+        @timedProperty("1h")
+        def value(self):
+            calls.append(self.start)
+            return self.start
+
+    first, second = Counter(1), Counter(2)
+    assert (first.value, second.value, first.value) == (1, 2, 1)
+    assert calls == [1, 2]
+
+    del first
+    assert len(Counter.value._entries) == 1
+
+
+def test_expiry_and_none_is_cached():
+    calls = []
+
+    class Obj:
+        @timedProperty("50ms")
+        def value(self):
+            calls.append(1)
+            return None
+
+    obj = Obj()
+    assert obj.value is None
+    assert obj.value is None
+    assert len(calls) == 1
+    time.sleep(0.1)
+    assert obj.value is None
+    assert len(calls) == 2
+
+
+def test_duration_parsed_once(monkeypatch):
+    class Obj:
+        @timedProperty("10ms")
+        def value(self):
+            return time.monotonic()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("time_parse called on refresh")
+
+    monkeypatch.setattr(prop_timed, "time_parse", fail)
+    obj = Obj()
+    first = obj.value
+    time.sleep(0.02)
+    assert obj.value != first
+
+
+def test_single_flight():
+    calls = []
+
+    class Obj:
+        @timedProperty("1h")
+        def value(self):
+            calls.append(1)
+            time.sleep(0.05)
+            return 42
+
+    obj = Obj()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(obj.value)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+
+
+def test_stale_while_revalidate():
+    values = iter(range(100))
+    refreshed = threading.Event()
+
+    class Obj:
+        @timedProperty("10ms", stale_while_revalidate=True)
+        def value(self):
+            refreshed.set()
+            return next(values)
+
+    obj = Obj()
+    assert obj.value == 0
+    time.sleep(0.02)
+    refreshed.clear()
+    # expired: the stale value comes back right away, the refresh runs in the background
+    assert obj.value == 0
+    assert refreshed.wait(1)
+    time.sleep(0.01)
+    assert obj.value == 1
+
+
+def test_class_property_per_class():
+    class Base:
+        label = "base"
+
+        @classmethod
+        def _name(cls):
+            return cls.label
+
+        name = timedClassProperty(_name, "1h")
+
+    class Child(Base):
+        label = "child"
+
+    assert Base.name == "base"
+    assert Child.name == "child"
@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+from zuu import stdext_hashlib
+from zuu.stdext_hashlib import HashCache, hash_file, hash_many, md5_by_chunk, sha256_by_chunk
+
+OLD = 1_600_000_000
+
+
+def write(path, data):
+    path.write_bytes(data)
+    # outside the racy window so the digest gets cached
+    os.utime(path, (OLD, OLD))
+    return str(path)
+
+
+def test_digests_match_hashlib(tmp_path, monkeypatch):
+    data = os.urandom(300_000)
+    path = write(tmp_path / "a.bin", data)
+
+    assert sha256_by_chunk(path) == hashlib.sha256(data).hexdigest()
+    assert md5_by_chunk(path, chunk_size=7) == hashlib.md5(data).hexdigest()
+    assert hash_file(path, "sha1") == hashlib.sha1(data).hexdigest()
+
+    # memory mapped path
+    monkeypatch.setattr(stdext_hashlib, "MMAP_THRESHOLD", 1)
+    assert hash_file(path, chunk_size=4096) == hashlib.sha256(data).hexdigest()
+    assert hash_file(write(tmp_path / "empty", b"")) == hashlib.sha256(b"").hexdigest()
+
+
+def test_hash_many(tmp_path):
+    paths = [write(tmp_path / f"{i}.txt", str(i).encode() * 1000) for i in range(20)]
+    result = hash_many(paths, workers=4)
+    assert list(result) == paths
+    assert all(result[p] == sha256_by_chunk(p) for p in paths)
+
+
+def test_cache(tmp_path):
+    cache_path = str(tmp_path / "cache" / "hashes.json")
+    path = write(tmp_path / "a.txt", b"one")
+
+    with HashCache(cache_path) as cache:
+        assert hash_file(path, cache=cache) == hashlib.sha256(b"one").hexdigest()
+        assert hash_file(path, cache=cache) == hashlib.sha256(b"one").hexdigest()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    # persisted, and a changed file is rehashed
+    cache = HashCache(cache_path)
+    assert len(cache) == 1
+    write(tmp_path / "a.txt", b"two")
+    os.utime(path, (OLD + 1, OLD + 1))
+    assert hash_file(path, cache=cache) == hashlib.sha256(b"two").hexdigest()
+    assert cache.misses == 1
+
+    os.remove(path)
+    assert cache.prune() == 1
+    assert len(cache) == 0
+
+
+def test_recent_files_are_not_cached(tmp_path):
+    path = tmp_path / "fresh.txt"
+    path.write_bytes(b"fresh")
+    cache = HashCache()
+    hash_file(str(path), cache=cache)
+    assert len(cache) == 0
@@ -0,0 +1,73 @@
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+
+from zuu.stdext_subprocess import (
+    aquery_json,
+    aquery_string,
+    check_is_installed,
+    query_json,
+    query_many,
+    query_string,
+)
+
+# the running interpreter stands in for a CLI tool
+PY = sys.executable
+
+
+def test_query_string():
+    assert query_string(PY, "-c", "print('hello')", strip=True) == "hello"
+    assert query_json(PY, "-c", "print('{\"a\": 1}')") == {"a": 1}
+
+
+def test_check_is_installed():
+    check_is_installed.cache_clear()
+    assert check_is_installed(PY)
+    assert not check_is_installed("zuu-no-such-tool-xyz")
+    check_is_installed(PY)
+    assert check_is_installed.cache_info().hits == 1
+
+
+def test_aquery():
+    async def main():
+        return await asyncio.gather(
+            aquery_string(PY, "-c", "print(1)", strip=True),
+            aquery_json(PY, "-c", "print('[1, 2]')"),
+        )
+
+    assert asyncio.run(main()) == ["1", [1, 2]]
+
+
+def test_aquery_limiter():
+    sleep = "import time; time.sleep(0.3)"
+
+    async def main(limit):
+        limiter = asyncio.Semaphore(limit)
+        start = time.perf_counter()
+        await asyncio.gather(*(aquery_string(PY, "-c", sleep, limiter=limiter) for _ in range(4)))
+        return time.perf_counter() - start
+
+    # serialized the four sleeps take at least 1.2 s
+    assert asyncio.run(main(1)) >= 1.2
+    assert asyncio.run(main(4)) < 1.2
+
+
+def test_aquery_timeout():
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(aquery_string(PY, "-c", "import time; time.sleep(5)", timeout=0.2))
+
+
+def test_query_many():
+    commands = [[PY, "-c", f"print({i})"] for i in range(6)]
+    assert query_many(commands, query_string, workers=3, strip=True) == [str(i) for i in range(6)]
+
+    commands.append([PY, "-c", "print('not json')"])
+    results = query_many(commands, query_json, return_exceptions=True)
+    assert results[:6] == list(range(6))
+    assert isinstance(results[6], ValueError)
+
+    with pytest.raises(ValueError):
+        query_many(commands, query_json)
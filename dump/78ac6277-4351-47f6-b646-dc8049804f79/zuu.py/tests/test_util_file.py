@@ -10,7 +10,13 @@ from zuu.util_file import (
     load,
     touch,
     path_match,
+    iter_path_match,
+    iter_scan_pathes,
+    scan_pathes,
     save,
+    iter_load,
+    register_codec,
+    Codec,
 )
 
 @pytest.fixture(scope="module", autouse=True)
@@ -230,6 +236,28 @@ def test_imaginary_paths():
         "x/y/z/f/g/c.txt"
     ]
 
+def test_iter_path_match_streams_same_results(sample_dir):
+    matches = iter_path_match([str(sample_dir)], ["*.txt", "subdir2/*.md"], depth=-1)
+    assert not isinstance(matches, list)
+    assert list(matches) == path_match([str(sample_dir)], ["*.txt", "subdir2/*.md"], depth=-1)
+
+def test_scan_pathes_parallel(sample_dir):
+    sequential = scan_pathes([str(sample_dir)], depth=-1)
+    parallel = list(iter_scan_pathes([str(sample_dir)], depth=-1, workers=4))
+    assert sorted(parallel) == sorted(sequential)
+    assert len(parallel) == 9
+
+    result = iter_path_match([str(sample_dir)], ["*.txt"], depth=2, workers=4)
+    assert sorted(result) == sorted(path_match([str(sample_dir)], ["*.txt"], depth=2))
+
+def test_exclude_prunes_directories(sample_dir):
+    result = list(iter_path_match([str(sample_dir)], ["*.txt"], depth=-1, exclude=["subdir1"]))
+    assert result == [str(sample_dir / "file1.txt")]
+
+    scanned = list(iter_scan_pathes([str(sample_dir)], depth=-1, exclude=["subsubdir*"]))
+    assert str(sample_dir / "subdir1" / "subsubdir1") not in scanned
+    assert str(sample_dir / "subdir1" / "file2.txt") in scanned
+
 @pytest.fixture
 def temp_json_file(tmp_path):
     return str(tmp_path / "test.json")
@@ -276,3 +304,96 @@ def test_json_ensure_ascii_behavior(temp_json_file):
         content = f.read()
         assert 'こんにちは' in content  # Raw characters
 
+
+def test_pickle_roundtrip_is_binary(tmp_path):
+    path = str(tmp_path / "data.pkl")
+    data = {"bytes": b"\x00\xff", "set": {1, 2}}
+    save(data, path)
+    assert load(path) == data
+
+def test_csv_and_jsonl_streaming(tmp_path):
+    csv_path = str(tmp_path / "rows.csv")
+    save([["a", "b"], ["1", "x,y"]], csv_path)
+    assert load(csv_path) == [["a", "b"], ["1", "x,y"]]
+    assert list(iter_load(csv_path)) == [["a", "b"], ["1", "x,y"]]
+
+    jsonl_path = str(tmp_path / "items.jsonl")
+    save([{"a": 1}, {"b": "é"}], jsonl_path)
+    stream = iter_load(jsonl_path)
+    assert next(stream) == {"a": 1}
+    assert list(stream) == [{"b": "é"}]
+
+    with pytest.raises(ValueError):
+        list(iter_load(str(tmp_path / "x.json")))
+
+def test_atomic_save_and_mmap_load(tmp_path):
+    path = str(tmp_path / "big.json")
+    save({"a": 1}, path)
+    save({"a": list(range(1000))}, path)
+    assert os.listdir(tmp_path) == ["big.json"]
+    assert load(path, use_mmap=True) == {"a": list(range(1000))}
+
+    # a failing serializer leaves the old file untouched
+    with pytest.raises(TypeError):
+        save({"a": object()}, path)
+    assert load(path) == {"a": list(range(1000))}
+    assert os.listdir(tmp_path) == ["big.json"]
+
+@pytest.mark.parametrize(
+    "name, text, module",
+    [
+        ("data.json", '{"a": [1, "\u00e9"]}', None),
+        ("data.jsonl", '{"a": 1}\n{"b": "\u00e9"}\n', None),
+        ("data.yaml", "a:\n- 1\n- é\n", "yaml"),
+        ("data.toml", 'a = [1, "é"]\n', None),
+        ("data.xml", "<a><b>é</b></a>", None),
+        ("data.csv", "a,b\n1,é\n", None),
+    ],
+)
+def test_mmap_load_matches_plain_load(tmp_path, name, text, module):
+    if module:
+        pytest.importorskip(module)
+    path = str(tmp_path / name)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+    plain = load(path)
+    mapped = load(path, use_mmap=True)
+    if name.endswith(".xml"):
+        plain, mapped = plain.find("b").text, mapped.find("b").text
+    assert mapped == plain
+
+@pytest.mark.parametrize("name, module", [("data.pkl", None), ("data.msgpack", "msgpack")])
+def test_mmap_load_binary(tmp_path, name, module):
+    if module:
+        pytest.importorskip(module)
+    path = str(tmp_path / name)
+    save({"a": [1, "é"]}, path)
+    assert load(path, use_mmap=True) == load(path) == {"a": [1, "é"]}
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_atomic_save_keeps_symlink(tmp_path):
+    target = tmp_path / "real.json"
+    link = tmp_path / "link.json"
+    save({"a": 1}, str(target))
+    try:
+        os.symlink(target, link)
+    except OSError:
+        pytest.skip("symlinks not permitted")
+
+    save({"a": 2}, str(link))
+    assert os.path.islink(link)
+    assert load(str(target)) == {"a": 2}
+    assert sorted(os.listdir(tmp_path)) == ["link.json", "real.json"]
+
+def test_register_codec():
+    import zuu.util_file as util_file
+
+    register_codec(Codec("upper", str.lower, lambda x, **kwargs: x.upper()))
+    try:
+        assert serialize("abc", "upper") == "ABC"
+        assert deserialize("ABC", "upper") == "abc"
+    finally:
+        util_file.codecs.pop("upper")
+        util_file.serialize_methods.pop("upper")
+        util_file.deserialize_methods.pop("upper")
@@ -1,4 +1,6 @@
-from zuu.util_smartquery import QueryObj as query
+import time
+
+from zuu.util_smartquery import QueryCache, QueryObj as query
 import pytest 
 
 class TestParse:
@@ -108,4 +110,100 @@ class TestValidate:
             "name": "Jo",
             "age": 35,
             "title": "Developer"
-        }) 
\ No newline at end of file
+        }) 
+
+class TestCompiled:
+    @staticmethod
+    def test_compiled_matches_eval():
+        records = [
+            {"name": "John", "age": 30, "title": "Developer"},
+            {"name": "Jolyne", "age": 25, "title": "Project Manager"},
+            {"name": "alice", "title": "Manager"},
+            {"age": 41},
+        ]
+        for query_str in [
+            "(name contains Jo or age is 30) and not title contains Manager",
+            "name pattern of J*",
+            "REGEXI(name, 'A*')",
+            "len(name) > 4",
+            "J.*",
+        ]:
+            query_obj = query.parse(query_str)
+            assert query_obj.compiled
+            legacy = query_obj._QueryObj__eval_func_maker()
+            for record in records:
+                rep = query_obj._QueryObj__toDictRepresentation(record)
+                assert query_obj.validate(record) == legacy(rep)
+
+    @staticmethod
+    def test_filter_many():
+        records = [{"name": "John", "age": 30}, {"name": "Mike", "age": 30}, {"age": 30}, {"name": "Jo"}]
+        query_obj = query.parse("name startswith J and age is 30")
+        assert query_obj.filter_many(records) == [records[0]]
+        assert query.parse("J.*").filter_many(records) == [records[0], records[3]]
+
+    @staticmethod
+    def test_fields_shadow_functions():
+        query_obj = query.parse("CONTAINS(name, 'x')")
+        assert query_obj.validate({"name": "xy"})
+        assert query_obj.validate({"name": "xy", "CONTAINS": lambda a, b: False}) is False
+
+    @staticmethod
+    def test_unsupported_syntax_falls_back_to_eval():
+        query_obj = query.parse("(lambda v: v)(name) == 'John'")
+        assert not query_obj.compiled
+        assert query_obj.validate({"name": "John"})
+
+class TestCache:
+    @staticmethod
+    def test_hits_and_misses():
+        query_obj = query.parse("name is John")
+        assert query_obj.validate({"name": "John"})
+        assert query_obj.validate({"name": "John"})
+        assert not query_obj.validate({"name": "Mike"})
+        assert query_obj.cache.info()["hits"] == 1
+        assert query_obj.cache.info()["misses"] == 2
+        assert len(query_obj.cache) == 2
+
+    @staticmethod
+    def test_lru_eviction():
+        query_obj = query.parse("name is John", cache=QueryCache(maxsize=2))
+        for name in ["John", "Mike", "John", "Alice"]:
+            query_obj.validate({"name": name})
+        # Mike was the least recently used
+        assert len(query_obj.cache) == 2
+        query_obj.validate({"name": "John"})
+        query_obj.validate({"name": "Mike"})
+        assert query_obj.cache.hits == 2
+        assert query_obj.cache.misses == 4
+
+    @staticmethod
+    def test_ttl():
+        cache = QueryCache(ttl=0.05)
+        query_obj = query.parse("name is John", cache=cache)
+        query_obj.validate({"name": "John"})
+        query_obj.validate({"name": "John"})
+        assert cache.hits == 1
+        time.sleep(0.1)
+        query_obj.validate({"name": "John"})
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    @staticmethod
+    def test_structural_key():
+        query_obj = query.parse("tags[0] is True")
+        assert query_obj.validate({"tags": [True]})
+        assert not query_obj.validate({"tags": [1]})
+        assert not query_obj.validate({"tags": [bytearray(b"a")]})
+        assert query_obj.cache.misses == 2
+
+    @staticmethod
+    def test_pluggable():
+        store = {}
+        query_obj = query.parse("name is John", cache=store)
+        assert query_obj.validate({"name": "John"})
+        assert list(store.values()) == [True]
+
+        query_obj = query.parse("name is John", cache=False)
+        assert query_obj.validate({"name": "John"})
+        assert query_obj.cache is False
@@ -108,4 +108,14 @@ class TestTimeParse:
 
         for case in test_cases:
             result = time_parse(case)
-            assert isinstance(result, datetime), f"Failed for {case}"
\ No newline at end of file
+            assert isinstance(result, datetime), f"Failed for {case}"
+
+    def test_cached_plans_follow_relative(self):
+        first = datetime(2024, 1, 1, 12, 0)
+        second = datetime(2024, 6, 1, 8, 30)
+
+        assert time_parse("1h30m", relative=first) == first + timedelta(hours=1, minutes=30)
+        assert time_parse(" 1h30m ", relative=second) == second + timedelta(hours=1, minutes=30)
+        assert time_parse("0 * * * *", relative=first) == datetime(2024, 1, 1, 13, 0)
+        assert time_parse("0 * * * *", relative=second) == datetime(2024, 6, 1, 9, 0)
+        assert time_parse("now + 10s", relative=second) == second + timedelta(seconds=10)
@@ -1,10 +1,46 @@
 import os
-import shutil
 import sys
 import pathlib
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from create_new import dump_item  # noqa: E402
+from index_store import append_entries  # noqa: E402
+
+
+def ingest(paths, workers=None):
+    """
+    dumps every path in a process pool and appends to the index once
+
+    ids are assigned up front so the index keeps the order of paths
+    """
+    jobs = [(str(path), str(uuid.uuid4())) for path in paths]
+    entries = []
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(path, pool.submit(dump_item, path, dump_id)) for path, dump_id in jobs]
+        for path, future in futures:
+            try:
+                entry = future.result()
+            except Exception as e:
+                failed.append(path)
+                print(f"Failed '{path}': {e}")
+                continue
+
+            entries.append(entry)
+            print(f"Dumped '{entry['name']}' as {entry['id']}.")
+
+    append_entries(entries)
+
+    return entries, failed
+
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python batch_handle.py <path>")
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python batch_handle.py <path> [workers]")
         sys.exit(1)
 
     path = sys.argv[1]
@@ -15,15 +51,13 @@ def main():
         print(f"Path '{path}' does not exist.")
         sys.exit(1)
 
-    
+    workers = int(sys.argv[2]) if len(sys.argv) == 3 else None
+
+    items = sorted(os.listdir(path))
+    entries, failed = ingest([os.path.join(path, item) for item in items], workers)
+    print(f"Added {len(entries)} dumps to the index.")
+    if failed:
+        sys.exit(1)
 
-    for item in os.listdir(path):
-        # move item to inbox one by one
-        assert len(os.listdir("inbox")) == 0, "Inbox directory should be empty before processing."
-        item_path = os.path.join(path, item)
-        shutil.move(item_path, os.path.join("inbox", item))
-        print(f"Moved '{item}' to 'inbox' directory.")
-        os.system("python scripts/create_new.py")
-    
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
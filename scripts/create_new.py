@@ -1,75 +1,71 @@
 import datetime
 import os
+import shutil
 import uuid
-import json
+import zipfile
 
-def load_index():
-    index_path = 'index/index.json'
-    if os.path.exists(index_path):
-        with open(index_path, 'r') as f:
-            return json.load(f)
-    else:
-        return []
-    
-def save_index(index_data):
-    index_path = 'index/index.json'
-    with open(index_path, 'w') as f:
-        json.dump(index_data, f, indent=4)
+from index_store import append_entries
 
 
+def zip_is_git(zip_path):
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        return any("/.git/" in name for name in zip_ref.namelist())
 
-def create_new_dump():
-    assert len(os.listdir('inbox')) == 1, "Expected exactly one item in 'inbox' directory."
-    inbox_dir_name = os.listdir('inbox')[0]
+
+def dump_item(item_path, dump_id):
+    """
+    moves one file or directory into dump/<dump_id>/ and returns its index entry
+
+    git directories are zipped straight into the dump folder, zip files are
+    inspected for a .git directory
+    """
+    item_name = os.path.basename(os.path.normpath(item_path))
+    dump_path = os.path.join('dump', dump_id)
+    os.makedirs(dump_path, exist_ok=True)
 
     is_git = False
     # if already a zip file, we need to check the contents
-    if inbox_dir_name.endswith('.zip'):
-        # if it is a zip file, we need to check namelist
-        import zipfile
-        zip_path = os.path.join('inbox', inbox_dir_name)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            if any("/.git/" in name for name in zip_ref.namelist()):
-                is_git = True
+    if item_name.endswith('.zip'):
+        is_git = zip_is_git(item_path)
+        shutil.move(item_path, os.path.join(dump_path, item_name))
 
     # if it contains .git directory, we need to convert it to a zip file
-    elif os.path.isdir(os.path.join('inbox', inbox_dir_name, '.git')):
+    elif os.path.isdir(os.path.join(item_path, '.git')):
         is_git = True
-        import shutil
-        zip_path = os.path.join('inbox', inbox_dir_name + '.zip')
-        shutil.make_archive(zip_path[:-4], 'zip', os.path.join('inbox', inbox_dir_name))
-        inbox_dir_name += '.zip'
+        shutil.make_archive(os.path.join(dump_path, item_name), 'zip', item_path)
+        item_name += '.zip'
         # remove the original directory
-        shutil.rmtree(os.path.join('inbox', inbox_dir_name[:-4]))
-
-    dump_id = str(uuid.uuid4())
-    dump_path = os.path.join('dump', dump_id)
+        shutil.rmtree(item_path)
 
-    os.makedirs(dump_path, exist_ok=True)
-    
-    # Move the inbox directory to the new dump path
-    os.rename(os.path.join('inbox', inbox_dir_name), os.path.join(dump_path, inbox_dir_name))
+    else:
+        shutil.move(item_path, os.path.join(dump_path, item_name))
 
     # create a readme
     readme_path = os.path.join(dump_path, 'README.md')
     with open(readme_path, 'w') as f:
-        f.write(f"# {inbox_dir_name}\n")
+        f.write(f"# {item_name}\n")
         f.write("\n")
         f.write(f"Created on: {datetime.datetime.now().isoformat()}\n")
         f.write("\n")
         f.write(f"Dump ID: {dump_id}\n")
 
-
-    # Update the index
-    indexdata = load_index()
-    indexdata.append({
+    return {
         'id': dump_id,
-        'name': inbox_dir_name,
+        'name': item_name,
         "timestamp": datetime.datetime.now().isoformat(),
         "git" : is_git
-    })
+    }
 
-    save_index(indexdata)
+
+def create_new_dump():
+    assert len(os.listdir('inbox')) == 1, "Expected exactly one item in 'inbox' directory."
+    inbox_dir_name = os.listdir('inbox')[0]
+
+    dump_id = str(uuid.uuid4())
+    entry = dump_item(os.path.join('inbox', inbox_dir_name), dump_id)
+
+    # Update the index
+    append_entries([entry])
 
     return dump_id
 
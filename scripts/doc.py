@@ -1,4 +1,4 @@
-# this script creates a doc.md that based on index.json
+# this script creates a doc.md that based on index/index.jsonl
 #
 # {
 #     "id": "fbd59188-56c8-4279-8166-9b237b9337de",
@@ -9,33 +9,88 @@
 
 # creates an entry in markdown
 # - {human readable date} [zdash](/dump/fbd59188-56c8-4279-8166-9b237b9337de/) `git`
-import datetime
+#
+# doc.md is only appended to: index/.doc.state.json remembers how far into
+# the index doc.md goes. everything is rebuilt when the index was rewritten
+# (compaction, migration) or doc.md does not match the state, pass --full to
+# force it
 import json
 import os
+import sys
 
-def load_index():
-    index_path = 'index/index.json'
-    if os.path.exists(index_path):
-        with open(index_path, 'r') as f:
-            return json.load(f)
-    else:
-        return []
-    
-def create_doc():
-    index_data = load_index()
-    doc_lines = []
+from index_store import entry_before, read_index
+
+DOC_PATH = 'doc.md'
+STATE_PATH = 'index/.doc.state.json'
+
+
+def format_entry(entry):
+    # the timestamp is iso formatted, its first 10 chars are YYYY-MM-DD already
+    human_readable_date = entry['timestamp'][:10]
+    name = entry['name']
+    dump_id = entry['id']
+
+    return f"- {human_readable_date} [{name}](./dump/{dump_id}/) `{'git' if entry['git'] else 'non-git'}`"
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # doc.md has to be the file this state was written for
+    if not os.path.exists(DOC_PATH) or os.path.getsize(DOC_PATH) != state.get('doc_size'):
+        return None
 
-    for entry in index_data:
-        human_readable_date = entry['timestamp'][:10]  # YYYY-MM-DD
-        human_readable_date = datetime.datetime.fromisoformat(human_readable_date).strftime('%Y-%m-%d')
-        name = entry['name']
-        dump_id = entry['id']
+    # the index has to be the same file, only appended to
+    last = entry_before(state.get('offset', 0))
+    if state.get('offset', 0) and (last is None or last.get('id') != state.get('last_id')):
+        return None
+
+    return state
+
+
+def save_state(offset, count, last_id):
+    state = {
+        'offset': offset,
+        'count': count,
+        'last_id': last_id,
+        'doc_size': os.path.getsize(DOC_PATH),
+    }
+    tmp_path = STATE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def create_doc(full=False):
+    """
+    returns the number of lines written to doc.md
+    """
+    state = None if full else load_state()
+
+    if state is None:
+        index_data, offset = read_index()
+        doc_lines = [format_entry(entry) for entry in index_data]
+
+        with open(DOC_PATH, 'w') as f:
+            f.write("\n".join(doc_lines))
+        count = len(doc_lines)
+    else:
+        index_data, offset = read_index(state['offset'])
+        doc_lines = [format_entry(entry) for entry in index_data]
 
-        doc_lines.append(f"- {human_readable_date} [{name}](./dump/{dump_id}/) `{'git' if entry['git'] else 'non-git'}`")
+        if doc_lines:
+            with open(DOC_PATH, 'a') as f:
+                f.write(("\n" if state['count'] else "") + "\n".join(doc_lines))
+        count = state['count'] + len(doc_lines)
 
-    with open('doc.md', 'w') as f:
-        f.write("\n".join(doc_lines))
+    last_id = index_data[-1]['id'] if index_data else (state or {}).get('last_id')
+    save_state(offset, count, last_id)
+    return len(doc_lines)
 
 if __name__ == "__main__":
-    create_doc()
-    print("doc.md created successfully.")
\ No newline at end of file
+    written = create_doc(full="--full" in sys.argv[1:])
+    print(f"doc.md updated successfully, {written} entries written.")
@@ -0,0 +1,148 @@
+# append-only index store
+#
+# index/index.jsonl holds one json entry per line:
+# {"id": "...", "name": "zdash.zip", "timestamp": "2025-08-08T11:57:35.372779", "git": true}
+#
+# adding dumps appends their lines with a single write, so the cost does not
+# grow with the archive and an interrupted write can only leave a torn last
+# line, which readers skip. index/index.json (the old whole-file format) is
+# migrated on first use.
+import json
+import os
+
+INDEX_PATH = 'index/index.jsonl'
+LEGACY_INDEX_PATH = 'index/index.json'
+
+_OPEN_FLAGS = getattr(os, 'O_BINARY', 0)
+
+
+def _encode(entry):
+    return json.dumps(entry, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _write_atomic(path, entries):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(_encode(entry) for entry in entries))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def migrate():
+    """
+    converts index/index.json to index/index.jsonl, once
+    """
+    if os.path.exists(INDEX_PATH) or not os.path.exists(LEGACY_INDEX_PATH):
+        return False
+
+    with open(LEGACY_INDEX_PATH, 'r') as f:
+        entries = json.load(f)
+
+    _write_atomic(INDEX_PATH, entries)
+    os.remove(LEGACY_INDEX_PATH)
+    return True
+
+
+def read_index(offset=0):
+    """
+    returns (entries, offset) for every complete line from offset on
+
+    the returned offset points behind the last complete line, pass it back in
+    to only read what was appended since. a torn trailing line is not consumed
+    """
+    migrate()
+    if not os.path.exists(INDEX_PATH):
+        return [], 0
+
+    with open(INDEX_PATH, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b'\n') + 1
+    entries = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # left behind by an interrupted append
+            continue
+
+    return entries, offset + end
+
+
+def entry_before(offset):
+    """
+    returns the entry on the line that ends at offset, None if there is none
+
+    lets incremental readers check that the file was only appended to since
+    they recorded offset
+    """
+    if offset <= 0 or not os.path.exists(INDEX_PATH):
+        return None
+
+    with open(INDEX_PATH, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < offset:
+            return None
+
+        start = offset
+        line = b''
+        while start > 0 and line.count(b'\n') < 2:
+            start = max(0, start - 4096)
+            f.seek(start)
+            line = f.read(offset - start)
+
+    if not line.endswith(b'\n'):
+        return None
+    try:
+        return json.loads(line[:-1].rsplit(b'\n', 1)[-1])
+    except ValueError:
+        return None
+
+
+def load_index():
+    return read_index()[0]
+
+
+def append_entries(entries):
+    """
+    appends entries to the index with one write and fsyncs it
+    """
+    if not entries:
+        return
+
+    migrate()
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    data = b''.join(_encode(entry) for entry in entries)
+
+    fd = os.open(INDEX_PATH, os.O_RDWR | os.O_APPEND | os.O_CREAT | _OPEN_FLAGS, 0o644)
+    try:
+        if os.fstat(fd).st_size:
+            # O_APPEND writes go to the end regardless of this seek
+            os.lseek(fd, -1, os.SEEK_END)
+            if os.read(fd, 1) != b'\n':
+                # terminate a torn line so it stays a single skipped line
+                data = b'\n' + data
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def compact():
+    """
+    rewrites the index without torn lines and duplicate ids (last one wins)
+    """
+    entries = {}
+    for entry in load_index():
+        entries.pop(entry['id'], None)
+        entries[entry['id']] = entry
+
+    _write_atomic(INDEX_PATH, entries.values())
+    return len(entries)
+
+
+if __name__ == "__main__":
+    print(f"index compacted, {compact()} entries.")